@@ -0,0 +1,103 @@
+"""
+Parity check and timings for the vectorized BM25 scorer (rank.SparseBM25).
+
+On a synthetic Zipf-distributed corpus of each --sizes, SparseBM25 scores are
+compared with rank_bm25.BM25Okapi for a sample of queries (they must agree
+within --rtol) and its top-k must equal a stable sort of BM25Okapi's scores.
+Then index build time and per-query latency are reported for 1 / 100 / 1000
+queries. BM25Okapi is only timed on --okapi-sample queries per size (it
+scores one query at a time, so per-query time is what it costs at any batch
+size).
+
+    python scripts/bench_bm25.py [--sizes 10000 100000] [--queries 1 100 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from paper_digest.graph.nodes.rank import SparseBM25
+
+TOP_K = 20
+
+
+def make_corpus(n_docs: int, vocab: int, rng: np.random.Generator) -> List[List[str]]:
+    words = [f"w{i}" for i in range(vocab)]
+    lengths = rng.integers(40, 160, size=n_docs)
+    ids = np.minimum(rng.zipf(1.2, size=int(lengths.sum())) - 1, vocab - 1)
+    out: List[List[str]] = []
+    pos = 0
+    for n in lengths:
+        out.append([words[i] for i in ids[pos:pos + n]])
+        pos += n
+    return out
+
+
+def make_queries(n: int, vocab: int, rng: np.random.Generator) -> List[List[str]]:
+    # Topic-like queries: a few mid-frequency terms each
+    return [[f"w{i}" for i in rng.integers(20, min(vocab, 5000), size=rng.integers(2, 6))] for _ in range(n)]
+
+
+def check_parity(okapi: BM25Okapi, sparse: SparseBM25, queries: List[List[str]], rtol: float) -> None:
+    scores = sparse.score_batch(queries)
+    tops = sparse.top_k(queries, TOP_K)
+    for q, row, (idx, _) in zip(queries, scores, tops):
+        ref = np.asarray(okapi.get_scores(q), dtype=np.float64)
+        assert np.allclose(row, ref, rtol=rtol, atol=1e-12), f"scores differ for {q}"
+        expected = sorted(range(len(ref)), key=lambda i: ref[i], reverse=True)[:TOP_K]
+        assert [int(i) for i in idx] == expected, f"top-{TOP_K} differs for {q}"
+
+
+def bench_size(n_docs: int, query_counts: List[int], okapi_sample: int, rtol: float, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    vocab = max(10_000, n_docs // 2)
+    corpus = make_corpus(n_docs, vocab, rng)
+    queries = make_queries(max(query_counts), vocab, rng)
+
+    t0 = time.perf_counter()
+    okapi = BM25Okapi(corpus)
+    okapi_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    sparse = SparseBM25(corpus)
+    sparse_build = time.perf_counter() - t0
+    print(f"[{n_docs:,} docs] build: BM25Okapi {okapi_build:.2f}s, SparseBM25 {sparse_build:.2f}s")
+
+    sample = queries[:okapi_sample]
+    check_parity(okapi, sparse, sample, rtol)
+    print(f"[{n_docs:,} docs] parity: {len(sample)} queries match BM25Okapi (rtol={rtol:g}, top-{TOP_K} identical)")
+
+    t0 = time.perf_counter()
+    for q in sample:
+        np.argsort(-np.asarray(okapi.get_scores(q)), kind="stable")[:TOP_K]
+    okapi_per_q = (time.perf_counter() - t0) / len(sample)
+
+    for n_q in query_counts:
+        t0 = time.perf_counter()
+        sparse.top_k(queries[:n_q], TOP_K)
+        sparse_per_q = (time.perf_counter() - t0) / n_q
+        print(
+            f"[{n_docs:,} docs] {n_q:>5} queries: BM25Okapi {okapi_per_q * 1000:8.2f} ms/query, "
+            f"SparseBM25 {sparse_per_q * 1000:8.3f} ms/query ({okapi_per_q / sparse_per_q:,.0f}x)"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--queries", type=int, nargs="+", default=[1, 100, 1000])
+    ap.add_argument("--okapi-sample", type=int, default=10, help="queries scored with BM25Okapi per size")
+    ap.add_argument("--rtol", type=float, default=1e-9)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    for n_docs in args.sizes:
+        bench_size(n_docs, args.queries, max(1, args.okapi_sample), args.rtol, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Accuracy check and throughput benchmark for PDF section extraction.
+
+Accuracy: every PDF in scripts/fixtures/pdfs/ is extracted with fixed and
+adaptive windows and compared against expected.json (section starts at its
+heading, reaches its last body line, stops before the next heading). A
+mismatch fails the run.
+
+Throughput: the same corpus is extracted --repeat times per window mode,
+inline or (with --workers) through an ExtractionExecutor fed by as many
+threads, and documents/s, pages/s and pages parsed per document are
+reported.
+
+    python scripts/bench_extract.py [--repeat 20] [--workers 0]
+
+Regenerate the corpus with scripts/make_pdf_fixtures.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from paper_digest.fulltext.executor import ExtractionExecutor
+from paper_digest.fulltext.extract import Sections, WindowSpec, extract_sections
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "pdfs"
+MAX_CHARS = 60_000
+
+WINDOWS = {
+    "fixed": WindowSpec("fixed", 8, 4),
+    "adaptive": WindowSpec("adaptive", 8, 4),
+}
+
+
+def _check_section(name: str, which: str, text: str, expected: Optional[Dict[str, str]]) -> List[str]:
+    where = f"{name}/{which}"
+    if expected is None:
+        return [] if text.strip() else [f"{where}: empty fallback text"]
+    problems = []
+    if not text.startswith(expected["first"]):
+        problems.append(f"{where}: starts with {text[:40]!r}, expected {expected['first']!r}")
+    if expected["last"] not in text:
+        problems.append(f"{where}: missing its last line {expected['last']!r}")
+    if expected["stop"] in text:
+        problems.append(f"{where}: runs into {expected['stop']!r}")
+    return problems
+
+
+def check_accuracy(corpus: Dict[str, bytes], expected: Dict[str, dict]) -> None:
+    problems: List[str] = []
+    for mode, window in WINDOWS.items():
+        ok = 0
+        for name, pdf in corpus.items():
+            sections = extract_sections(pdf, window, MAX_CHARS)
+            found = _check_section(name, f"{mode}/intro", sections.intro_text, expected[name]["intro"])
+            found += _check_section(name, f"{mode}/summary", sections.summary_text, expected[name]["summary"])
+            ok += not found
+            problems.extend(found)
+        print(f"accuracy[{mode}]: {ok}/{len(corpus)} documents match expected.json")
+    assert not problems, "\n".join(problems)
+
+
+def bench(corpus: Dict[str, bytes], repeat: int, workers: int) -> None:
+    jobs = [pdf for _ in range(repeat) for pdf in corpus.values()]
+    executor = ExtractionExecutor(workers=workers) if workers > 0 else None
+    try:
+        for mode, window in WINDOWS.items():
+            if executor is not None:
+                executor.extract(jobs[0], window, MAX_CHARS)   # start the worker processes
+
+                def run(pdf: bytes) -> Sections:
+                    return executor.extract(pdf, window, MAX_CHARS)
+
+                t0 = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(run, jobs))
+            else:
+                t0 = time.perf_counter()
+                results = [extract_sections(pdf, window, MAX_CHARS) for pdf in jobs]
+            elapsed = time.perf_counter() - t0
+
+            parsed = sum(r.pages_parsed for r in results)
+            total = sum(r.page_count for r in results)
+            print(
+                f"throughput[{mode}]: {len(jobs) / elapsed:.1f} docs/s, {parsed / elapsed:.0f} pages/s, "
+                f"{parsed / len(jobs):.1f} of {total / len(jobs):.1f} pages parsed per doc "
+                f"({len(jobs)} docs in {elapsed:.2f}s, workers={workers})"
+            )
+    finally:
+        if executor is not None:
+            executor.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--repeat", type=int, default=20, help="passes over the corpus per window mode")
+    ap.add_argument("--workers", type=int, default=0, help="extraction worker processes; 0 = inline")
+    args = ap.parse_args()
+
+    expected = json.loads((FIXTURES / "expected.json").read_text(encoding="utf-8"))
+    corpus = {name: (FIXTURES / f"{name}.pdf").read_bytes() for name in expected}
+
+    check_accuracy(corpus, expected)
+    bench(corpus, max(1, args.repeat), max(0, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmarks for the arXiv search fetch path, offline.
+
+Parser: a synthetic Atom feed (--entries) is parsed with the streaming parser
+and with feedparser. Outputs must match field for field; entries/s and peak
+Python heap (tracemalloc) are reported for each.
+
+Latency: FetchPapers runs against a stubbed export.arxiv.org (a requests
+adapter mounted on the shared transport that answers with generated feeds
+after --latency-ms plus a per-entry delay), unsharded and sharded by
+category, single-request and paged. Wall time, requests sent and entries
+transferred per max_results are reported.
+
+    python scripts/bench_fetch.py [--entries 5000] [--max-results 200] [--latency-ms 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from paper_digest.graph.nodes import fetch
+from paper_digest.graph.state import Paper
+from paper_digest.transport import get_transport
+
+_CATEGORIES = fetch._DEFAULT_CATEGORIES
+_T0 = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _entry(g: int) -> str:
+    """Global entry `g`: newest first, categories interleaved."""
+    cat = _CATEGORIES[g % len(_CATEGORIES)]
+    updated = (_T0 - timedelta(minutes=g)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return (
+        f"<entry><id>http://arxiv.org/abs/2405.{g:05d}v1</id>"
+        f"<updated>{updated}</updated><published>2024-05-01T00:00:00Z</published>"
+        f"<title>Paper {g} on retrieval\n  and ranking</title>"
+        f"<summary>We study retrieval problem {g} with graph neural networks and language models.</summary>"
+        f"<author><name>Author {g}</name></author><author><name>Second Author</name></author>"
+        f'<link href="http://arxiv.org/abs/2405.{g:05d}v1" rel="alternate" type="text/html"/>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/2405.{g:05d}v1" rel="related" type="application/pdf"/>'
+        f'<category term="{cat}" scheme="http://arxiv.org/schemas/atom"/></entry>'
+    )
+
+
+def make_feed(ids: List[int]) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        + "".join(_entry(g) for g in ids)
+        + "</feed>"
+    ).encode("utf-8")
+
+
+class StubArxiv(HTTPAdapter):
+    """Answers arXiv search requests with generated feeds after a simulated delay."""
+
+    def __init__(self, latency_s: float, per_entry_s: float) -> None:
+        super().__init__()
+        self.latency_s = latency_s
+        self.per_entry_s = per_entry_s
+        self.requests = 0
+        self.entries = 0
+
+    def send(self, request, **kwargs):
+        q = {k: v[0] for k, v in parse_qs(urlsplit(request.url).query).items()}
+        start, n = int(q["start"]), int(q["max_results"])
+        shard = next((i for i, c in enumerate(_CATEGORIES) if f"cat:{c}" in q["search_query"]), None)
+        if shard is None:
+            ids = list(range(start, start + n))
+        else:
+            ids = [shard + len(_CATEGORIES) * k for k in range(start, start + n)]
+        self.requests += 1
+        self.entries += len(ids)
+
+        time.sleep(self.latency_s + self.per_entry_s * len(ids))
+        raw = HTTPResponse(
+            body=io.BytesIO(make_feed(ids)),
+            status=200,
+            headers={"Content-Type": "application/atom+xml"},
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def _measure(parse: Callable[[], List[Paper]]) -> Tuple[List[Paper], float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    papers = parse()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return papers, elapsed, peak
+
+
+def bench_parser(entries: int) -> None:
+    feed = make_feed(list(range(entries)))
+    results = {}
+    for parser in ("stream", "feedparser"):
+        papers, elapsed, peak = _measure(lambda: fetch._parse_feed(io.BytesIO(feed), parser))
+        results[parser] = papers
+        print(
+            f"parser[{parser}]: {len(papers) / elapsed:,.0f} entries/s, peak heap {peak / 2**20:.1f} MB "
+            f"({len(papers)} entries, {len(feed) / 2**20:.1f} MB feed)"
+        )
+    assert results["stream"] == results["feedparser"], "stream parser output differs from feedparser"
+    print("parser: outputs match field for field")
+
+
+def bench_fetch(max_results: int, latency_s: float, per_entry_s: float) -> None:
+    stub = StubArxiv(latency_s, per_entry_s)
+    get_transport().session.mount("https://export.arxiv.org", stub)
+
+    configs: List[Tuple[str, bool, int]] = [
+        ("unsharded, 1 request", False, 0),
+        ("unsharded, paged", False, 50),
+        ("sharded, 1 request/shard", True, 0),
+        ("sharded, paged", True, 50),
+    ]
+    newest: Optional[List[str]] = None
+    for label, shard, page_size in configs:
+        stub.requests = stub.entries = 0
+        state = {
+            "topics": ["retrieval", "ranking"],
+            "max_results": max_results,
+            "fetch_shard_categories": shard,
+            "fetch_page_size": page_size,
+            "fetch_parallelism": 8,
+            "fetch_cache_enabled": False,
+        }
+        t0 = time.perf_counter()
+        papers = fetch.fetch_papers(state)["papers"]
+        elapsed = time.perf_counter() - t0
+
+        ids = [p["paper_id"] for p in papers]
+        # Categories are evenly interleaved here, so every plan must return the same newest papers
+        newest = newest or ids
+        assert ids == newest, f"{label}: returned a different set of papers"
+        print(
+            f"fetch[{label}]: {elapsed:.2f}s, {stub.requests} requests, "
+            f"{stub.entries / max_results:.2f}x max_results transferred ({len(papers)} papers)"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--entries", type=int, default=5000, help="entries in the parser benchmark feed")
+    ap.add_argument("--max-results", type=int, default=200)
+    ap.add_argument("--latency-ms", type=float, default=300.0, help="stubbed per-request latency")
+    ap.add_argument("--per-entry-ms", type=float, default=2.0, help="stubbed per-entry server time")
+    args = ap.parse_args()
+
+    bench_parser(args.entries)
+    bench_fetch(args.max_results, args.latency_ms / 1000.0, args.per_entry_ms / 1000.0)
+
+
+if __name__ == "__main__":
+    main()
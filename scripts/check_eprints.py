@@ -0,0 +1,58 @@
+"""
+Check e-print (LaTeX source) extraction against the fixtures in
+scripts/fixtures/eprints/:
+
+  - valid.tar.gz: main.tex with an \\input'ed section, comments, cites, a bibliography
+  - corrupt.tar.gz: same archive with a scrambled deflate stream (zlib.error on read)
+
+The corrupt archive must yield None from extract_latex_sections, and
+FetchFullText must fall back to the PDF path instead of failing the run.
+
+    python scripts/check_eprints.py
+"""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from unittest import mock
+
+from paper_digest.fulltext.latex import extract_latex_sections
+from paper_digest.graph.nodes import fetch_full_text_topk as node
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "eprints"
+
+
+def check_fixtures() -> None:
+    sections = extract_latex_sections(FIXTURES / "valid.tar.gz", 10_000)
+    assert sections is not None, "valid e-print was not parsed"
+    intro, summary = sections
+    assert intro.startswith("Introduction") and "deterministic" in intro, intro
+    assert "comment" not in intro and "\\cite" not in intro, intro
+    assert "Method" not in intro, "intro ran into the \\input'ed section"
+    assert summary.startswith("Conclusion") and "honest" in summary, summary
+
+    assert extract_latex_sections(FIXTURES / "corrupt.tar.gz", 10_000) is None
+    print("fixtures: valid parsed, corrupt rejected")
+
+
+def check_node_fallback() -> None:
+    """An unexpected error inside LaTeX extraction is counted and the paper goes on to the PDF."""
+    counters = node._RunCounters()
+    archive = node._LocalFile("0" * 64, FIXTURES / "valid.tar.gz", temporary=False)
+    opts = mock.Mock(extraction_cache=None, max_chars=10_000)
+    paper = {"paper_id": "2401.00001v1"}
+
+    with mock.patch.object(node, "_load_file", return_value=archive), \
+            mock.patch.object(node, "extract_latex_sections", side_effect=zlib.error("Error -3")):
+        result = node._try_latex(paper, "https://arxiv.org/pdf/2401.00001v1", opts, None, counters)
+
+    assert result is None
+    assert counters.latex_errors == {"error": 1}, counters.latex_errors
+    assert "latex errors (PDF fallback): error x1" in counters.strategies_summary()
+    print("node: latex error counted, PDF fallback taken")
+
+
+if __name__ == "__main__":
+    check_fixtures()
+    check_node_fallback()
@@ -0,0 +1,121 @@
+"""
+Check the OAI-PMH harvester against a local stand-in for the arXiv endpoint.
+
+scripts/fixtures/oai/ holds two ListRecords pages in the arXivRaw format
+(page1.xml ends with a resumption token; page2.xml is the last page and has a
+deleted record). They are served from 127.0.0.1, and the checks are:
+
+  - every paper_id carries the latest version, as in the search API
+  - a harvest capped by max_records advances across calls: no record is
+    delivered twice, none is skipped, and already harvested pages aren't
+    requested again
+  - a caller that stops iterating early resumes after the last record it got
+
+    python scripts/check_oai.py
+"""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from paper_digest.sources.oai_pmh import harvest
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "oai"
+TOKEN = "7082661|1001"
+EXPECTED = [
+    "http://arxiv.org/abs/2401.00001v1",
+    "http://arxiv.org/abs/2401.00002v3",
+    "http://arxiv.org/abs/2401.00003v1",
+    "http://arxiv.org/abs/2401.00004v2",
+    "http://arxiv.org/abs/2401.00005v1",
+    "http://arxiv.org/abs/2401.00007v2",
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: List[Dict[str, str]] = []
+
+    def do_GET(self) -> None:
+        q = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        type(self).requests.append(q)
+        if q.get("verb") != "ListRecords":
+            self.send_error(400)
+            return
+        if q.get("resumptionToken") == TOKEN:
+            page = "page2.xml"
+        elif q.get("metadataPrefix") == "arXivRaw" and "resumptionToken" not in q:
+            page = "page1.xml"
+        else:
+            self.send_error(400)
+            return
+        body = (FIXTURES / page).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def check_versions(base_url: str) -> None:
+    with tempfile.TemporaryDirectory() as ckpt:
+        papers = list(harvest(ckpt, base_url=base_url, from_date="2024-01-01"))
+    assert [p["paper_id"] for p in papers] == EXPECTED, [p["paper_id"] for p in papers]
+    by_id = {p["paper_id"]: p for p in papers}
+    p = by_id["http://arxiv.org/abs/2401.00002v3"]
+    assert p["url"] == p["paper_id"]
+    assert (p["published_at"], p["updated_at"]) == ("2024-01-01T11:00:00Z", "2024-01-05T16:45:10Z"), p
+    assert p["authors"] == ["Edsger W. Dijkstra", "Barbara Liskov"], p["authors"]
+    assert p["title"] == "Graph Neural Rankers", p["title"]
+    print(f"versions: {len(papers)} papers, ids versioned, dates from the version history")
+
+
+def check_capped(base_url: str) -> None:
+    _Handler.requests.clear()
+    with tempfile.TemporaryDirectory() as ckpt:
+        seen: List[str] = []
+        calls = 0
+        while True:
+            batch = [p["paper_id"] for p in harvest(ckpt, base_url=base_url, max_records=4)]
+            calls += 1
+            seen += batch
+            if len(batch) < 4:
+                break   # a short batch means the harvest completed
+            assert calls < 3, "capped harvest is not advancing"
+        assert seen == EXPECTED, seen
+        assert not any(Path(ckpt).iterdir()), "checkpoint left behind after the harvest completed"
+    pages = [q.get("resumptionToken", "first") for q in _Handler.requests]
+    assert pages == ["first", TOKEN], pages
+    print(f"capped: max_records=4 delivered {len(seen)} papers over {calls} calls, pages requested: {pages}")
+
+
+def check_early_stop(base_url: str) -> None:
+    with tempfile.TemporaryDirectory() as ckpt:
+        first = [p["paper_id"] for p in itertools.islice(harvest(ckpt, base_url=base_url), 2)]
+        rest = [p["paper_id"] for p in harvest(ckpt, base_url=base_url)]
+    assert first + rest == EXPECTED, (first, rest)
+    print(f"early stop: {len(first)} taken, the next call resumed with {rest[0]}")
+
+
+def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/oai"
+    try:
+        check_versions(base_url)
+        check_capped(base_url)
+        check_early_stop(base_url)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
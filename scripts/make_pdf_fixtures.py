@@ -0,0 +1,173 @@
+"""
+Regenerate the PDF corpus in scripts/fixtures/pdfs/ and its expected.json.
+
+Each document is built line by line, so the true section boundaries are
+known: for every expected section, the heading line it starts with, the last
+body line it must contain and the following heading it must stop before.
+A null section means the layout has no usable headings and the extractor's
+fallback is expected (only checked for being non-empty). Pages listed in
+FIGURES also get an incompressible figure, so the body of the file is mostly
+bytes that a head / tail range fetch can skip.
+
+    python scripts/make_pdf_fixtures.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+OUT = Path(__file__).resolve().parent / "fixtures" / "pdfs"
+
+Line = Tuple[str, float, str]   # text, font size, font name
+Page = List[Line]
+
+
+def _h(text: str) -> Line:
+    return (text, 12, "hebo")
+
+
+def _p(text: str) -> Line:
+    return (text, 10, "helv")
+
+
+def _body(tag: str, n: int, start: int = 0) -> List[Line]:
+    return [_p(f"{tag} sentence {k} with a few more words.") for k in range(start, start + n)]
+
+
+def _last(tag: str, n: int, start: int = 0) -> str:
+    return f"{tag} sentence {start + n - 1} with a few more words."
+
+
+def _expect(first: str, last: str, stop: str) -> Dict[str, str]:
+    return {"first": first, "last": last, "stop": stop}
+
+
+def _filler(n: int) -> List[Page]:
+    return [[_h(f"{i + 3} Experiment {i}")] + _body(f"EXP{i}", 30) for i in range(n)]
+
+
+# name -> (pages, expected intro, expected summary)
+CORPUS: Dict[str, Tuple[List[Page], Optional[dict], Optional[dict]]] = {
+    "bold_numbered": (
+        [
+            [_h("A Study of Graphs"), _h("Abstract"), _p("We study graphs."), _h("1 Introduction")]
+            + _body("INTRO", 10) + [_h("2 Method")] + _body("METHOD", 5),
+            [_h("3 Results")] + _body("RESULT", 10),
+            [_h("4 Conclusion")] + _body("CONC", 6) + [_h("References"), _p("[1] A. Author. A paper. 2020.")],
+        ],
+        _expect("1 Introduction", _last("INTRO", 10), "2 Method"),
+        _expect("4 Conclusion", _last("CONC", 6), "References"),
+    ),
+    "plain_numbered": (
+        [
+            [_p("1 Introduction")] + _body("INTRO", 10) + [_p("2 Method")] + _body("METHOD", 5),
+            [_p("3 Conclusion")] + _body("CONC", 6) + [_p("References"), _p("[1] A. Author. 2020.")],
+        ],
+        _expect("1 Introduction", _last("INTRO", 10), "2 Method"),
+        _expect("3 Conclusion", _last("CONC", 6), "References"),
+    ),
+    "numbered_body_lines": (
+        [
+            [_h("1 Introduction")] + _body("INTRO", 5) + [_p("2 GPUs Were Used In Training")]
+            + _body("INTRO", 5, 5) + [_h("2 Method")] + _body("METHOD", 5),
+            [_h("5 Conclusion")] + _body("CONC", 3) + [_p("3 Tables Summarize Results")]
+            + _body("CONC", 3, 3) + [_h("References"), _p("[1] A. Author. 2020.")],
+        ],
+        _expect("1 Introduction", _last("INTRO", 5, 5), "2 Method"),
+        _expect("5 Conclusion", _last("CONC", 3, 3), "References"),
+    ),
+    "roman": (
+        [
+            [_h("I. INTRODUCTION")] + _body("INTRO", 10) + [_h("II. METHOD")] + _body("METHOD", 5),
+            [_h("V. CONCLUSION")] + _body("CONC", 6) + [_h("REFERENCES"), _p("[1] A. Author. 2020.")],
+        ],
+        _expect("I. INTRODUCTION", _last("INTRO", 10), "II. METHOD"),
+        _expect("V. CONCLUSION", _last("CONC", 6), "REFERENCES"),
+    ),
+    "unnumbered_bold": (
+        [
+            [_h("Introduction")] + _body("INTRO", 10) + [_h("Background and Setup")] + _body("SETUP", 5),
+            [_h("Conclusion and Future Work")] + _body("CONC", 6) + [_h("Acknowledgments")]
+            + _body("ACK", 2) + [_h("References"), _p("[1] A. Author. 2020.")],
+        ],
+        _expect("Introduction", _last("INTRO", 10), "Background and Setup"),
+        _expect("Conclusion and Future Work", _last("CONC", 6), "Acknowledgments"),
+    ),
+    # Intro runs over two pages, references over two: exercises the adaptive windows
+    "long_paper": (
+        [
+            [_h("Scaling Things Up"), _h("Abstract"), _p("We scale."), _h("1 Introduction")] + _body("INTRO", 40),
+            _body("INTRO", 10, 40) + [_h("2 Related Work")] + _body("RELATED", 20),
+        ]
+        + _filler(10)
+        + [
+            [_h("13 Conclusion")] + _body("CONC", 12) + [_h("References")]
+            + [_p(f"[{k}] A. Author. Paper {k}. 2020.") for k in range(1, 20)],
+            [_p(f"[{k}] A. Author. Paper {k}. 2021.") for k in range(20, 60)],
+        ],
+        _expect("1 Introduction", _last("INTRO", 10, 40), "2 Related Work"),
+        _expect("13 Conclusion", _last("CONC", 12), "References"),
+    ),
+    "no_headings": ([_body("X", 30), _body("Y", 30)], None, None),
+    "figures_paper": (
+        [
+            [_h("Seeing Things"), _h("Abstract"), _p("We look."), _h("1 Introduction")] + _body("INTRO", 12),
+            _body("INTRO", 6, 12) + [_h("2 Method")] + _body("METHOD", 10),
+        ]
+        + [[_h(f"{i + 3} Figure Study {i}")] + _body(f"FIG{i}", 5) for i in range(8)]
+        + [
+            [_h("11 Conclusion")] + _body("CONC", 10),
+            [_h("References")] + [_p(f"[{k}] A. Author. Paper {k}. 2022.") for k in range(1, 30)],
+        ],
+        _expect("1 Introduction", _last("INTRO", 6, 12), "2 Method"),
+        _expect("11 Conclusion", _last("CONC", 10), "References"),
+    ),
+}
+
+# name -> pages carrying a ~108KB noise figure (seeded, so the bytes are reproducible)
+FIGURES: Dict[str, range] = {"figures_paper": range(2, 10)}
+_FIGURE_SIDE = 192
+
+
+def _figure(rng: random.Random) -> "fitz.Pixmap":
+    samples = rng.randbytes(_FIGURE_SIDE * _FIGURE_SIDE * 3)
+    return fitz.Pixmap(fitz.csRGB, _FIGURE_SIDE, _FIGURE_SIDE, samples, 0)
+
+
+def build_pdf(pages: List[Page], figure_pages: range = range(0)) -> bytes:
+    rng = random.Random(0)
+    doc = fitz.open()
+    try:
+        for n, lines in enumerate(pages):
+            page = doc.new_page()
+            if n in figure_pages:
+                page.insert_image(fitz.Rect(60, 420, 540, 780), pixmap=_figure(rng))
+            y = 60.0
+            for text, size, font in lines:
+                if y > 780:
+                    page = doc.new_page()
+                    y = 60.0
+                page.insert_text((60, y), text, fontsize=size, fontname=font)
+                y += size * 1.5
+        return doc.tobytes(garbage=3, deflate=True)
+    finally:
+        doc.close()
+
+
+def main() -> None:
+    OUT.mkdir(parents=True, exist_ok=True)
+    expected = {}
+    for name, (pages, intro, summary) in CORPUS.items():
+        (OUT / f"{name}.pdf").write_bytes(build_pdf(pages, FIGURES.get(name, range(0))))
+        expected[name] = {"intro": intro, "summary": summary}
+    (OUT / "expected.json").write_text(json.dumps(expected, indent=2) + "\n", encoding="utf-8")
+    print(f"wrote {len(CORPUS)} PDFs to {OUT}")
+
+
+if __name__ == "__main__":
+    main()
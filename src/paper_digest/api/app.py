@@ -11,6 +11,7 @@ This API:
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import datetime
 from uuid import uuid4
 from typing import Any, Dict
@@ -22,12 +23,30 @@ from dotenv import load_dotenv
 from paper_digest.api.models import RunRequest, RunResponse
 from paper_digest.api.run_store import RunStore
 from paper_digest.api.runner import run_pipeline
+from paper_digest.config import get_extraction_settings, get_http_settings, get_llm_settings
+from paper_digest.fulltext.executor import configure_extraction_executor
+from paper_digest.llm.registry import close_llm_providers, configure_llm_provider
+from paper_digest.transport import configure_transport
 
 load_dotenv()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP transport shared by every run in this process
+    transport = configure_transport(**get_http_settings())
+    # Process pool for CPU-bound PDF extraction, shared the same way
+    extractor = configure_extraction_executor(**get_extraction_settings())
+    # Long-lived LLM client(s), reused across runs
+    configure_llm_provider(**get_llm_settings())
+    yield
+    close_llm_providers()
+    extractor.close()
+    transport.close()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="AI Paper Digest Agent", version="0.1.0")
+    app = FastAPI(title="AI Paper Digest Agent", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -19,6 +19,8 @@ class RunRequest(BaseModel):
     max_results: int = 20
     llm_model: Optional[str] = None
     out_dir: str = "outputs"
+    # Optional pipeline knobs merged into the graph state (e.g. {"fetch_page_size": 500})
+    options: Dict[str, Any] = Field(default_factory=dict)
 
 
 class RunResponse(BaseModel):
@@ -37,6 +37,8 @@ def run_pipeline(run_id: str, request: Dict[str, Any], store: RunStore) -> None:
             "errors": [],
             "logs": [],
         }
+        for k, v in (request.get("options") or {}).items():
+            state_in.setdefault(k, v)
 
         out = g.invoke(state_in)
 
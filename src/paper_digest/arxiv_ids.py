@@ -0,0 +1,38 @@
+"""
+Helpers for arXiv identifiers.
+
+arXiv ids show up in many shapes across the pipeline:
+  "http://arxiv.org/abs/2401.01234v2", "https://arxiv.org/pdf/2401.01234v2.pdf",
+  "2401.01234", "oai:arXiv.org:2401.01234", "cs/0112017v1" (old-style).
+These helpers reduce them to a (base_id, version) pair.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Tuple
+
+
+_ARXIV_ID_RE = re.compile(
+    r"(?P<id>\d{4}\.\d{4,5}|[a-z][a-z\-]*(?:\.[A-Z]{2})?/\d{7})(?:v(?P<v>\d+))?",
+    re.IGNORECASE,
+)
+
+
+def split_arxiv_id(value: str) -> Tuple[str, int]:
+    """
+    Return (base_id, version). version is 0 when the input carries none.
+    Returns ("", 0) when no arXiv id can be found.
+    """
+    m = _ARXIV_ID_RE.search(value or "")
+    if not m:
+        return "", 0
+    return m.group("id"), int(m.group("v") or 0)
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """Canonical "<base>v<version>" (or just "<base>" when unversioned)."""
+    base, version = split_arxiv_id(value)
+    if not base:
+        return ""
+    return f"{base}v{version}" if version else base
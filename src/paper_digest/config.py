@@ -13,3 +13,41 @@ def get_gemini_api_key() -> str:
     if not key:
         raise RuntimeError("GEMINI_API_KEY missing. Put it in .env or env var.")
     return key
+
+
+def get_http_settings() -> dict:
+    """Shared HTTP transport settings (env-driven, with defaults)."""
+    return {
+        "pool_connections": int(os.getenv("HTTP_POOL_CONNECTIONS", "10")),
+        "pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", "20")),
+        "timeout_s": float(os.getenv("HTTP_TIMEOUT_S", "30")),
+        # PDF / e-print hosts share one per-host token bucket; PDF_RATE_PER_S=0 means unlimited
+        "host_rates": {
+            host.strip().lower(): (
+                float(os.getenv("PDF_RATE_PER_S", "2")),
+                float(os.getenv("PDF_RATE_BURST", "1")),
+            )
+            for host in os.getenv("PDF_HOSTS", "arxiv.org").split(",")
+            if host.strip()
+        },
+    }
+
+
+def get_extraction_settings() -> dict:
+    """PDF extraction process-pool settings (env-driven, with defaults)."""
+    workers = os.getenv("PDF_EXTRACT_WORKERS")
+    return {
+        "workers": int(workers) if workers else None,
+        "timeout_s": float(os.getenv("PDF_EXTRACT_TIMEOUT_S", "60")),
+    }
+
+
+def get_llm_settings() -> dict:
+    """LLM provider settings (env-driven, with defaults); see paper_digest.llm.registry."""
+    return {
+        "provider": os.getenv("LLM_PROVIDER", "gemini").strip().lower(),
+        "base_url": os.getenv("LLM_BASE_URL", ""),
+        "api_key": os.getenv("LLM_API_KEY", ""),
+        "timeout_s": float(os.getenv("LLM_TIMEOUT_S", "120")),
+        "fake_latency_s": float(os.getenv("LLM_FAKE_LATENCY_S", "0")),
+    }
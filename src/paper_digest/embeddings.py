@@ -0,0 +1,93 @@
+"""
+CPU-only text embedders for second-stage reranking.
+
+The default `HashingEmbedder` needs nothing beyond NumPy: it hashes word
+unigrams, word bigrams and character 4-grams into a fixed-size signed vector
+(sublinear tf, L2-normalized). Character n-grams let it match morphological
+variants and paraphrases that share stems ("segmenting" / "segmentation"),
+which plain BM25 token matching misses.
+
+Any other model name is loaded with sentence-transformers, if installed.
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import Dict, List, Protocol
+
+import numpy as np
+
+from paper_digest.text import tokenize
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32 array of L2-normalized vectors."""
+        ...
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 1024) -> None:
+        self.dim = int(dim)
+        self.name = f"hashing-v1-{self.dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = tokenize(text)
+        feats = list(words)
+        feats.extend(f"{a}_{b}" for a, b in zip(words, words[1:]))
+        for w in words:
+            padded = f"<{w}>"
+            feats.extend(f"#{padded[i:i + 4]}" for i in range(max(1, len(padded) - 3)))
+        return feats
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[int, float] = {}
+            for f in self._features(text):
+                h = zlib.crc32(f.encode("utf-8"))
+                idx = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[idx] = counts.get(idx, 0.0) + sign
+            for idx, c in counts.items():
+                out[row, idx] = np.sign(c) * (1.0 + np.log(abs(c))) if c else 0.0
+            norm = float(np.linalg.norm(out[row]))
+            if norm > 0:
+                out[row] /= norm
+        return out
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as ex:
+            raise RuntimeError(
+                f"rerank_model='{model_name}' needs sentence-transformers; "
+                "install it or use rerank_model='hashing'."
+            ) from ex
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = int(self._model.get_sentence_embedding_dimension())
+        self.name = model_name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vecs = self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vecs, dtype=np.float32)
+
+
+_embedders: Dict[str, Embedder] = {}
+_embedders_lock = threading.Lock()
+
+
+def get_embedder(model: str = "hashing") -> Embedder:
+    """Process-wide embedder instances (models are expensive to load)."""
+    with _embedders_lock:
+        if model not in _embedders:
+            _embedders[model] = (
+                HashingEmbedder() if model == "hashing" else SentenceTransformerEmbedder(model)
+            )
+        return _embedders[model]
@@ -0,0 +1,9 @@
+"""
+Full-text extraction for the FetchFullText node.
+
+  - segment.py: single-pass, layout-aware heading / section segmentation
+  - extract.py: intro / conclusion extraction over the head / tail windows
+  - latex.py: intro / conclusion straight from arXiv e-print LaTeX source
+  - download.py / ranged.py: streamed full downloads, or Range-fetched sparse copies
+  - executor.py: process pool that runs extraction off the request thread
+"""
@@ -0,0 +1,70 @@
+"""
+Streamed, size-capped PDF downloads.
+
+The response body is written to a spool file in fixed-size chunks (hashed on
+the way), so a download never holds more than one chunk in memory. Bodies
+larger than `max_bytes` are rejected up front from Content-Length, or
+aborted as soon as the running total crosses the cap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from paper_digest.transport import TransportStats, get_transport
+
+
+CHUNK_BYTES = 1024 * 1024
+
+
+class PdfTooLarge(RuntimeError):
+    pass
+
+
+class SpooledPdf(NamedTuple):
+    path: Path
+    sha256: str
+    size: int
+
+
+def spool_download(
+    url: str,
+    spool_dir: Path,
+    *,
+    max_bytes: int,
+    timeout_s: float,
+    stats: Optional[TransportStats] = None,
+) -> SpooledPdf:
+    """Stream `url` into a new file under `spool_dir`; the caller owns (and removes) the file."""
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    r = get_transport().get(url, timeout=timeout_s, stats=stats, stream=True)
+    try:
+        r.raise_for_status()
+        declared = int(r.headers.get("Content-Length") or 0)
+        if max_bytes and declared > max_bytes:
+            raise PdfTooLarge(f"PDF is {declared / 1024 / 1024:.1f}MB (cap {max_bytes / 1024 / 1024:g}MB)")
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=spool_dir, suffix=".pdf.part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_BYTES):
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise PdfTooLarge(f"PDF exceeds the {max_bytes / 1024 / 1024:g}MB cap; aborted")
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        finally:
+            if stats is not None:
+                stats.add_bytes(size)
+        return SpooledPdf(Path(tmp), digest.hexdigest(), size)
+    finally:
+        r.close()
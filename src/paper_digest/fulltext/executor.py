@@ -0,0 +1,188 @@
+"""
+Process-pool executor for PDF section extraction.
+
+PyMuPDF parsing and the heading regexes are CPU-bound and hold the GIL, so
+concurrent runs in one FastAPI worker would serialize on a single core. The
+executor ships a PDF (bytes, or preferably a path) to a worker process and
+gets back only the two section strings, plus the worker's peak RSS growth
+while parsing (`Sections.peak_rss_kb`).
+
+Isolation:
+  - each worker is its own single-process pool ("lane"); a document waits for
+    an idle lane before it is submitted, so its timeout counts extraction
+    time only, never time queued behind other documents
+  - on timeout only the stuck lane's process is killed and replaced; the
+    other workers keep running their documents
+  - a worker crash (segfault, OOM kill) breaks only its lane; the lane is
+    replaced and the document is retried once
+
+`workers=0` runs extraction inline on the calling thread (no isolation).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+from .extract import PdfInput, Sections, WindowSpec, extract_sections
+
+
+class ExtractionTimeout(RuntimeError):
+    pass
+
+
+def default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _warm_up() -> None:
+    """Runs once in a new worker; unpickling it imports this module (and PyMuPDF)."""
+
+
+def _peak_rss_kb() -> int:
+    """
+    This process's peak RSS in KB. VmHWM on Linux: a spawned worker's ru_maxrss
+    also carries the peak of the process that forked it. Elsewhere ru_maxrss
+    (KB on Linux, bytes on macOS).
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _extract_measured(source: PdfInput, window: WindowSpec, max_chars: int) -> Sections:
+    """
+    extract_sections in a worker, with how far it pushed the worker's peak RSS.
+    On Linux the peak is reset first (clear_refs), so each document is measured
+    from the memory the worker holds when it starts; elsewhere the figure is the
+    growth of a high-water mark (0 once an earlier document set a higher one).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    before = _peak_rss_kb()
+    sections = extract_sections(source, window, max_chars)
+    return sections._replace(peak_rss_kb=max(0, _peak_rss_kb() - before))
+
+
+def _kill(lane: ProcessPoolExecutor) -> None:
+    for proc in list((getattr(lane, "_processes", None) or {}).values()):
+        proc.kill()
+    lane.shutdown(wait=False, cancel_futures=True)
+
+
+class ExtractionExecutor:
+    def __init__(self, workers: Optional[int] = None, timeout_s: float = 60.0) -> None:
+        self.workers = default_workers() if workers is None else max(0, int(workers))
+        self.timeout_s = float(timeout_s)
+        self._closed = False
+        # Idle lanes; None is a slot whose process hasn't been started (or was killed)
+        self._idle: "queue.Queue[Optional[ProcessPoolExecutor]]" = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+
+    def _start_lane(self) -> ProcessPoolExecutor:
+        # spawn: the parent is multi-threaded (HTTP workers, sqlite), fork isn't safe
+        lane = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        # Start the process and its imports outside any document's timeout
+        lane.submit(_warm_up).result()
+        return lane
+
+    def _release(self, lane: Optional[ProcessPoolExecutor]) -> None:
+        if self._closed and lane is not None:
+            lane.shutdown(wait=False, cancel_futures=True)
+            lane = None
+        self._idle.put(lane)
+
+    def extract(
+        self,
+        source: PdfInput,
+        window: WindowSpec,
+        max_chars: int,
+        timeout_s: Optional[float] = None,
+    ) -> Sections:
+        """Sections of one PDF; raises ExtractionTimeout or the worker's error."""
+        if self.workers == 0:
+            return extract_sections(source, window, max_chars)
+
+        timeout = self.timeout_s if timeout_s is None else float(timeout_s)
+        for attempt in range(2):
+            lane = self._idle.get()   # waiting for a free worker doesn't count toward the timeout
+            try:
+                if lane is None:
+                    lane = self._start_lane()
+                fut = lane.submit(_extract_measured, source, window, max_chars)
+                try:
+                    return fut.result(timeout=timeout)
+                except FutureTimeout:
+                    _kill(lane)
+                    lane = None
+                    raise ExtractionTimeout(f"PDF extraction exceeded {timeout:g}s") from None
+            except BrokenProcessPool as ex:
+                if lane is not None:
+                    lane.shutdown(wait=False, cancel_futures=True)
+                    lane = None
+                if attempt:
+                    raise RuntimeError("PDF extraction worker crashed") from ex
+            finally:
+                self._release(lane)
+        raise RuntimeError("PDF extraction worker crashed")
+
+    def close(self) -> None:
+        self._closed = True
+        drained = 0
+        while True:
+            try:
+                lane = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            drained += 1
+            if lane is not None:
+                lane.shutdown(wait=True, cancel_futures=True)
+        # Busy lanes are shut down when they're released; keep the slot count for late callers
+        for _ in range(drained):
+            self._idle.put(None)
+
+
+_executor: Optional[ExtractionExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_extraction_executor(**kwargs) -> ExtractionExecutor:
+    """Create (or replace) the process-wide executor. Called by the app / CLI at startup."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.close()
+        _executor = ExtractionExecutor(**kwargs)
+        return _executor
+
+
+def get_extraction_executor() -> ExtractionExecutor:
+    """Process-wide executor; created with defaults on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ExtractionExecutor()
+        return _executor
@@ -0,0 +1,182 @@
+"""
+Intro / conclusion extraction from PDFs (see segment.py for the heuristics).
+
+Pure, CPU-bound functions with no pipeline state, so they can run either
+inline or inside an `ExtractionExecutor` worker process.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import fitz  # PyMuPDF
+
+from .segment import (
+    Line,
+    Segmentation,
+    fallback_intro,
+    fallback_summary,
+    possible_heading,
+    read_lines,
+    segment,
+)
+
+
+PdfInput = Union[bytes, str, Path]
+
+# Bump whenever the section heuristics change; invalidates cached extractions.
+EXTRACTION_VERSION = 2
+
+_INTRO_NAMES = ("introduction",)
+_SUMMARY_NAMES = ("conclusion", "conclusions", "summary", "discussion")
+_REFERENCE_NAMES = ("references", "bibliography")
+
+
+class WindowSpec(NamedTuple):
+    """
+    Which pages to parse.
+      - fixed: exactly the first `head_pages` and last `tail_pages`
+      - adaptive: pages are parsed lazily; walk forward until the section
+        after the introduction starts and backward until a conclusion is
+        found ahead of the references, with head/tail_pages as hard caps
+    """
+    mode: str
+    head_pages: int
+    tail_pages: int
+
+    def key(self) -> str:
+        return f"{self.mode}:h{self.head_pages}:t{self.tail_pages}"
+
+
+class Sections(NamedTuple):
+    intro_text: str
+    summary_text: str
+    pages_parsed: int
+    page_count: int
+    peak_rss_kb: int = 0        # worker peak RSS growth while parsing (0 when run inline)
+
+
+def _open_pdf(source: PdfInput) -> "fitz.Document":
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(str(source), filetype="pdf")
+
+
+class _PageReader:
+    """Parses each page at most once, on first use (head and tail may overlap)."""
+
+    def __init__(self, doc: "fitz.Document") -> None:
+        self.doc = doc
+        self.page_count = len(doc)
+        self._pages: Dict[int, List[Line]] = {}
+
+    def lines(self, pages: Iterable[int]) -> List[Line]:
+        out: List[Line] = []
+        for i in pages:
+            if i not in self._pages:
+                self._pages[i] = read_lines(self.doc, (i,))
+            out.extend(self._pages[i])
+        return out
+
+    @property
+    def parsed(self) -> int:
+        return len(self._pages)
+
+
+def _has_heading(page: List[Line], names: Tuple[str, ...] = ()) -> bool:
+    """Whether `page` has a possible heading (containing one of `names`, if given)."""
+    for ln in page:
+        title = possible_heading(ln.text)
+        if title is not None and (not names or any(n in title for n in names)):
+            return True
+    return False
+
+
+def _adaptive_head(reader: _PageReader, cap: int) -> Tuple[List[Line], Segmentation]:
+    """
+    Grow the head window until the introduction is followed by another section.
+    The window is only re-segmented when the new page has a possible heading.
+    """
+    lines: List[Line] = []
+    seg: Optional[Segmentation] = None
+    for i in range(min(cap, reader.page_count)):
+        page = reader.lines((i,))
+        lines.extend(page)
+        if not _has_heading(page):
+            seg = None
+            continue
+        seg = segment(lines)
+        intro = seg.find(_INTRO_NAMES)
+        if intro is not None and intro.end < len(seg.text):
+            return lines, seg
+    return lines, seg or segment(lines)
+
+
+def _adaptive_tail(reader: _PageReader, cap: int) -> Tuple[List[Line], Segmentation]:
+    """
+    Grow the tail window backward until a conclusion precedes the references.
+    The window is only re-segmented when the new page may hold either heading.
+    """
+    n = reader.page_count
+    pages: List[List[Line]] = []
+    seg: Optional[Segmentation] = None
+    for i in range(n - 1, max(-1, n - 1 - cap), -1):
+        page = reader.lines((i,))
+        pages.insert(0, page)
+        if not _has_heading(page, _SUMMARY_NAMES + _REFERENCE_NAMES):
+            seg = None
+            continue
+        lines = [ln for p in pages for ln in p]
+        seg = segment(lines)
+        concl = seg.find(_SUMMARY_NAMES)
+        if concl is None:
+            continue
+        refs = seg.find(_REFERENCE_NAMES)
+        if refs is None or concl.start < refs.start:
+            return lines, seg
+    lines = [ln for p in pages for ln in p]
+    return lines, seg or segment(lines)
+
+
+def _read_windows(
+    reader: _PageReader, window: WindowSpec
+) -> Tuple[List[Line], Segmentation, List[Line], Segmentation]:
+    if window.mode == "adaptive":
+        head_lines, head_seg = _adaptive_head(reader, max(1, window.head_pages))
+        tail_lines, tail_seg = _adaptive_tail(reader, max(1, window.tail_pages))
+        return head_lines, head_seg, tail_lines, tail_seg
+
+    n = reader.page_count
+    head_lines = reader.lines(range(max(0, min(window.head_pages, n))))
+    tail_lines = reader.lines(range(max(0, n - max(0, min(window.tail_pages, n))), n))
+    return head_lines, segment(head_lines), tail_lines, segment(tail_lines)
+
+
+def _section_text(seg: Segmentation, names: Tuple[str, ...], max_chars: int) -> str:
+    sec = seg.find(names)
+    if sec is None:
+        return ""
+    return seg.text[sec.start:sec.end].strip()[:max_chars]
+
+
+def extract_sections(source: PdfInput, window: WindowSpec, max_chars: int) -> Sections:
+    """Intro and summary text for one PDF (bytes or a path on disk)."""
+    doc = _open_pdf(source)
+    try:
+        reader = _PageReader(doc)
+        head_lines, head_seg, tail_lines, tail_seg = _read_windows(reader, window)
+    finally:
+        doc.close()
+
+    # Intro from head window
+    intro_text = _section_text(head_seg, _INTRO_NAMES, max_chars)
+    if not intro_text:
+        intro_text = fallback_intro(head_lines, max_chars)
+
+    # Summary from tail window
+    summary_text = _section_text(tail_seg, _SUMMARY_NAMES, max_chars)
+    if not summary_text:
+        summary_text = fallback_summary(tail_lines, max_chars)
+
+    return Sections(intro_text, summary_text, reader.parsed, reader.page_count)
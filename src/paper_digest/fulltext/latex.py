@@ -0,0 +1,155 @@
+"""
+Section extraction from arXiv e-print (LaTeX source) archives.
+
+An e-print is a gzipped tarball, a single gzipped .tex file, or (when the
+authors only uploaded a PDF) a PDF. The sectioning in the source is explicit,
+so intro / conclusion come straight from `\\section{...}` boundaries:
+
+  - unpack .tex members (with per-file and total size caps)
+  - pick the main file (`\\documentclass` + `\\begin{document}`)
+  - inline `\\input` / `\\include` / `\\subfile` recursively
+  - strip comments and slice sections, ending at the next section, the
+    bibliography, `\\appendix` or `\\end{document}`
+
+`extract_latex_sections` returns None whenever the archive isn't usable, so
+callers can fall back to the PDF path.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import re
+import tarfile
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+_MAX_MEMBER_BYTES = 5 * 1024 * 1024
+_MAX_TOTAL_BYTES = 50 * 1024 * 1024
+_MAX_INCLUDE_DEPTH = 10
+
+_COMMENT_RE = re.compile(r"(?<!\\)%.*")
+_INPUT_RE = re.compile(r"\\(?:input|include|subfile)\s*\{([^}]+)\}")
+_SECTION_RE = re.compile(r"\\section\*?\s*(?:\[[^\]]*\])?\s*\{((?:[^{}]|\{[^{}]*\})*)\}")
+_END_RE = re.compile(
+    r"\\bibliography\s*\{|\\begin\s*\{thebibliography\}|\\printbibliography|\\appendix\b|\\end\s*\{document\}"
+)
+_DROP_RE = re.compile(r"\\(?:label|cite[a-z]*|ref|eqref|autoref|cref|Cref)\*?\s*(?:\[[^\]]*\])*\s*\{[^}]*\}")
+
+_INTRO_NAMES = ("introduction",)
+_SUMMARY_NAMES = ("conclusion", "conclusions", "summary", "discussion")
+
+
+def _decode(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def unpack_eprint(path: Path) -> Dict[str, str]:
+    """.tex members of an e-print archive, by normalized relative path. Empty if not LaTeX."""
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(b"%PDF"):
+        return {}
+
+    if tarfile.is_tarfile(path):
+        files: Dict[str, str] = {}
+        total = 0
+        with tarfile.open(path, "r:*") as tar:
+            for member in tar:
+                if not member.isfile() or not member.name.lower().endswith(".tex"):
+                    continue
+                if member.size > _MAX_MEMBER_BYTES or total + member.size > _MAX_TOTAL_BYTES:
+                    continue
+                fh = tar.extractfile(member)
+                if fh is None:
+                    continue
+                total += member.size
+                files[member.name.lstrip("./")] = _decode(fh.read())
+        return files
+
+    # single-file submission: gzipped (usually) or plain .tex
+    raw = path.read_bytes()
+    if magic[:2] == b"\x1f\x8b":
+        with gzip.GzipFile(fileobj=io.BytesIO(raw)) as gz:
+            raw = gz.read(_MAX_TOTAL_BYTES + 1)
+        if raw.startswith(b"%PDF"):
+            return {}
+    text = _decode(raw[:_MAX_TOTAL_BYTES])
+    return {"main.tex": text} if "\\begin{document}" in text else {}
+
+
+def find_main_tex(files: Dict[str, str]) -> Optional[str]:
+    mains = [
+        name for name, text in files.items()
+        if "\\documentclass" in text and "\\begin{document}" in text
+    ]
+    if not mains:
+        return None
+    # several candidates (e.g. a supplement): prefer the conventional names, then the largest
+    preferred = [m for m in mains if Path(m).stem.lower() in {"main", "paper", "ms", "manuscript"}]
+    return max(preferred or mains, key=lambda m: len(files[m]))
+
+
+def _strip_comments(text: str) -> str:
+    return "\n".join(_COMMENT_RE.sub("", line) for line in text.splitlines())
+
+
+def resolve_inputs(name: str, files: Dict[str, str], _depth: int = 0, _seen: Optional[set] = None) -> str:
+    """Source of `name` with its \\input / \\include / \\subfile targets inlined."""
+    seen = _seen if _seen is not None else set()
+    seen.add(name)
+    base_dir = Path(name).parent
+    text = _strip_comments(files.get(name, ""))
+    if _depth >= _MAX_INCLUDE_DEPTH:
+        return text
+
+    def _inline(m: re.Match) -> str:
+        target = m.group(1).strip()
+        for cand in (target, f"{target}.tex"):
+            for key in (cand, str(base_dir / cand)):
+                key = key.lstrip("./")
+                if key in files and key not in seen:
+                    return resolve_inputs(key, files, _depth + 1, seen)
+        return ""
+
+    return _INPUT_RE.sub(_inline, text)
+
+
+def _clean(body: str) -> str:
+    body = _DROP_RE.sub("", body)
+    body = re.sub(r"[ \t]+", " ", body)
+    return re.sub(r"\n\s*\n\s*\n+", "\n\n", body).strip()
+
+
+def _section_text(source: str, names: Tuple[str, ...], max_chars: int) -> str:
+    end_m = _END_RE.search(source)
+    body_end = end_m.start() if end_m else len(source)
+    heads = [m for m in _SECTION_RE.finditer(source, 0, body_end)]
+    for k, m in enumerate(heads):
+        title = m.group(1).strip()
+        if any(n in title.lower() for n in names):
+            end = heads[k + 1].start() if k + 1 < len(heads) else body_end
+            return f"{title}\n{_clean(source[m.end():end])}"[:max_chars]
+    return ""
+
+
+def extract_latex_sections(path: Path, max_chars: int) -> Optional[Tuple[str, str]]:
+    """(intro_text, summary_text) from an e-print archive, or None if it isn't usable."""
+    try:
+        files = unpack_eprint(path)
+    except (tarfile.TarError, OSError, EOFError, gzip.BadGzipFile, zlib.error):
+        return None
+    main = find_main_tex(files)
+    if main is None:
+        return None
+
+    source = resolve_inputs(main, files)
+    intro_text = _section_text(source, _INTRO_NAMES, max_chars)
+    summary_text = _section_text(source, _SUMMARY_NAMES, max_chars)
+    if not intro_text or not summary_text:
+        return None
+    return intro_text, summary_text
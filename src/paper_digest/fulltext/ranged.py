@@ -0,0 +1,500 @@
+"""
+HTTP Range fetching of only the PDF objects the head / tail pages need.
+
+The figure-heavy middle of a paper is never parsed, so it needn't be
+downloaded either. Starting from the end of the file:
+
+  1. fetch the last 64KB (and later the 1KB header), find `startxref` and parse the cross-reference
+     sections (classic tables and compressed xref streams, following /Prev)
+  2. walk the page tree from /Root to list every page object
+  3. for the wanted head and tail pages, follow indirect references layer by
+     layer (contents, resources, fonts, ...), never crossing into other pages
+  4. fetch each layer's byte ranges (nearby ranges are merged)
+
+Fetched ranges are written at their offsets into a sparse file of the full
+size, which PyMuPDF opens like any other PDF. Anything unexpected (no 206,
+encryption, exotic filters, too many requests) raises `RangeFetchFailed`
+and callers fall back to a full download.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import fitz  # PyMuPDF
+import requests
+
+from paper_digest.transport import TransportStats, get_transport
+
+
+_TAIL_PROBE_BYTES = 64 * 1024
+_HEADER_BYTES = 1024
+_READ_STEP_BYTES = 16 * 1024
+_MERGE_GAP_BYTES = 64 * 1024
+_MAX_REQUESTS = 24
+_MAX_COVERAGE = 0.7     # past this share of the file, just fetch the rest
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_REF_RE = re.compile(rb"(\d+)\s+(\d+)\s+R(?![A-Za-z])")
+_PARENT_RE = re.compile(rb"/Parent\s+\d+\s+\d+\s+R")
+_KIDS_RE = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+_TYPE_PAGES_RE = re.compile(rb"/Type\s*/Pages\b")
+_STREAM_RE = re.compile(rb"stream\r?\n")
+
+
+class RangeFetchFailed(RuntimeError):
+    pass
+
+
+class RangedPdf(NamedTuple):
+    path: Path
+    page_count: int
+    size: int               # full size of the remote file
+    bytes_fetched: int
+    requests: int
+
+
+# Entries: objnum -> (1, offset, 0) for plain objects, (2, stream_objnum, index) for compressed
+_Entry = Tuple[int, int, int]
+
+
+class _SparseFile:
+    """Remote file mirrored into a local sparse file, one byte range at a time."""
+
+    def __init__(self, url: str, path: Path, timeout_s: float, stats: Optional[TransportStats]) -> None:
+        self.url = url
+        self.timeout_s = timeout_s
+        self.stats = stats
+        self.size = 0
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._covered: List[Tuple[int, int]] = []      # sorted, merged [start, end)
+        self._f = open(path, "w+b")
+
+    def close(self) -> None:
+        self._f.close()
+
+    def _get(self, header: str) -> Tuple[int, bytes]:
+        if self.requests >= _MAX_REQUESTS:
+            raise RangeFetchFailed(f"more than {_MAX_REQUESTS} range requests needed")
+        r = get_transport().get(
+            self.url,
+            timeout=self.timeout_s,
+            stats=self.stats,
+            stream=True,
+            headers={"Range": header, "Accept-Encoding": "identity"},
+        )
+        try:
+            if r.status_code != 206:
+                raise RangeFetchFailed(f"server answered {r.status_code} to a Range request")
+            m = _CONTENT_RANGE_RE.match(r.headers.get("Content-Range") or "")
+            if not m:
+                raise RangeFetchFailed("206 response without a usable Content-Range")
+            data = r.content
+        finally:
+            r.close()
+
+        start, end, total = (int(g) for g in m.groups())
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        if self.stats is not None:
+            self.stats.add_bytes(len(data))
+        if len(data) != end - start + 1:
+            raise RangeFetchFailed("short range response")
+        self.size = total
+        self._f.seek(start)
+        self._f.write(data)
+        self._mark(start, end + 1)
+        return start, data
+
+    def _mark(self, start: int, end: int) -> None:
+        spans = sorted(self._covered + [(start, end)])
+        merged: List[Tuple[int, int]] = []
+        for a, b in spans:
+            if merged and a <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        self._covered = merged
+
+    def _gaps(self, start: int, end: int) -> List[Tuple[int, int]]:
+        gaps: List[Tuple[int, int]] = []
+        pos = start
+        for a, b in self._covered:
+            if b <= pos:
+                continue
+            if a >= end:
+                break
+            if a > pos:
+                gaps.append((pos, a))
+            pos = max(pos, b)
+        if pos < end:
+            gaps.append((pos, end))
+        return gaps
+
+    def covered_bytes(self) -> int:
+        return sum(b - a for a, b in self._covered)
+
+    def fetch_tail(self, n: int) -> None:
+        self._get(f"bytes=-{n}")
+
+    def ensure(self, spans: Iterable[Tuple[int, int]]) -> None:
+        """Fetch whatever part of `spans` isn't local yet, merging nearby gaps."""
+        gaps: List[Tuple[int, int]] = []
+        for a, b in sorted(spans):
+            gaps.extend(self._gaps(max(0, a), min(self.size, b)))
+        if not gaps:
+            return
+        pending = sum(b - a for a, b in gaps)
+        if self.covered_bytes() + pending > _MAX_COVERAGE * self.size:
+            gaps = [(gaps[0][0] if len(gaps) == 1 else min(a for a, _ in gaps), max(b for _, b in gaps))]
+        merged: List[Tuple[int, int]] = []
+        for a, b in sorted(gaps):
+            if merged and a - merged[-1][1] <= _MERGE_GAP_BYTES:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        for a, b in merged:
+            self._get(f"bytes={a}-{b - 1}")
+
+    def read(self, start: int, end: int) -> bytes:
+        end = min(self.size, end)
+        self.ensure([(start, end)])
+        self._f.seek(start)
+        return self._f.read(end - start)
+
+    def finish(self) -> None:
+        self._f.truncate(self.size)
+        self._f.flush()
+
+
+def _dict_span(data: bytes, start: int) -> Tuple[int, int]:
+    """[start, end) of the `<< ... >>` dictionary beginning at or after `start`."""
+    i = data.find(b"<<", start)
+    if i < 0:
+        raise RangeFetchFailed("expected a dictionary")
+    depth, j = 0, i
+    while j < len(data) - 1:
+        pair = data[j:j + 2]
+        if pair == b"<<":
+            depth += 1
+            j += 2
+        elif pair == b">>":
+            depth -= 1
+            j += 2
+            if depth == 0:
+                return i, j
+        else:
+            j += 1
+    raise RangeFetchFailed("unterminated dictionary")
+
+
+def _int_key(d: bytes, key: bytes) -> Optional[int]:
+    m = re.search(rb"/" + key + rb"\s+(\d+)\b(?!\s+\d+\s+R)", d)
+    return int(m.group(1)) if m else None
+
+
+def _unpredict(data: bytes, params: bytes) -> bytes:
+    """Undo PNG predictors (None / Sub / Up), as used by xref and object streams."""
+    predictor = _int_key(params, b"Predictor") or 1
+    if predictor < 10:
+        if predictor == 1:
+            return data
+        raise RangeFetchFailed(f"unsupported predictor {predictor}")
+    columns = _int_key(params, b"Columns") or 1
+    row = columns + 1
+    out = bytearray()
+    prev = bytearray(columns)
+    for i in range(0, len(data) - row + 1, row):
+        ftype, cur = data[i], bytearray(data[i + 1:i + row])
+        if ftype == 1:
+            for j in range(1, columns):
+                cur[j] = (cur[j] + cur[j - 1]) & 0xFF
+        elif ftype == 2:
+            for j in range(columns):
+                cur[j] = (cur[j] + prev[j]) & 0xFF
+        elif ftype != 0:
+            raise RangeFetchFailed(f"unsupported PNG filter {ftype}")
+        out += cur
+        prev = cur
+    return bytes(out)
+
+
+def _stream_data(obj: bytes, length: Optional[int] = None) -> Tuple[bytes, bytes]:
+    """(dictionary, decoded stream data) of a stream object's bytes."""
+    d0, d1 = _dict_span(obj, 0)
+    d = obj[d0:d1]
+    m = _STREAM_RE.search(obj, d1)
+    if not m:
+        raise RangeFetchFailed("expected a stream")
+    raw = obj[m.end():m.end() + length] if length is not None else obj[m.end():]
+    if re.search(rb"/Filter\s*\[?\s*/FlateDecode\s*\]?", d):
+        dec = zlib.decompressobj()
+        try:
+            raw = dec.decompress(raw)
+        except zlib.error as ex:
+            raise RangeFetchFailed(f"bad Flate stream: {ex}") from None
+    elif b"/Filter" in d:
+        raise RangeFetchFailed("unsupported stream filter")
+    parms = re.search(rb"/DecodeParms\s*<<(.*?)>>", d, re.S)
+    if parms:
+        raw = _unpredict(raw, parms.group(1))
+    return d, raw
+
+
+class _PdfIndex:
+    def __init__(self, sf: _SparseFile) -> None:
+        self.sf = sf
+        self.entries: Dict[int, _Entry] = {}
+        self.root: Optional[int] = None
+        self._boundaries: List[int] = []
+        self._objstm: Dict[int, Dict[int, bytes]] = {}
+
+    # -- cross-reference ------------------------------------------------
+    def load_xref(self) -> None:
+        tail = self.sf.read(max(0, self.sf.size - _TAIL_PROBE_BYTES), self.sf.size)
+        found = _STARTXREF_RE.findall(tail)
+        if not found:
+            raise RangeFetchFailed("no startxref in the file tail")
+        offset: Optional[int] = int(found[-1])
+        seen: Set[int] = set()
+        xref_offsets: List[int] = []
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            xref_offsets.append(offset)
+            head = self.sf.read(offset, offset + 32).lstrip()
+            offset = self._xref_table(offset) if head.startswith(b"xref") else self._xref_stream(offset)
+        if self.root is None:
+            raise RangeFetchFailed("trailer has no /Root")
+        offsets = {off for kind, off, _ in self.entries.values() if kind == 1}
+        self._boundaries = sorted(offsets | set(xref_offsets) | {self.sf.size})
+
+    def _read_until(self, start: int, marker: bytes) -> bytes:
+        end = start + _READ_STEP_BYTES
+        while True:
+            data = self.sf.read(start, end)
+            if marker in data or end >= self.sf.size:
+                return data
+            end += max(_READ_STEP_BYTES, end - start)
+
+    def _trailer(self, d: bytes) -> Optional[int]:
+        if b"/Encrypt" in d:
+            raise RangeFetchFailed("encrypted PDF")
+        if self.root is None:
+            m = re.search(rb"/Root\s+(\d+)\s+\d+\s+R", d)
+            if m:
+                self.root = int(m.group(1))
+        return _int_key(d, b"Prev")
+
+    def _xref_table(self, offset: int) -> Optional[int]:
+        data = self._read_until(offset, b"trailer")
+        t = data.find(b"trailer")
+        if t < 0:
+            raise RangeFetchFailed("xref table without trailer")
+        data = self._read_until(offset, b">>") if data.find(b">>", t) < 0 else data
+        d0, d1 = _dict_span(data, t)
+        trailer = data[d0:d1]
+
+        tokens = data[data.find(b"xref") + 4:t].split()
+        i = 0
+        while i + 1 < len(tokens):
+            first, count = int(tokens[i]), int(tokens[i + 1])
+            i += 2
+            for k in range(count):
+                off, kind = int(tokens[i]), tokens[i + 2]
+                i += 3
+                if kind == b"n":
+                    self.entries.setdefault(first + k, (1, off, 0))
+
+        stm = _int_key(trailer, b"XRefStm")
+        if stm is not None:
+            self._xref_stream(stm)
+        return self._trailer(trailer)
+
+    def _xref_stream(self, offset: int) -> Optional[int]:
+        head = self._read_until(offset, b"stream")
+        d0, d1 = _dict_span(head, 0)
+        d = head[d0:d1]
+        if not re.search(rb"/Type\s*/XRef\b", d):
+            raise RangeFetchFailed("startxref points at neither a table nor an xref stream")
+        length = _int_key(d, b"Length")
+        if length is None:
+            raise RangeFetchFailed("xref stream without a direct /Length")
+        body_at = _STREAM_RE.search(head, d1)
+        if not body_at:
+            raise RangeFetchFailed("xref stream without data")
+        obj = self.sf.read(offset, offset + body_at.end() + length)
+        _, raw = _stream_data(obj, length)
+
+        w = [int(x) for x in re.search(rb"/W\s*\[([^\]]*)\]", d).group(1).split()]
+        size = _int_key(d, b"Size") or 0
+        index_m = re.search(rb"/Index\s*\[([^\]]*)\]", d)
+        index = [int(x) for x in index_m.group(1).split()] if index_m else [0, size]
+        row = sum(w)
+        pos = 0
+        for first, count in zip(index[::2], index[1::2]):
+            for k in range(count):
+                fields, p = [], pos
+                for width in w:
+                    fields.append(int.from_bytes(raw[p:p + width], "big") if width else None)
+                    p += width
+                pos += row
+                kind = fields[0] if fields[0] is not None else 1
+                if kind in (1, 2):
+                    self.entries.setdefault(first + k, (kind, fields[1] or 0, fields[2] or 0))
+        return self._trailer(d)
+
+    # -- objects ----------------------------------------------------------
+    def span(self, objnum: int) -> Optional[Tuple[int, int]]:
+        """Byte range that holds `objnum` (its object stream's range if compressed)."""
+        entry = self.entries.get(objnum)
+        if entry is None:
+            return None
+        if entry[0] == 2:
+            return self.span(entry[1])
+        off = entry[1]
+        nxt = next((b for b in self._boundaries if b > off), self.sf.size)
+        return off, nxt
+
+    def body(self, objnum: int) -> bytes:
+        """The object's text, minus any stream data."""
+        entry = self.entries.get(objnum)
+        if entry is None:
+            return b""
+        if entry[0] == 2:
+            return self._compressed(entry[1]).get(objnum, b"")
+        a, b = self.span(objnum)  # type: ignore[misc]
+        data = self.sf.read(a, b)
+        m = _STREAM_RE.search(data)
+        end = data.find(b"endobj")
+        if m and (end < 0 or m.start() < end):
+            return data[:m.start()]
+        return data[:end] if end >= 0 else data
+
+    def _compressed(self, stm: int) -> Dict[int, bytes]:
+        if stm not in self._objstm:
+            a, b = self.span(stm)  # type: ignore[misc]
+            d, raw = _stream_data(self.sf.read(a, b))
+            n, first = _int_key(d, b"N") or 0, _int_key(d, b"First") or 0
+            nums = [int(x) for x in raw[:first].split()[: 2 * n]]
+            pairs = list(zip(nums[::2], nums[1::2]))
+            objs: Dict[int, bytes] = {}
+            for k, (num, rel) in enumerate(pairs):
+                end = first + pairs[k + 1][1] if k + 1 < len(pairs) else len(raw)
+                objs[num] = raw[first + rel:end]
+            self._objstm[stm] = objs
+        return self._objstm[stm]
+
+    def prefetch(self, objnums: Iterable[int]) -> None:
+        spans = [s for s in (self.span(n) for n in objnums) if s is not None]
+        self.sf.ensure(spans)
+
+
+def _page_objects(index: _PdfIndex) -> List[int]:
+    """Page object numbers in document order, fetched breadth-first."""
+    # the header is checked on open; grab it with the catalog
+    index.sf.ensure([(0, _HEADER_BYTES), index.span(index.root)])  # type: ignore[list-item]
+    catalog = index.body(index.root)  # type: ignore[arg-type]
+    m = re.search(rb"/Pages\s+(\d+)\s+\d+\s+R", catalog)
+    if not m:
+        raise RangeFetchFailed("catalog without /Pages")
+
+    # Each level is fetched in one batch, then expanded in order.
+    level: List[Tuple[int, bool]] = [(int(m.group(1)), True)]
+    seen: Set[int] = set()
+    while any(is_node for _, is_node in level):
+        index.prefetch(n for n, is_node in level if is_node)
+        nxt: List[Tuple[int, bool]] = []
+        for num, is_node in level:
+            if not is_node:
+                nxt.append((num, False))
+                continue
+            if num in seen:
+                raise RangeFetchFailed("cycle in the page tree")
+            seen.add(num)
+            body = index.body(num)
+            kids = _KIDS_RE.search(body)
+            if not _TYPE_PAGES_RE.search(body) or not kids:
+                nxt.append((num, False))
+                continue
+            kid_nums = [int(k) for k, _ in _REF_RE.findall(kids.group(1))]
+            index.prefetch(kid_nums)
+            nxt.extend((k, bool(_TYPE_PAGES_RE.search(index.body(k)))) for k in kid_nums)
+        level = nxt
+    return [n for n, _ in level]
+
+
+def _closure(index: _PdfIndex, pages: List[int], all_pages: Set[int]) -> None:
+    """Fetch every object reachable from `pages` without entering other pages."""
+    frontier = list(pages)
+    seen: Set[int] = set(frontier)
+    while frontier:
+        index.prefetch(frontier)
+        nxt: List[int] = []
+        for num in frontier:
+            body = _PARENT_RE.sub(b"", index.body(num))
+            for ref, _ in _REF_RE.findall(body):
+                ref_num = int(ref)
+                if ref_num in seen or ref_num in all_pages:
+                    continue
+                seen.add(ref_num)
+                nxt.append(ref_num)
+        frontier = nxt
+
+
+def fetch_pdf_ranges(
+    url: str,
+    spool_dir: Path,
+    head_pages: int,
+    tail_pages: int,
+    *,
+    timeout_s: float,
+    stats: Optional[TransportStats] = None,
+) -> RangedPdf:
+    """
+    Sparse local copy of `url` holding everything needed to parse its first
+    `head_pages` and last `tail_pages`. The caller owns (and removes) the file.
+    Raises RangeFetchFailed when a full download is the better option.
+    """
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=spool_dir, suffix=".pdf.part")
+    os.close(fd)
+    path = Path(tmp)
+    sf = _SparseFile(url, path, timeout_s, stats)
+    ok = False
+    try:
+        sf.fetch_tail(_TAIL_PROBE_BYTES)
+        index = _PdfIndex(sf)
+        index.load_xref()
+        pages = _page_objects(index)
+        n = len(pages)
+        if n <= head_pages + tail_pages:
+            raise RangeFetchFailed("every page is needed")
+
+        wanted = pages[:head_pages] + pages[n - tail_pages:] if tail_pages else pages[:head_pages]
+        _closure(index, wanted, set(pages))
+        sf.finish()
+        sf.close()
+
+        with fitz.open(str(path), filetype="pdf") as doc:
+            if doc.is_repaired or len(doc) != n:
+                raise RangeFetchFailed("sparse copy does not open cleanly")
+        ok = True
+        return RangedPdf(path, n, sf.size, sf.bytes_fetched, sf.requests)
+    except RangeFetchFailed:
+        raise
+    except requests.RequestException as ex:
+        raise RangeFetchFailed(f"range request failed: {type(ex).__name__}") from None
+    except Exception as ex:
+        # MuPDF open errors and anything unforeseen: a full download is still worth trying
+        raise RangeFetchFailed(f"{type(ex).__name__}: {ex}") from None
+    finally:
+        sf.close()
+        if not ok:
+            path.unlink(missing_ok=True)
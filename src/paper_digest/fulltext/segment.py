@@ -0,0 +1,187 @@
+"""
+Single-pass, layout-aware section segmentation.
+
+`read_lines` walks PyMuPDF's dict output (blocks -> lines -> spans) once per
+page and keeps, for every text line, its largest font size and whether it
+is bold. `segment` then builds the window text once, recording each line's
+character offset, and marks headings using both text and layout:
+
+  - numbered titles ("3 Method", "4.2 Results", "IV. EXPERIMENTS") and bare
+    well-known names ("Introduction", "References") are candidates
+  - when the document styles its headings (bold or larger than body text),
+    unstyled candidates are ignored, which drops numbered body lines
+    ("2 GPUs were used ...") that plain-text matching would accept
+  - short styled lines that are title-cased and don't end in punctuation
+    are kept as generic section boundaries
+
+Every section's [start, end) offsets into the text come back at once, so
+the intro and the conclusion are looked up without re-joining or
+re-splitting the window.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+import fitz  # PyMuPDF
+
+
+_NUMBERED_RE = re.compile(
+    r"^\s*(?:(?:\d+(?:\.\d+)*)|(?:[IVX]{1,5}))\.?\s+([A-Z][A-Za-z0-9\-\s:,&]{2,})\s*$"
+)
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-]+")
+
+_KNOWN_TITLES = frozenset({
+    "abstract", "introduction", "conclusion", "conclusions", "summary", "discussion",
+    "references", "bibliography", "acknowledgements", "acknowledgments", "appendix",
+})
+
+_BOLD_FLAG = 1 << 4
+_MAX_HEADING_CHARS = 80
+_MAX_HEADING_WORDS = 10
+_SIZE_RATIO = 1.12
+
+
+class Line(NamedTuple):
+    text: str
+    size: float
+    bold: bool
+
+
+class Section(NamedTuple):
+    title: str          # lower-cased heading text without its number
+    start: int          # offset of the heading line in Segmentation.text
+    end: int            # offset of the next heading (or len(text))
+
+
+class Segmentation(NamedTuple):
+    text: str
+    line_starts: List[int]
+    sections: List[Section]
+
+    def find(self, names: Sequence[str]) -> Optional[Section]:
+        for sec in self.sections:
+            if any(n in sec.title for n in names):
+                return sec
+        return None
+
+
+def read_lines(doc: "fitz.Document", pages: Iterable[int]) -> List[Line]:
+    """Text lines of `pages`, in reading order, with their font size and weight."""
+    out: List[Line] = []
+    for i in pages:
+        page = doc.load_page(i).get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+        for block in page.get("blocks", ()):
+            for line in block.get("lines", ()):
+                spans = [s for s in line.get("spans", ()) if s.get("text", "").strip()]
+                if not spans:
+                    continue
+                text = "".join(s["text"] for s in line["spans"]).strip()
+                size = max(float(s.get("size", 0.0)) for s in spans)
+                bold = all(
+                    (int(s.get("flags", 0)) & _BOLD_FLAG) or "bold" in str(s.get("font", "")).lower()
+                    for s in spans
+                )
+                out.append(Line(text, size, bold))
+    return out
+
+
+def _body_size(lines: Sequence[Line]) -> float:
+    """Most common font size, weighted by characters."""
+    sizes: Counter = Counter()
+    for ln in lines:
+        sizes[round(ln.size, 1)] += len(ln.text)
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def _candidate_title(text: str) -> Optional[str]:
+    """Lower-cased section title if `text` reads like a heading, else None."""
+    if len(text) > _MAX_HEADING_CHARS:
+        return None
+    low = text.lower().rstrip(":")
+    if low in _KNOWN_TITLES:
+        return low
+    m = _NUMBERED_RE.match(text)
+    if m and len(text.split()) <= _MAX_HEADING_WORDS:
+        return m.group(1).strip().lower()
+    return None
+
+
+def _looks_like_title(text: str) -> bool:
+    words = text.split()
+    return (
+        0 < len(words) <= _MAX_HEADING_WORDS
+        and len(text) <= _MAX_HEADING_CHARS
+        and text[0].isupper()
+        and text[-1] not in ".,;:"
+        and _WORD_RE.search(text) is not None
+    )
+
+
+def possible_heading(text: str) -> Optional[str]:
+    """
+    Lower-cased title if `text` could be a heading under some layout, else
+    None. Cheap and text-only: a page with no such line can't add a section.
+    """
+    title = _candidate_title(text)
+    if title is None and _looks_like_title(text):
+        title = text.lower()
+    return title
+
+
+def segment(lines: Sequence[Line]) -> Segmentation:
+    body = _body_size(lines)
+
+    starts: List[int] = []
+    pos = 0
+    for ln in lines:
+        starts.append(pos)
+        pos += len(ln.text) + 1
+    text = "\n".join(ln.text for ln in lines)
+
+    styled = [bool(body) and (ln.bold or ln.size >= body * _SIZE_RATIO) for ln in lines]
+    titles = [_candidate_title(ln.text) for ln in lines]
+    layout_aware = any(s and t for s, t in zip(styled, titles))
+
+    heads: List[tuple] = []
+    for i, ln in enumerate(lines):
+        title = titles[i]
+        if title is not None:
+            if styled[i] or not layout_aware:
+                heads.append((starts[i], title))
+        elif layout_aware and styled[i] and _looks_like_title(ln.text):
+            heads.append((starts[i], ln.text.lower()))
+
+    sections = [
+        Section(title, start, heads[k + 1][0] if k + 1 < len(heads) else len(text))
+        for k, (start, title) in enumerate(heads)
+    ]
+    return Segmentation(text, starts, sections)
+
+
+def fallback_intro(lines: Sequence[Line], max_chars: int) -> str:
+    """Leading wordy lines, up to max_chars (linear: keeps a running length)."""
+    out: List[str] = []
+    size = 0
+    for ln in lines[:1500]:
+        if _WORD_RE.search(ln.text):
+            out.append(ln.text)
+            size += len(ln.text) + 1
+        if size >= max_chars:
+            break
+    return "\n".join(out)[:max_chars].strip()
+
+
+def fallback_summary(lines: Sequence[Line], max_chars: int) -> str:
+    """Trailing wordy lines, last max_chars."""
+    out: List[str] = []
+    size = 0
+    for ln in reversed(lines[-1200:]):
+        if _WORD_RE.search(ln.text):
+            out.append(ln.text)
+            size += len(ln.text) + 1
+        if size >= max_chars:
+            break
+    return "\n".join(reversed(out))[-max_chars:].strip()
@@ -4,6 +4,7 @@ from langgraph.graph import StateGraph, END
 
 from .state import GraphState
 from .nodes.fetch import fetch_papers
+from .nodes.dedupe import dedupe_papers
 from .nodes.rank import rank_papers
 from .nodes.fetch_full_text_topk import fetch_full_text
 from .nodes.summarize import summarize_topk
@@ -14,11 +15,12 @@ from .nodes.persist import persist_run
 def build():
     """
     Workflow:
-      FetchPapers -> RankPapers -> FetchFullText -> SummarizeTopK -> AssembleDigest -> PersistRun -> END
+      FetchPapers -> DedupePapers -> RankPapers -> FetchFullText -> SummarizeTopK -> AssembleDigest -> PersistRun -> END
     """
     g = StateGraph(GraphState)
 
     g.add_node("FetchPapers", fetch_papers)
+    g.add_node("DedupePapers", dedupe_papers)
     g.add_node("RankPapers", rank_papers)
     g.add_node("FetchFullText", fetch_full_text)
     g.add_node("SummarizeTopK", summarize_topk)
@@ -27,7 +29,8 @@ def build():
 
     g.set_entry_point("FetchPapers")
 
-    g.add_edge("FetchPapers", "RankPapers")
+    g.add_edge("FetchPapers", "DedupePapers")
+    g.add_edge("DedupePapers", "RankPapers")
     g.add_edge("RankPapers", "FetchFullText")
     g.add_edge("FetchFullText", "SummarizeTopK")
     g.add_edge("SummarizeTopK", "AssembleDigest")
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..state import GraphState, Paper
+from paper_digest.arxiv_ids import split_arxiv_id
+from paper_digest.storage import cache_dir
+from paper_digest.storage.signature_store import SignatureStore
+from paper_digest.text import tokenize
+
+
+_NUM_PERM = 64
+_BANDS = 16                      # 16 bands x 4 rows: candidate pairs from ~0.5 Jaccard up
+_ROWS = _NUM_PERM // _BANDS
+_SHINGLE = 3
+_PRIME = np.uint64((1 << 61) - 1)
+
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=_NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=_NUM_PERM).astype(np.uint64)
+
+
+def _minhash(p: Paper) -> np.ndarray:
+    """MinHash signature over word 3-gram shingles of title + abstract."""
+    words = tokenize(f"{p.get('title') or ''} {p.get('abstract') or ''}")
+    shingles = {" ".join(words[i:i + _SHINGLE]) for i in range(max(1, len(words) - _SHINGLE + 1))}
+    hv = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # (a * x + b) mod p for every permutation; uint64 wraparound is fine for hashing
+    perm = (np.outer(hv, _PERM_A) + _PERM_B) % _PRIME
+    return (perm.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def _band_hashes(sig: np.ndarray) -> List[str]:
+    return [
+        hashlib.blake2b(sig[b * _ROWS:(b + 1) * _ROWS].tobytes(), digest_size=8).hexdigest()
+        for b in range(_BANDS)
+    ]
+
+
+def _similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _newer(a: Paper, b: Paper) -> bool:
+    """True if `a` should be preferred over `b` as a cluster's canonical paper."""
+    va = split_arxiv_id(a.get("paper_id") or "")[1]
+    vb = split_arxiv_id(b.get("paper_id") or "")[1]
+    return ((a.get("updated_at") or ""), va) > ((b.get("updated_at") or ""), vb)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def dedupe_papers(state: GraphState) -> GraphState:
+    """
+    Collapse duplicates before the expensive stages (PDF download, LLM calls):
+      1) arXiv id/version: keep one paper per base id (newest version)
+      2) near-duplicates: MinHash + LSH over title/abstract shingles; pairs at or
+         above `dedupe_threshold` estimated Jaccard form clusters, one canonical
+         paper (most recently updated) is kept per cluster
+      3) with `dedupe_persist`, canonical papers are also checked against
+         signatures stored by earlier runs, and then stored themselves
+
+    Canonical papers list the collapsed paper_ids in `duplicates`.
+    """
+    papers: List[Paper] = state.get("papers", []) or []
+    threshold = float(state.get("dedupe_threshold", 0.8))
+    persist = bool(state.get("dedupe_persist", False))
+
+    if not papers or not state.get("dedupe_enabled", True):
+        state.setdefault("logs", []).append(
+            f"DedupePapers: skipped ({len(papers)} papers)."
+        )
+        return state
+
+    # 1) Version / exact-id collapse
+    by_base: Dict[str, int] = {}
+    stage1: List[Paper] = []
+    version_dupes = 0
+    for p in papers:
+        pid = p.get("paper_id") or ""
+        base = split_arxiv_id(pid)[0] or pid
+        j = by_base.get(base)
+        if j is None:
+            by_base[base] = len(stage1)
+            stage1.append(dict(p))  # type: ignore[arg-type]
+            continue
+        version_dupes += 1
+        keep, drop = (p, stage1[j]) if _newer(p, stage1[j]) else (stage1[j], p)
+        merged = dict(keep)
+        merged["duplicates"] = list(stage1[j].get("duplicates", [])) + [drop.get("paper_id", "")]
+        stage1[j] = merged  # type: ignore[assignment]
+
+    # 2) In-run near-duplicates via LSH banding
+    sigs = [_minhash(p) for p in stage1]
+    bands = [_band_hashes(s) for s in sigs]
+    parent = list(range(len(stage1)))
+    buckets: Dict[Tuple[int, str], List[int]] = {}
+    for i, hs in enumerate(bands):
+        for b, h in enumerate(hs):
+            buckets.setdefault((b, h), []).append(i)
+    for members in buckets.values():
+        for x, i in enumerate(members):
+            for j in members[:x]:
+                if _find(parent, i) != _find(parent, j) and _similarity(sigs[i], sigs[j]) >= threshold:
+                    parent[_find(parent, i)] = _find(parent, j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(stage1)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+
+    canonical_idx: List[int] = []
+    near_dupes = 0
+    for members in clusters.values():
+        best = members[0]
+        for i in members[1:]:
+            if _newer(stage1[i], stage1[best]):
+                best = i
+        others = [i for i in members if i != best]
+        if others:
+            near_dupes += len(others)
+            dupes = list(stage1[best].get("duplicates", []))
+            for i in others:
+                dupes.append(stage1[i].get("paper_id", ""))
+                dupes.extend(stage1[i].get("duplicates", []))
+            stage1[best]["duplicates"] = dupes
+        canonical_idx.append(best)
+    canonical_idx.sort()  # keep fetched order
+
+    # 3) Cross-run duplicates against stored signatures
+    store: Optional[SignatureStore] = None
+    cross_run = 0
+    kept: List[int] = []
+    if persist:
+        store = SignatureStore(cache_dir(state) / "signatures.sqlite3")
+    for i in canonical_idx:
+        if store is not None:
+            own = split_arxiv_id(stage1[i].get("paper_id") or "")[0] or stage1[i].get("paper_id", "")
+            matches = [
+                k for k, sig in store.candidates(bands[i]).items()
+                if k != own and _similarity(sig, sigs[i]) >= threshold
+            ]
+            if matches:
+                cross_run += 1
+                continue
+        kept.append(i)
+
+    if store is not None:
+        store.add(
+            (split_arxiv_id(stage1[i].get("paper_id") or "")[0] or stage1[i].get("paper_id", ""),
+             sigs[i], bands[i])
+            for i in kept
+        )
+
+    out = [stage1[i] for i in kept]
+    state["papers"] = out
+    state.setdefault("logs", []).append(
+        f"DedupePapers: {len(papers)} -> {len(out)} papers "
+        f"(version collapses={version_dupes}, near-duplicates={near_dupes} in "
+        f"{sum(1 for m in clusters.values() if len(m) > 1)} clusters, cross-run={cross_run}, "
+        f"threshold={threshold}); saved {len(papers) - len(out)} downstream candidates."
+    )
+    return state
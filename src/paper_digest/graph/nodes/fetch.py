@@ -1,17 +1,34 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List
+import hashlib
+import io
+import json
+import math
 import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import feedparser
-import requests
 
 from ..state import GraphState, Paper
+from paper_digest.sources import oai_pmh
+from paper_digest.sources.arxiv_atom import iter_arxiv_entries
+from paper_digest.storage import cache_dir
+from paper_digest.storage.catalog import PaperCatalog
+from paper_digest.storage.response_cache import ResponseCache
+from paper_digest.storage.seen_store import SeenStore, profile_key
+from paper_digest.text import tokenize
+from paper_digest.transport import RetryPolicy, TransportStats, get_transport
 
 
 ARXIV_API = "https://export.arxiv.org/api/query"
 
+# Categories searched when no topics are given; also the shard keys for sharded fetches.
+_DEFAULT_CATEGORIES = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.IR"]
+# Each shard fetches its share of max_results plus this fraction, since categories aren't equally busy
+_SHARD_MARGIN = 0.5
+
 
 def _build_arxiv_query(topics: List[str]) -> str:
     """
@@ -21,7 +38,7 @@ def _build_arxiv_query(topics: List[str]) -> str:
     Otherwise search title/abstract for the provided keywords.
     """
     if not topics:
-        return "cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:cs.CV OR cat:cs.IR"
+        return " OR ".join(f"cat:{c}" for c in _DEFAULT_CATEGORIES)
 
     parts = []
     for t in topics:
@@ -66,85 +83,491 @@ def _parse_arxiv_entry(entry) -> Paper:
     }
 
 
+def _build_shard_queries(topics: List[str], shard_categories: bool) -> List[Tuple[str, str]]:
+    """
+    Return [(shard_label, search_query)].
+
+    Without sharding this is a single query. With sharding, the query is split
+    into one query per default category so each shard can be paged on its own.
+    """
+    if not shard_categories:
+        return [("all", _build_arxiv_query(topics))]
+
+    has_topics = any(t and t.strip() for t in topics)
+    topic_query = _build_arxiv_query(topics) if has_topics else ""
+
+    shards = []
+    for cat in _DEFAULT_CATEGORIES:
+        q = f"({topic_query}) AND cat:{cat}" if topic_query else f"cat:{cat}"
+        shards.append((cat, q))
+    return shards
+
+
+def _plan_windows(
+    shards: List[Tuple[str, str]], max_results: int, page_size: int
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Split each shard query into start/max_results windows; `max_results` is per shard.
+
+    page_size <= 0 means one window per shard covering all `max_results`.
+    """
+    step = page_size if page_size > 0 else max_results
+    windows = []
+    for label, query in shards:
+        for start in range(0, max_results, max(1, step)):
+            windows.append(
+                (
+                    label,
+                    {
+                        "search_query": query,
+                        "sortBy": "lastUpdatedDate",
+                        "sortOrder": "descending",
+                        "start": start,
+                        "max_results": min(step, max_results - start),
+                    },
+                )
+            )
+    return windows
+
+
+class _PageResult(NamedTuple):
+    papers: List[Paper]
+    logs: List[str]
+    error: Optional[Exception]
+    cache_status: str           # "hit" | "revalidated" | "stale" | "miss" | "off"
+    entries: int = 0            # raw <entry> count, before dropping entries without title/abstract
+
+
+class _TeeReader:
+    """File-like wrapper that counts bytes read and optionally keeps a copy (for the cache)."""
+
+    def __init__(self, raw, keep: bool = True) -> None:
+        self._raw = raw
+        self._keep = keep
+        self.chunks: List[bytes] = []
+        self.nbytes = 0
+
+    def read(self, n: int = -1) -> bytes:
+        b = self._raw.read(n)
+        if b:
+            self.nbytes += len(b)
+            if self._keep:
+                self.chunks.append(b)
+        return b
+
+
+def _parse_feed(source, parser: str = "stream") -> List[Paper]:
+    return _parse_page(source, parser)[0]
+
+
+def _parse_page(source, parser: str = "stream") -> Tuple[List[Paper], int]:
+    """
+    Parse an arXiv Atom feed from bytes or a binary stream. Returns the papers
+    with a title and abstract, and the raw entry count (for end-of-results checks).
+
+    parser="stream" uses the incremental arXiv-specific parser;
+    parser="feedparser" builds the full feedparser tree (reference implementation).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    if parser == "feedparser":
+        entries = [_parse_arxiv_entry(e) for e in feedparser.parse(source.read()).entries]
+    else:
+        entries = list(iter_arxiv_entries(source))
+
+    return [p for p in entries if p.get("title") and p.get("abstract")], len(entries)
+
+
+def _fetch_page(
+    label: str,
+    params: Dict[str, Any],
+    timeout_s: float,
+    retry: RetryPolicy,
+    cache: Optional[ResponseCache] = None,
+    parser: str = "stream",
+    stats: Optional[TransportStats] = None,
+) -> _PageResult:
+    """
+    Fetch and parse one search window; retries are handled by the shared transport.
+
+    With a cache, a fresh entry is served locally and a stale one is revalidated
+    with a conditional request (and served as-is if the network is down).
+    A failed window only loses its own results.
+    """
+    logs: List[str] = []
+    where = f"[{label} start={params['start']}]"
+    last_err: Exception | None = None
+
+    key = ResponseCache.make_key(params) if cache is not None else ""
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and cached.fresh:
+        papers, entries = _parse_page(cached.body, parser)
+        return _PageResult(papers, logs, None, "hit", entries)
+
+    headers = cached.validators() if cached is not None else {}
+
+    try:
+        resp = get_transport().get(
+            ARXIV_API,
+            params=params,
+            headers=headers,
+            timeout=timeout_s,
+            stream=True,
+            retry=retry,
+            stats=stats,
+            log=lambda msg: logs.append(f"FetchPapers{where}: {msg}"),
+        )
+
+        with resp:
+            if resp.status_code == 304 and cached is not None:
+                cache.touch(key)  # type: ignore[union-attr]
+                papers, entries = _parse_page(cached.body, parser)
+                return _PageResult(papers, logs, None, "revalidated", entries)
+
+            resp.raise_for_status()
+
+            # Parse straight off the socket; keep a copy only when it is going to be cached
+            resp.raw.decode_content = True
+            body = _TeeReader(resp.raw, keep=cache is not None)
+            papers, entries = _parse_page(body, parser)
+
+        if stats is not None:
+            stats.add_bytes(body.nbytes)
+        if cache is not None:
+            cache.put(
+                key,
+                params,
+                b"".join(body.chunks),
+                etag=resp.headers.get("ETag", ""),
+                last_modified=resp.headers.get("Last-Modified", ""),
+            )
+        return _PageResult(papers, logs, None, "miss" if cache is not None else "off", entries)
+
+    except Exception as ex:
+        last_err = ex
+
+    if cached is not None:
+        logs.append(f"FetchPapers{where}: serving stale cached response after error: {last_err}")
+        papers, entries = _parse_page(cached.body, parser)
+        return _PageResult(papers, logs, None, "stale", entries)
+
+    return _PageResult([], logs, last_err, "miss" if cache is not None else "off")
+
+
+def _run_job(
+    job: List[int],
+    windows: List[Tuple[str, Dict[str, Any]]],
+    watermark: str,
+    fetch_args: Tuple[Any, ...],
+) -> Tuple[List[Tuple[int, _PageResult]], bool]:
+    """
+    Fetch a sequence of windows from one shard, in order.
+
+    With a watermark, stop as soon as a page reaches papers at or below it
+    (results are sorted by lastUpdatedDate, so later pages are all older).
+    Returns (pages, reached): `reached` is True when every paper newer than the
+    watermark was fetched, i.e. no page failed and paging did not run out of
+    windows before reaching the watermark (or the end of the results).
+    """
+    out: List[Tuple[int, _PageResult]] = []
+    complete = True
+    for i in job:
+        label, params = windows[i]
+        res = _fetch_page(label, params, *fetch_args)
+        out.append((i, res))
+
+        if res.error is not None:
+            complete = False
+            continue
+        if not watermark:
+            continue
+        # A short page (counted before the title/abstract filter) is the end of the results
+        if res.entries < int(params["max_results"]):
+            return out, complete
+        if any((p.get("updated_at") or "") <= watermark for p in res.papers):
+            return out, complete
+    return out, False
+
+
+def _fetch_oai(state: GraphState) -> GraphState:
+    """
+    Bulk-harvest arXiv metadata over OAI-PMH ListRecords (`fetch_source="oai"`).
+
+    Meant for backfills: harvests everything in [oai_from, oai_until] for
+    `oai_set`, optionally filtered to `oai_categories`, capped by
+    `oai_max_records` (0 = no cap). Interrupted harvests resume from a
+    checkpoint keyed by these parameters.
+    """
+    logs = state.setdefault("logs", [])
+
+    harvest_params = {
+        "base_url": str(state.get("oai_base_url") or oai_pmh.OAI_ENDPOINT),
+        "from_date": str(state.get("oai_from") or ""),
+        "until_date": str(state.get("oai_until") or ""),
+        "set_spec": str(state.get("oai_set") or ""),
+        "categories": list(state.get("oai_categories") or []),
+    }
+    # Checkpoints spooled in another metadata format must not be resumed
+    key_params = dict(harvest_params, metadata_prefix=oai_pmh.METADATA_PREFIX)
+    key = hashlib.sha256(json.dumps(key_params, sort_keys=True).encode("utf-8")).hexdigest()
+    ckpt_dir = cache_dir(state) / "oai" / key[:16]
+
+    papers: List[Paper] = []
+    stats = TransportStats()
+    try:
+        for p in oai_pmh.harvest(
+            ckpt_dir,
+            max_records=int(state.get("oai_max_records", 0) or 0),
+            timeout_s=float(state.get("fetch_timeout_s", 60)),
+            max_tries=max(1, int(state.get("fetch_max_tries", 5))),
+            backoff_base_s=float(state.get("fetch_backoff_base_s", 1.0)),
+            log=lambda msg: logs.append(f"FetchPapers(OAI-PMH): {msg}"),
+            stats=stats,
+            **harvest_params,
+        ):
+            if p.get("title") and p.get("abstract"):
+                papers.append(p)
+    except Exception as ex:
+        state.setdefault("errors", []).append(
+            f"FetchPapers(OAI-PMH) failed after {len(papers)} records: {ex} "
+            f"(checkpoint kept in {ckpt_dir})"
+        )
+
+    # Newest first, matching the search API's lastUpdatedDate order
+    papers.sort(key=lambda p: p.get("updated_at") or "", reverse=True)
+    state["papers"] = papers
+    logs.append(
+        f"FetchPapers(OAI-PMH): harvested {len(papers)} papers "
+        f"(from={harvest_params['from_date'] or '-'}, until={harvest_params['until_date'] or '-'}, "
+        f"set={harvest_params['set_spec'] or '-'}); http: {stats.summary()}."
+    )
+    return state
+
+
+def _fetch_catalog(state: GraphState, catalog: PaperCatalog) -> GraphState:
+    """Answer the topic query from the local catalog instead of calling arXiv."""
+    topics = state.get("topics", [])
+    max_results = int(state.get("max_results", 20))
+    query_tokens = tokenize(" ".join(t.strip() for t in topics if t and t.strip()))
+
+    if query_tokens:
+        papers = [p for p, score in catalog.search(query_tokens, max_results) if score > 0]
+    else:
+        papers = catalog.recent(max_results)
+
+    state["papers"] = papers
+    state.setdefault("logs", []).append(
+        f"FetchPapers(catalog): served {len(papers)} papers locally from "
+        f"{catalog.size()} catalogued (last ingest "
+        f"{time.time() - catalog.last_ingest_at():.0f}s ago)."
+    )
+    return state
+
+
 def fetch_papers(state: GraphState) -> GraphState:
     """
-    Fetch recently updated arXiv papers and normalize them into `papers`.
+    Fetch papers and normalize them into `papers`.
+
+    Sources (`fetch_source`):
+      - "search"  : arXiv search API (default, see `_fetch_search`)
+      - "oai"     : OAI-PMH bulk harvest for backfills (see `_fetch_oai`)
+      - "catalog" : the local catalog, when it was ingested within
+                    `catalog_max_age_s`; otherwise falls back to "search"
 
-    Retry on transient network failures with exponential backoff.
+    With `catalog_enabled`, every fetched paper is ingested into the persistent
+    catalog / BM25 index used by RankPapers.
     """
     state["run_date"] = state.get("run_date") or datetime.now().strftime("%Y-%m-%d")
+    source = state.get("fetch_source", "search")
+    use_catalog = bool(state.get("catalog_enabled")) or source == "catalog"
+    catalog = PaperCatalog(cache_dir(state) / "catalog.sqlite3") if use_catalog else None
+
+    if source == "catalog" and catalog is not None:
+        max_age_s = float(state.get("catalog_max_age_s", 6 * 3600))
+        if time.time() - catalog.last_ingest_at() <= max_age_s:
+            return _fetch_catalog(state, catalog)
+        state.setdefault("logs", []).append(
+            "FetchPapers(catalog): catalog is stale or empty; fetching from arXiv."
+        )
+
+    state = _fetch_oai(state) if source == "oai" else _fetch_search(state)
+
+    if catalog is not None and state.get("papers"):
+        t0 = time.perf_counter()
+        n = catalog.upsert(state["papers"])
+        state.setdefault("logs", []).append(
+            f"FetchPapers(catalog): ingested {n} papers in {time.perf_counter() - t0:.2f}s "
+            f"({catalog.size()} catalogued)."
+        )
+    return state
+
+
+def _fetch_search(state: GraphState) -> GraphState:
+    """
+    Fetch recently updated arXiv papers from the search API.
+
+    The query is split into start/max_results windows (`fetch_page_size`) and,
+    optionally, one shard per default category (`fetch_shard_categories`); each
+    shard then fetches ceil(max_results / shards) plus a margin.
+    Windows run concurrently (`fetch_parallelism`), each with its own retry and
+    exponential backoff, and are merged with de-duplication on paper_id.
+
+    Responses are cached on disk keyed by the normalized query parameters
+    (`fetch_cache_enabled`, `fetch_cache_ttl_s`, `fetch_cache_max_mb`).
+
+    With `fetch_incremental`, each shard is paged in order until it crosses the
+    profile's watermark (newest `updated_at` processed by a previous run), past
+    `max_results` if needed (up to `fetch_incremental_max_results`), so no paper
+    newer than the watermark is left behind. Papers are labelled new / updated /
+    unchanged against the profile's seen-set; unchanged ones are dropped unless
+    `fetch_skip_unchanged` is False. The next watermark is only proposed
+    (`fetch_watermark_next`) when every shard reached the old one; PersistRun
+    commits it together with the papers that were actually processed.
+    """
     topics = state.get("topics", [])
     max_results = int(state.get("max_results", 20))
 
     # Configurable knobs
     timeout_s = float(state.get("fetch_timeout_s", 45))
-    max_tries = int(state.get("fetch_max_tries", 3))
-    backoff_base_s = float(state.get("fetch_backoff_base_s", 2.0))
+    max_tries = max(1, int(state.get("fetch_max_tries", 3)))
+    backoff_base_s = float(state.get("fetch_backoff_base_s", 1.0))
+    retry = RetryPolicy(max_tries=max_tries, backoff_base_s=backoff_base_s)
+    page_size = int(state.get("fetch_page_size", 0) or 0)
+    shard_categories = bool(state.get("fetch_shard_categories", False))
+    parallelism = max(1, int(state.get("fetch_parallelism", 4)))
+    incremental = bool(state.get("fetch_incremental", False))
+    skip_unchanged = bool(state.get("fetch_skip_unchanged", True))
+    parser = str(state.get("fetch_parser", "stream"))
 
-    search_query = _build_arxiv_query(topics)
+    cache: Optional[ResponseCache] = None
+    if bool(state.get("fetch_cache_enabled", True)):
+        cache = ResponseCache(
+            cache_dir(state) / "arxiv_responses.sqlite3",
+            ttl_s=float(state.get("fetch_cache_ttl_s", 900)),
+            max_bytes=int(float(state.get("fetch_cache_max_mb", 256)) * 1024 * 1024),
+        )
 
-    params = {
-        "search_query": search_query,
-        "sortBy": "lastUpdatedDate",
-        "sortOrder": "descending",
-        "start": 0,
-        "max_results": max_results,
-    }
+    seen_store: Optional[SeenStore] = None
+    profile = ""
+    watermark = ""
+    if incremental:
+        seen_store = SeenStore(cache_dir(state) / "seen.sqlite3")
+        profile = profile_key(topics)
+        watermark = seen_store.get_watermark(profile)
+        state["fetch_profile"] = profile
 
-    last_err: Exception | None = None
+    # Incremental runs must reach the watermark, so they may page past max_results
+    limit = max_results
+    if watermark:
+        limit = max(max_results, int(state.get("fetch_incremental_max_results", 2000)))
 
-    for attempt in range(1, max_tries + 1):
-        try:
-            resp = requests.get(ARXIV_API, params=params, timeout=timeout_s)
-            resp.raise_for_status()
+    shards = _build_shard_queries(topics, shard_categories)
+    # Shards split max_results between them; incremental shards each page to the watermark instead
+    shard_limit = limit
+    if len(shards) > 1 and not watermark:
+        shard_limit = min(limit, math.ceil(limit / len(shards) * (1 + _SHARD_MARGIN)))
+    step = page_size if page_size > 0 else min(max_results, shard_limit)
+    windows = _plan_windows(shards, shard_limit, step)
 
-            feed = feedparser.parse(resp.text)
+    # Incremental runs page each shard sequentially so they can stop at the watermark;
+    # otherwise every window is an independent job.
+    if watermark:
+        jobs = [
+            [i for i, (label, _) in enumerate(windows) if label == shard_label]
+            for shard_label, _ in shards
+        ]
+    else:
+        jobs = [[i] for i in range(len(windows))]
 
-            papers: List[Paper] = []
-            for e in feed.entries:
-                p = _parse_arxiv_entry(e)
-                if p.get("title") and p.get("abstract"):
-                    papers.append(p)
+    results: Dict[int, List[Paper]] = {}
+    page_logs: Dict[int, List[str]] = {}
+    page_errors: Dict[int, str] = {}
+    cache_counts: Dict[str, int] = {}
 
-            state["papers"] = papers
-            state.setdefault("logs", []).append(
-                f"FetchPapers: fetched {len(papers)} papers from arXiv "
-                f"(sorted by lastUpdatedDate, attempt {attempt}/{max_tries})."
-            )
-            return state
-
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as ex:
-            last_err = ex
-            if attempt < max_tries:
-                sleep_s = backoff_base_s ** (attempt - 1)
-                state.setdefault("logs", []).append(
-                    f"FetchPapers: transient network error on attempt "
-                    f"{attempt}/{max_tries}: {ex}. Retrying in {sleep_s:.1f}s."
-                )
-                time.sleep(sleep_s)
-                continue
-            break
-
-        except requests.exceptions.HTTPError as ex:
-            last_err = ex
-            status = ex.response.status_code if ex.response is not None else None
-
-            # Retry only on server-side / rate-limit style errors
-            if status in {429, 500, 502, 503, 504} and attempt < max_tries:
-                sleep_s = backoff_base_s ** (attempt - 1)
-                state.setdefault("logs", []).append(
-                    f"FetchPapers: HTTP {status} on attempt "
-                    f"{attempt}/{max_tries}. Retrying in {sleep_s:.1f}s."
-                )
-                time.sleep(sleep_s)
+    stats = TransportStats()
+    fetch_args = (timeout_s, retry, cache, parser, stats)
+    pages_fetched = 0
+    reached_watermark = True
+
+    with ThreadPoolExecutor(max_workers=min(parallelism, len(jobs) or 1)) as pool:
+        futures = [pool.submit(_run_job, job, windows, watermark, fetch_args) for job in jobs]
+        for fut in as_completed(futures):
+            pages, reached = fut.result()
+            reached_watermark = reached_watermark and reached
+            for i, res in pages:
+                pages_fetched += 1
+                page_logs[i] = res.logs
+                cache_counts[res.cache_status] = cache_counts.get(res.cache_status, 0) + 1
+                if res.error is None:
+                    results[i] = res.papers
+                else:
+                    label, params = windows[i]
+                    page_errors[i] = f"[{label} start={params['start']}] {res.error}"
+
+    logs = state.setdefault("logs", [])
+    for i in range(len(windows)):
+        logs.extend(page_logs.get(i, []))
+    if cache is not None:
+        logs.append(
+            "FetchPapers(cache): "
+            + ", ".join(f"{k}={cache_counts.get(k, 0)}" for k in ("hit", "revalidated", "stale", "miss"))
+            + f" (ttl={cache.ttl_s:.0f}s)."
+        )
+    logs.append(f"FetchPapers(http): {stats.summary()}")
+
+    if not results:
+        errors = state.setdefault("errors", [])
+        for i in sorted(page_errors):
+            errors.append(f"FetchPapers failed: {page_errors[i]}")
+        state["papers"] = []
+        logs.append("FetchPapers: error; produced 0 papers.")
+        return state
+
+    # Merge in window order, de-duplicating on paper_id
+    seen: set = set()
+    papers: List[Paper] = []
+    for i in sorted(results):
+        for p in results[i]:
+            pid = p.get("paper_id") or ""
+            if pid in seen:
                 continue
-            break
+            seen.add(pid)
+            papers.append(p)
+
+    # Shards are each sorted by lastUpdatedDate; restore a single global order
+    if len(shards) > 1:
+        papers.sort(key=lambda p: p.get("updated_at") or "", reverse=True)
+    papers = papers[:limit]
+
+    for i in sorted(page_errors):
+        state.setdefault("errors", []).append(f"FetchPapers page failed: {page_errors[i]}")
+
+    logs.append(
+        f"FetchPapers: fetched {len(papers)} papers from arXiv "
+        f"(sorted by lastUpdatedDate, {len(results)}/{pages_fetched} pages ok "
+        f"of {len(windows)} planned, {len(shards)} shard(s), parallelism={parallelism})."
+    )
 
-        except Exception as ex:
-            last_err = ex
-            break
+    if seen_store is not None:
+        # Without a watermark (first run) the newest paper fetched becomes the starting point
+        complete = not page_errors and (reached_watermark or not watermark)
+        state["fetch_watermark_next"] = (
+            max((p.get("updated_at") or "" for p in papers), default="") if complete else ""
+        )
+        status = seen_store.classify(profile, [p.get("paper_id") or "" for p in papers])
+        counts: Dict[str, int] = {"new": 0, "updated": 0, "unchanged": 0}
+        for p in papers:
+            p["change_status"] = status.get(p.get("paper_id") or "", "new")
+            counts[p["change_status"]] += 1
+        if skip_unchanged:
+            papers = [p for p in papers if p["change_status"] != "unchanged"]
+        logs.append(
+            f"FetchPapers(incremental): profile={profile} watermark='{watermark or '-'}' "
+            f"new={counts['new']} updated={counts['updated']} unchanged={counts['unchanged']}"
+            f"{' (unchanged skipped)' if skip_unchanged else ''}"
+            f"{'' if complete else '; watermark not reached, it will not advance'}."
+        )
 
-    state.setdefault("errors", []).append(f"FetchPapers failed: {last_err}")
-    state["papers"] = []
-    state.setdefault("logs", []).append("FetchPapers: error; produced 0 papers.")
-    return state
\ No newline at end of file
+    state["papers"] = papers
+    return state
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-import re
+import sys
+import threading
 import time
-from typing import List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-import requests
-import fitz  # PyMuPDF
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
 
 from ..state import GraphState, Paper
-
-
-_HEADING_RE = re.compile(r"^\s*(\d+(\.\d+)*)\s+([A-Z][A-Za-z0-9\-\s]{2,})\s*$")
-_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-]+")
+from paper_digest.arxiv_ids import split_arxiv_id
+from paper_digest.fulltext.download import spool_download
+from paper_digest.fulltext.executor import get_extraction_executor
+from paper_digest.fulltext.extract import EXTRACTION_VERSION, Sections, WindowSpec
+from paper_digest.fulltext.latex import extract_latex_sections
+from paper_digest.fulltext.ranged import RangedPdf, RangeFetchFailed, fetch_pdf_ranges
+from paper_digest.storage import cache_dir
+from paper_digest.storage.extraction_cache import ExtractionCache, extraction_key
+from paper_digest.storage.pdf_cache import PdfCache
+from paper_digest.transport import TransportStats
 
 
 def _get_pdf_url(p: Paper) -> str:
@@ -31,105 +43,338 @@ def _get_pdf_url(p: Paper) -> str:
     return ""
 
 
-def _extract_pdf_text_windows(pdf_bytes: bytes, head_pages: int, tail_pages: int) -> Tuple[List[str], List[str]]:
-    """
-    Extract per-page text for:
-      - head window: first `head_pages`
-      - tail window: last `tail_pages`
-    Returns (head_pages_text, tail_pages_text)
-    """
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    n = len(doc)
+def _pdf_cache_key(p: Paper, pdf_url: str) -> str:
+    """Normalized arXiv id+version, or "" when the PDF is not a fixed arXiv version."""
+    for candidate in (p.get("paper_id") or "", pdf_url, p.get("url") or ""):
+        base, version = split_arxiv_id(candidate)
+        if base and version:
+            return f"{base}v{version}"
+    return ""
 
-    head_n = max(0, min(head_pages, n))
-    tail_n = max(0, min(tail_pages, n))
 
-    head_out: List[str] = []
-    for i in range(head_n):
-        head_out.append(doc.load_page(i).get_text("text") or "")
+def _eprint_url(p: Paper, pdf_url: str) -> str:
+    """arXiv e-print (source archive) URL for the paper, on the same host as its PDF."""
+    if "/pdf/" in pdf_url:
+        url = pdf_url.replace("/pdf/", "/e-print/", 1)
+        return url[: -len(".pdf")] if url.endswith(".pdf") else url
+    for candidate in (p.get("paper_id") or "", p.get("url") or ""):
+        base, version = split_arxiv_id(candidate)
+        if base:
+            return f"https://arxiv.org/e-print/{base}" + (f"v{version}" if version else "")
+    return ""
 
-    tail_out: List[str] = []
-    if tail_n > 0:
-        start = max(0, n - tail_n)
-        for i in range(start, n):
-            tail_out.append(doc.load_page(i).get_text("text") or "")
 
-    doc.close()
-    return head_out, tail_out
+class _FullTextOptions(NamedTuple):
+    strategy: str               # "source_first" | "pdf"
+    fetch_mode: str             # "full" | "range"
+    window: WindowSpec
+    range_window: WindowSpec    # pages a range fetch must cover
+    max_chars: int
+    timeout_s: float
+    pdf_cache: Optional[PdfCache]
+    extraction_cache: Optional[ExtractionCache]
+    extract_timeout_s: Optional[float]
+    max_bytes: int
+    spool_dir: Path
+
+
+class _RunCounters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.extract_hits = 0
+        self.extract_misses = 0
+        self.pages_parsed = 0
+        self.pages_total = 0
+        self.docs_parsed = 0
+        self.strategies: Dict[str, List[float]] = {}   # name -> [attempts, ok, seconds]
+        self.range_results: List[Tuple[str, Optional[RangedPdf], str]] = []
+        self.latex_errors: Counter = Counter()     # exception type -> count
+        self.rss_growth_kb: List[int] = []          # per parsed document, measured in the worker
+
+    def hit(self, nbytes: int) -> None:
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += nbytes
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def extracted(self, cached: bool) -> None:
+        with self._lock:
+            if cached:
+                self.extract_hits += 1
+            else:
+                self.extract_misses += 1
+
+    def parsed(self, sections: Sections) -> None:
+        with self._lock:
+            self.docs_parsed += 1
+            self.pages_parsed += sections.pages_parsed
+            self.pages_total += sections.page_count
+            if sections.peak_rss_kb:
+                self.rss_growth_kb.append(sections.peak_rss_kb)
+
+    def strategy(self, name: str, ok: bool, seconds: float) -> None:
+        with self._lock:
+            row = self.strategies.setdefault(name, [0, 0, 0.0])
+            row[0] += 1
+            row[1] += int(ok)
+            row[2] += seconds
+
+    def strategies_summary(self) -> str:
+        parts = [
+            f"{name} ok={int(ok)}/{int(n)} (avg {secs / n:.2f}s)"
+            for name, (n, ok, secs) in self.strategies.items() if n
+        ]
+        if self.latex_errors:
+            errors = ", ".join(f"{name} x{n}" for name, n in self.latex_errors.items())
+            parts.append(f"latex errors (PDF fallback): {errors}")
+        return ", ".join(parts) or "no extractions"
+
+    def latex_error(self, ex: Exception) -> None:
+        with self._lock:
+            self.latex_errors[type(ex).__name__] += 1
+
+    def ranged(self, label: str, pdf: Optional[RangedPdf], error: str = "") -> None:
+        with self._lock:
+            self.range_results.append((label, pdf, error))
+
+    def range_summary(self) -> str:
+        if not self.range_results:
+            return ""
+        done = [(label, pdf) for label, pdf, _ in self.range_results if pdf is not None]
+        fetched = sum(pdf.bytes_fetched for _, pdf in done)
+        size = sum(pdf.size for _, pdf in done)
+        per_paper = ", ".join(
+            f"{label.rsplit('/', 1)[-1]} {pdf.bytes_fetched / 1024:.0f}KB/{pdf.size / 1024 / 1024:.1f}MB"
+            f" in {pdf.requests} req"
+            for label, pdf in done
+        )
+        reasons = Counter(error for _, pdf, error in self.range_results if pdf is None)
+        fallbacks = ", ".join(f"{reason} x{n}" for reason, n in reasons.items())
+        return (
+            f"range fetch ok={len(done)}/{len(self.range_results)} "
+            f"({fetched / 1024 / 1024:.2f}MB of {size / 1024 / 1024:.1f}MB; {per_paper or 'none'})"
+            + (f", full-download fallbacks: {fallbacks}" if fallbacks else "")
+            + "; "
+        )
+
+    def memory_summary(self) -> str:
+        if not self.rss_growth_kb:
+            return "extract worker rss growth n/a (inline or all cached)"
+        growth = sorted(self.rss_growth_kb)
+        return (
+            f"extract worker rss growth per PDF max={growth[-1] / 1024:.0f}MB "
+            f"p50={growth[len(growth) // 2] / 1024:.0f}MB ({len(growth)} PDFs)"
+        )
+
+    def pages_summary(self) -> str:
+        avg = self.pages_parsed / self.docs_parsed if self.docs_parsed else 0.0
+        return f"pages parsed={self.pages_parsed}/{self.pages_total} (avg {avg:.1f}/paper)"
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        return (
+            f"pdf cache hits={self.hits}/{total} ({ratio:.0%}), "
+            f"saved={self.bytes_saved / 1024 / 1024:.2f}MB; "
+            f"extraction cache hits={self.extract_hits}/{self.extract_hits + self.extract_misses}"
+        )
+
+
+class _LocalFile(NamedTuple):
+    sha256: str
+    path: Path
+    temporary: bool             # spool file to delete once extraction is done
+    window: Optional[WindowSpec] = None     # overrides the run's window (sparse copies)
+
+
+def _cached_file(key: str, opts: _FullTextOptions, counters: _RunCounters) -> Optional[_LocalFile]:
+    """The cached copy of `key` (an arXiv version), if it was downloaded before."""
+    if not key or opts.pdf_cache is None:
+        return None
+    hit = opts.pdf_cache.get(key)
+    if hit is None:
+        counters.miss()
+        return None
+    counters.hit(hit.size)
+    return _LocalFile(hit.sha256, hit.path, False)
 
 
-def _find_section_ranges(pages_text: List[str]) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+def _download_file(url: str, key: str, opts: _FullTextOptions, stats: TransportStats) -> _LocalFile:
+    """Streamed download into the spool directory; kept in the cache when `key` is set."""
+    spooled = spool_download(
+        url, opts.spool_dir, max_bytes=opts.max_bytes, timeout_s=opts.timeout_s, stats=stats
+    )
+    if key and opts.pdf_cache is not None:
+        stored = opts.pdf_cache.put_file(key, spooled.path, spooled.sha256, spooled.size)
+        return _LocalFile(stored.sha256, stored.path, False)
+    return _LocalFile(spooled.sha256, spooled.path, True)
+
+
+def _load_file(
+    url: str, key: str, opts: _FullTextOptions, stats: TransportStats, counters: _RunCounters
+) -> _LocalFile:
     """
-    Find intro / conclusion headings within the given window.
-    Returns line indices: (intro_i, intro_end, concl_i, concl_end)
+    Locate a download on disk: the cache when `key` (an arXiv version) was
+    downloaded before, else a streamed download into the spool directory.
     """
-    all_text = "\n".join(pages_text)
-    lines = all_text.splitlines()
-
-    headings: List[Tuple[int, str]] = []
-    for i, line in enumerate(lines):
-        l = line.strip()
-        if not l:
-            continue
-
-        low = l.lower()
-        if low in {"introduction", "conclusion", "conclusions", "summary", "discussion", "abstract", "references"}:
-            headings.append((i, low))
-            continue
-
-        m = _HEADING_RE.match(l)
-        if m:
-            title = m.group(3).strip().lower()
-            headings.append((i, title))
-
-    def first_heading(names: List[str]) -> Optional[int]:
-        for idx, title in headings:
-            if any(n in title for n in names):
-                return idx
-        return None
+    return _cached_file(key, opts, counters) or _download_file(url, key, opts, stats)
 
-    def next_heading_after(start: int) -> Optional[int]:
-        for idx, _ in headings:
-            if idx > start:
-                return idx
-        return None
 
-    intro_i = first_heading(["introduction"])
-    concl_i = first_heading(["conclusion", "conclusions", "summary", "discussion"])
+def _load_pdf(
+    p: Paper, pdf_url: str, opts: _FullTextOptions, stats: TransportStats, counters: _RunCounters
+) -> _LocalFile:
+    """
+    The paper's PDF on disk. In range mode, an uncached PDF is fetched as a
+    sparse copy holding only the head / tail pages; a full download is the
+    fallback whenever the server or the document doesn't cooperate.
+    """
+    key = _pdf_cache_key(p, pdf_url)
+    if opts.fetch_mode != "range":
+        return _load_file(pdf_url, key, opts, stats, counters)
+
+    cached = _cached_file(key, opts, counters)
+    if cached is not None:
+        return cached
+    try:
+        ranged = fetch_pdf_ranges(
+            pdf_url,
+            opts.spool_dir,
+            opts.range_window.head_pages,
+            opts.range_window.tail_pages,
+            timeout_s=opts.timeout_s,
+            stats=stats,
+        )
+    except RangeFetchFailed as ex:
+        counters.ranged(key or pdf_url, None, str(ex))
+        return _download_file(pdf_url, key, opts, stats)
+
+    counters.ranged(key or pdf_url, ranged)
+    # A sparse copy isn't the PDF: not content-addressable, never cached as a blob.
+    return _LocalFile(f"{key}/range" if key else "", ranged.path, True, opts.range_window)
+
+
+def _run_extraction(pdf: _LocalFile, opts: _FullTextOptions, counters: _RunCounters) -> Tuple[str, str]:
+    sections = get_extraction_executor().extract(
+        pdf.path, pdf.window or opts.window, opts.max_chars, timeout_s=opts.extract_timeout_s
+    )
+    counters.parsed(sections)
+    return sections.intro_text, sections.summary_text
 
-    intro_end = next_heading_after(intro_i) if intro_i is not None else None
-    concl_end = next_heading_after(concl_i) if concl_i is not None else None
 
-    ref_i = first_heading(["references", "bibliography"])
-    if concl_i is not None and concl_end is None and ref_i is not None and ref_i > concl_i:
-        concl_end = ref_i
+def _sections_for(pdf: _LocalFile, opts: _FullTextOptions, counters: _RunCounters) -> Tuple[str, str]:
+    """(intro_text, summary_text), from the extraction cache when possible."""
+    if opts.extraction_cache is None or not pdf.sha256:
+        return _run_extraction(pdf, opts, counters)
 
-    return intro_i, intro_end, concl_i, concl_end
+    window = pdf.window or opts.window
+    key = extraction_key(pdf.sha256, window.key(), opts.max_chars, EXTRACTION_VERSION)
+    cached = opts.extraction_cache.get(key)
+    counters.extracted(cached is not None)
+    if cached is not None:
+        return cached
 
+    intro_text, summary_text = _run_extraction(pdf, opts, counters)
+    opts.extraction_cache.put(key, intro_text, summary_text)
+    return intro_text, summary_text
 
-def _slice_lines(lines: List[str], start: Optional[int], end: Optional[int], max_chars: int) -> str:
-    if start is None:
-        return ""
-    if end is None:
-        end = len(lines)
-    chunk = "\n".join(lines[start:end]).strip()
-    return chunk[:max_chars] if len(chunk) > max_chars else chunk
 
+def _try_latex(
+    p: Paper, pdf_url: str, opts: _FullTextOptions, stats: TransportStats, counters: _RunCounters
+) -> Optional[Tuple[str, str]]:
+    """Sections from the e-print source, or None (no source, PDF-only upload, unparseable)."""
+    url = _eprint_url(p, pdf_url)
+    if not url:
+        return None
+    version_key = _pdf_cache_key(p, pdf_url)
+    try:
+        archive = _load_file(url, f"{version_key}/e-print" if version_key else "", opts, stats, counters)
+    except Exception:
+        return None
+
+    try:
+        key = extraction_key(archive.sha256, "latex", opts.max_chars, EXTRACTION_VERSION)
+        if opts.extraction_cache is not None:
+            cached = opts.extraction_cache.get(key)
+            counters.extracted(cached is not None)
+            if cached is not None:
+                return cached
+
+        sections = extract_latex_sections(archive.path, opts.max_chars)
+        if sections is not None and opts.extraction_cache is not None:
+            opts.extraction_cache.put(key, *sections)
+        return sections
+    except Exception as ex:
+        # A broken source archive must never cost the paper: fall back to the PDF
+        counters.latex_error(ex)
+        return None
+    finally:
+        if archive.temporary:
+            archive.path.unlink(missing_ok=True)
+
+
+def _enrich_paper(
+    p: Paper, opts: _FullTextOptions, stats: TransportStats, counters: _RunCounters
+) -> bool:
+    """
+    Extract one paper's sections into `p`: from the LaTeX source first when
+    the strategy asks for it, else (or on fallback) from the PDF. Runs on a
+    worker thread, so extraction starts as soon as this paper's bytes arrive.
+    Returns True on success; failures are recorded on the paper.
+    """
+    pdf_url = _get_pdf_url(p)
+    p["pdf_url"] = pdf_url
+
+    if not pdf_url:
+        p["content_status"] = "failed"
+        p["content_error"] = "No pdf_url found."
+        return False
+
+    if opts.strategy == "source_first":
+        t0 = time.perf_counter()
+        sections = _try_latex(p, pdf_url, opts, stats, counters)
+        counters.strategy("latex", sections is not None, time.perf_counter() - t0)
+        if sections is not None:
+            p["intro_text"], p["summary_text"] = sections
+            p["content_source"] = "latex"
+            p["content_status"] = "ok"
+            return True
 
-def _fallback_intro(lines: List[str], max_chars: int) -> str:
-    out: List[str] = []
-    for ln in lines[:1500]:
-        if _WORD_RE.search(ln):
-            out.append(ln)
-        if len("\n".join(out)) >= max_chars:
-            break
-    return "\n".join(out)[:max_chars].strip()
+    pdf: Optional[_LocalFile] = None
+    t0 = time.perf_counter()
+    try:
+        pdf = _load_pdf(p, pdf_url, opts, stats, counters)
+        intro_text, summary_text = _sections_for(pdf, opts, counters)
 
+        p["intro_text"] = intro_text
+        p["summary_text"] = summary_text
+        p["content_source"] = "pdf"
+        p["content_status"] = "ok"
+        counters.strategy("pdf", True, time.perf_counter() - t0)
+        return True
 
-def _fallback_summary(lines: List[str], max_chars: int) -> str:
-    tail = lines[-1200:] if len(lines) > 1200 else lines
-    out = [ln for ln in tail if _WORD_RE.search(ln)]
-    return "\n".join(out)[-max_chars:].strip()
+    except Exception as ex:
+        p["content_status"] = "failed"
+        p["content_error"] = str(ex)
+        counters.strategy("pdf", False, time.perf_counter() - t0)
+        return False
+
+    finally:
+        if pdf is not None and pdf.temporary:
+            pdf.path.unlink(missing_ok=True)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
 
 
 def fetch_full_text(state: GraphState) -> GraphState:
@@ -138,6 +383,40 @@ def fetch_full_text(state: GraphState) -> GraphState:
       - intro_text from head pages
       - summary_text from tail pages
 
+    `fulltext_strategy="pdf"` (default) extracts from the PDF only. With
+    "source_first" (opt-in) the arXiv e-print is tried first and sections are
+    sliced from the LaTeX source; papers without usable source fall back to the
+    PDF path below.
+
+    `pdf_window_mode="fixed"` (default) parses exactly `pdf_head_pages` /
+    `pdf_tail_pages`. "adaptive" (opt-in) parses pages lazily: forward until
+    the section after the introduction starts, backward until a conclusion
+    ahead of the references is found, capped at `pdf_max_head_pages` /
+    `pdf_max_tail_pages`.
+
+    Downloads run concurrently (`pdf_max_concurrency`) and are paced by the
+    shared transport's per-host token bucket, configured once at startup
+    (PDF_HOSTS, PDF_RATE_PER_S, PDF_RATE_BURST; see config.get_http_settings).
+    429/503 responses with Retry-After pause the host for all workers.
+
+    PDFs (and e-prints) of versioned arXiv papers are kept in a content-addressed
+    LRU cache (`pdf_cache_enabled`, `pdf_cache_max_mb`) and read from disk on
+    repeat runs.
+    Extracted sections are cached by PDF hash + extraction parameters
+    (`extract_cache_enabled`); bump EXTRACTION_VERSION when the heuristics change.
+
+    `pdf_fetch_mode="range"` fetches only the byte ranges the first
+    `pdf_head_pages` / last `pdf_tail_pages` need (HTTP Range, sparse file),
+    falling back to a full download when the server or PDF doesn't allow it.
+    Each ranged PDF costs several requests, so it pays off when bandwidth,
+    not the per-host request rate, is the bottleneck.
+
+    PDFs are streamed to a spool file in fixed-size chunks and parsed from disk;
+    anything larger than `pdf_max_mb` is rejected (Content-Length) or aborted
+    mid-stream. Extraction itself runs on the process-wide ExtractionExecutor
+    (a process pool sized by PDF_EXTRACT_WORKERS), with a per-document timeout
+    (`pdf_extract_timeout_s`, default PDF_EXTRACT_TIMEOUT_S).
+
     Writes:
       state["fulltext_ready"] = List[Paper] enriched with intro_text/summary_text
     """
@@ -145,64 +424,64 @@ def fetch_full_text(state: GraphState) -> GraphState:
     top_k = int(state.get("top_k", 5))
 
     pdf_fetch_limit = int(state.get("pdf_fetch_limit", top_k))
-    head_pages = int(state.get("pdf_head_pages", 8))
-    tail_pages = int(state.get("pdf_tail_pages", 4))
+    window_mode = str(state.get("pdf_window_mode", "fixed"))
+    if window_mode == "adaptive":
+        head_pages = int(state.get("pdf_max_head_pages", 12))
+        tail_pages = int(state.get("pdf_max_tail_pages", 20))
+    else:
+        head_pages = int(state.get("pdf_head_pages", 8))
+        tail_pages = int(state.get("pdf_tail_pages", 4))
     max_chars_each = int(state.get("section_max_chars", 60_000))
-    polite_delay = float(state.get("pdf_polite_delay_s", 0.5))
+    max_concurrency = max(1, int(state.get("pdf_max_concurrency", 4)))
+    max_bytes = int(float(state.get("pdf_max_mb", 150)) * 1024 * 1024)
 
     targets = ranked[: min(len(ranked), pdf_fetch_limit)]
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": "paper-digest-agent/0.1"})
-
-    ok = 0
-    for p in targets:
-        pdf_url = _get_pdf_url(p)
-        p["pdf_url"] = pdf_url
-
-        if not pdf_url:
-            p["content_status"] = "failed"
-            p["content_error"] = "No pdf_url found."
-            continue
-
-        try:
-            r = session.get(pdf_url, timeout=35)
-            r.raise_for_status()
-
-            head_pages_text, tail_pages_text = _extract_pdf_text_windows(
-                r.content, head_pages=head_pages, tail_pages=tail_pages
-            )
-
-            # Intro from head window
-            head_lines = "\n".join(head_pages_text).splitlines()
-            intro_i, intro_end, _, _ = _find_section_ranges(head_pages_text)
-            intro_text = _slice_lines(head_lines, intro_i, intro_end, max_chars_each)
-            if not intro_text:
-                intro_text = _fallback_intro(head_lines, max_chars_each)
-
-            # Summary from tail window
-            tail_lines = "\n".join(tail_pages_text).splitlines()
-            _, _, concl_i, concl_end = _find_section_ranges(tail_pages_text)
-            summary_text = _slice_lines(tail_lines, concl_i, concl_end, max_chars_each)
-            if not summary_text:
-                summary_text = _fallback_summary(tail_lines, max_chars_each)
-
-            p["intro_text"] = intro_text
-            p["summary_text"] = summary_text
-            p["content_status"] = "ok"
-            ok += 1
-
-        except Exception as ex:
-            p["content_status"] = "failed"
-            p["content_error"] = str(ex)
-
-        if polite_delay > 0:
-            time.sleep(polite_delay)
+    stats = TransportStats()
+
+    pdf_cache: Optional[PdfCache] = None
+    if bool(state.get("pdf_cache_enabled", True)):
+        pdf_cache = PdfCache(
+            cache_dir(state) / "pdfs",
+            max_bytes=int(float(state.get("pdf_cache_max_mb", 2048)) * 1024 * 1024),
+        )
+    extraction_cache: Optional[ExtractionCache] = None
+    if bool(state.get("extract_cache_enabled", True)):
+        extraction_cache = ExtractionCache(cache_dir(state) / "extraction.sqlite3")
+    counters = _RunCounters()
+
+    extract_timeout = state.get("pdf_extract_timeout_s")
+    strategy = str(state.get("fulltext_strategy", "pdf"))
+    fetch_mode = str(state.get("pdf_fetch_mode", "full"))
+    opts = _FullTextOptions(
+        strategy=strategy,
+        fetch_mode=fetch_mode,
+        window=WindowSpec(window_mode, head_pages, tail_pages),
+        range_window=WindowSpec(
+            window_mode, int(state.get("pdf_head_pages", 8)), int(state.get("pdf_tail_pages", 4))
+        ),
+        max_chars=max_chars_each,
+        timeout_s=35.0,
+        pdf_cache=pdf_cache,
+        extraction_cache=extraction_cache,
+        extract_timeout_s=float(extract_timeout) if extract_timeout is not None else None,
+        max_bytes=max_bytes,
+        spool_dir=pdf_cache.spool_dir if pdf_cache is not None else cache_dir(state) / "spool",
+    )
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(targets) or 1)) as pool:
+        ok = sum(pool.map(lambda p: _enrich_paper(p, opts, stats, counters), targets))
 
     state["fulltext_ready"] = targets
     state.setdefault("logs", []).append(
-        f"FetchFullText(Head+Tail): enriched {ok}/{len(targets)} papers "
-        f"(head_pages={head_pages}, tail_pages={tail_pages}, section_chars<={max_chars_each})."
+        f"FetchFullText(Head+Tail): enriched {ok}/{len(targets)} papers in "
+        f"{time.perf_counter() - t0:.1f}s "
+        f"(window={window_mode}, head_pages<={head_pages}, tail_pages<={tail_pages}, "
+        f"section_chars<={max_chars_each}, {counters.pages_summary()}, "
+        f"strategy={strategy}: {counters.strategies_summary()}, "
+        f"concurrency={max_concurrency}); "
+        f"{counters.summary()}; {counters.range_summary()}http: {stats.summary()}; "
+        f"memory: {counters.memory_summary()}; process-wide peak rss={_peak_rss_mb():.0f}MB."
     )
 
     # Output full text for manual inspection
@@ -1,7 +1,11 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
-from ..state import GraphState
+from typing import List, Tuple
+
+from ..state import GraphState, Paper
+from paper_digest.storage import cache_dir
+from paper_digest.storage.seen_store import SeenStore
 
 
 def persist_run(state: GraphState) -> GraphState:
@@ -17,4 +21,36 @@ def persist_run(state: GraphState) -> GraphState:
     state.setdefault("logs", []).append(
         f"PersistRun: wrote {out_path}"
     )
+
+    # Incremental fetch: only advance the watermark once the run made it this far
+    profile = state.get("fetch_profile")
+    if state.get("fetch_incremental") and profile:
+        processed, watermark = _processed_papers(state)
+        n = SeenStore(cache_dir(state) / "seen.sqlite3").commit(profile, processed, watermark)
+        state.setdefault("logs", []).append(
+            f"PersistRun: marked {n} papers as seen for profile={profile} "
+            f"(watermark -> '{watermark or 'unchanged'}')"
+        )
     return state
+
+
+def _processed_papers(state: GraphState) -> Tuple[List[Paper], str]:
+    """
+    Papers this run actually processed (ranked, and summarized unless that
+    failed), and the watermark that is safe to commit: FetchPapers' proposal,
+    held below the oldest failed summary so the next run fetches it again.
+    """
+    failed = {
+        s.get("paper_id") for s in state.get("summaries", []) or [] if s.get("status") == "failed"
+    }
+    papers = state.get("papers", []) or []
+    processed = [p for p in papers if p.get("paper_id") not in failed]
+
+    watermark = state.get("fetch_watermark_next", "") or ""
+    failed_times = [p.get("updated_at") or "" for p in papers if p.get("paper_id") in failed]
+    if watermark and failed_times:
+        oldest_failed = min(failed_times)
+        older = [p.get("updated_at") or "" for p in processed]
+        safe = max((t for t in older if t < oldest_failed), default="")
+        watermark = min(watermark, safe)
+    return processed, watermark
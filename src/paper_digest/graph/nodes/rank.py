@@ -1,28 +1,190 @@
 from __future__ import annotations
 
-import re
-from typing import List
+import hashlib
+import time
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
 from rank_bm25 import BM25Okapi
 
 from ..state import GraphState, Paper
+from paper_digest.arxiv_ids import normalize_arxiv_id
+from paper_digest.embeddings import get_embedder
+from paper_digest.storage import cache_dir
+from paper_digest.storage.catalog import PaperCatalog, catalog_key
+from paper_digest.storage.vector_cache import VectorCache
+from paper_digest.text import tokenize as _tokenize
 
 
-_WORD_RE = re.compile(r"[a-z0-9]+")
+# Upper bound on the dense (queries x docs) score block materialized at once
+_MAX_BLOCK_CELLS = 16_000_000
 
 
-def _tokenize(text: str) -> List[str]:
+class SparseBM25:
     """
-    Lightweight tokenizer:
-    - lowercase
-    - keep alphanumerics
-    - split into tokens
-
-    Example:
-      "Prompt-Guided Diffusion-Based Medical Image Segmentation"
-      -> ["prompt", "guided", "diffusion", "based", "medical", "image", "segmentation"]
+    BM25Okapi over a sparse term-document weight matrix.
+
+    The matrix is built once per corpus and stored column-compressed by term
+    (indptr / doc ids / weights), with each weight already holding
+    idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl)).
+    Scoring a batch of queries is then a single sparse-matrix product
+    (scatter-add of the query terms' posting lists), rather than one Python
+    loop per query as in rank_bm25. Scores match BM25Okapi, including its
+    epsilon floor for negative IDF.
     """
-    return _WORD_RE.findall((text or "").lower())
+
+    def __init__(
+        self,
+        corpus_tokens: Sequence[Sequence[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ) -> None:
+        self.vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        tfs: List[int] = []
+        for d, tokens in enumerate(corpus_tokens):
+            for term, tf in Counter(tokens).items():
+                term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_ids.append(d)
+                tfs.append(tf)
+
+        self.n_docs = len(corpus_tokens)
+        t_arr = np.asarray(term_ids, dtype=np.int64)
+        d_arr = np.asarray(doc_ids, dtype=np.int64)
+        tf_arr = np.asarray(tfs, dtype=np.float64)
+        doc_len = np.asarray([len(t) for t in corpus_tokens], dtype=np.float64)
+        avgdl = float(doc_len.mean()) if self.n_docs else 0.0
+
+        df = np.bincount(t_arr, minlength=len(self.vocab)).astype(np.float64)
+        idf = np.log(self.n_docs - df + 0.5) - np.log(df + 0.5)
+        if idf.size:
+            idf[idf < 0] = epsilon * float(idf.mean())
+
+        norm = k1 * (1 - b + b * doc_len[d_arr] / avgdl) if avgdl else np.full(len(d_arr), k1)
+        weights = idf[t_arr] * tf_arr * (k1 + 1) / (tf_arr + norm)
+
+        order = np.argsort(t_arr, kind="stable")
+        self._indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        self._docs = d_arr[order]
+        self._weights = weights[order]
+
+    def score_batch(self, queries: Sequence[Sequence[str]]) -> np.ndarray:
+        """Dense (len(queries), n_docs) score matrix for a batch of tokenized queries."""
+        n_q = len(queries)
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        vals: List[np.ndarray] = []
+        for qi, query in enumerate(queries):
+            for term, qf in Counter(query).items():
+                tid = self.vocab.get(term)
+                if tid is None:
+                    continue
+                lo, hi = self._indptr[tid], self._indptr[tid + 1]
+                rows.append(np.full(hi - lo, qi, dtype=np.int64))
+                cols.append(self._docs[lo:hi])
+                vals.append(self._weights[lo:hi] * qf)
+
+        if not rows:
+            return np.zeros((n_q, self.n_docs))
+        flat = np.concatenate(rows) * self.n_docs + np.concatenate(cols)
+        out = np.bincount(flat, weights=np.concatenate(vals), minlength=n_q * self.n_docs)
+        return out.reshape(n_q, self.n_docs)
+
+    def top_k(
+        self, queries: Sequence[Sequence[str]], k: int
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Best `k` documents per query as (doc_indices, scores), best first.
+        Queries are scored in blocks to bound memory on large corpora.
+        """
+        block = max(1, _MAX_BLOCK_CELLS // max(1, self.n_docs))
+        out: List[Tuple[np.ndarray, np.ndarray]] = []
+        for start in range(0, len(queries), block):
+            for row in self.score_batch(queries[start:start + block]):
+                idx = _top_k_indices(row, k)
+                out.append((idx, row[idx]))
+        return out
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest scores, best first; ties keep input order
+    (same order as a stable `sorted(..., reverse=True)`).
+    """
+    n = scores.shape[0]
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    # argpartition splits ties at the k-th score arbitrarily; take the earliest ones
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > kth)
+    part = np.concatenate((above, np.flatnonzero(scores == kth)[: k - above.size]))
+    return part[np.lexsort((part, -scores[part]))]
+
+
+def _vector_key(p: Paper) -> str:
+    """arXiv id + version; papers without one fall back to a content hash."""
+    key = normalize_arxiv_id(p.get("paper_id") or "")
+    if key:
+        return key
+    blob = f"{p.get('title') or ''}\n{p.get('abstract') or ''}".encode("utf-8")
+    return "sha256:" + hashlib.sha256(blob).hexdigest()
+
+
+def _cascade_rerank(
+    state: GraphState,
+    query_text: str,
+    ranked: List[Paper],
+    ranked_scores: List[float],
+) -> Tuple[List[Paper], List[float], str]:
+    """
+    Second stage: embed only the top `rerank_candidates` BM25 hits and rescore them.
+
+    final = alpha * clip(cosine(query, paper), 0, 1) + (1 - alpha) * bm25 / max_bm25
+    Papers past the candidate set keep their BM25 order (scored with cosine = 0);
+    clipping the cosine keeps every candidate at or above them, so the scores
+    stay in descending order.
+    Paper vectors are cached on disk by arXiv id + version and embedder name.
+    """
+    n_cand = min(len(ranked), max(1, int(state.get("rerank_candidates", 50))))
+    alpha = float(state.get("rerank_alpha", 0.7))
+    embedder = get_embedder(str(state.get("rerank_model", "hashing")))
+
+    t0 = time.perf_counter()
+    candidates = ranked[:n_cand]
+    keys = [_vector_key(p) for p in candidates]
+
+    cache = VectorCache(cache_dir(state) / "vectors.sqlite3")
+    vectors = cache.get_many(keys, embedder.name)
+    missing = [i for i, k in enumerate(keys) if k not in vectors]
+    if missing:
+        fresh = embedder.embed(
+            [f"{candidates[i].get('title') or ''}\n{candidates[i].get('abstract') or ''}" for i in missing]
+        )
+        new_vectors = {keys[i]: fresh[j] for j, i in enumerate(missing)}
+        cache.put_many(new_vectors, embedder.name)
+        vectors.update(new_vectors)
+
+    query_vec = embedder.embed([query_text])[0]
+    doc_mat = np.stack([vectors[k] for k in keys])
+    cosine = np.clip(doc_mat @ query_vec, 0.0, 1.0)
+
+    bm25 = np.asarray(ranked_scores, dtype=np.float64)
+    top = float(bm25.max()) if bm25.size and bm25.max() > 0 else 1.0
+    final = alpha * cosine + (1 - alpha) * bm25[:n_cand] / top
+    order = _top_k_indices(final, n_cand)
+
+    reranked = [candidates[i] for i in order] + ranked[n_cand:]
+    scores = [float(final[i]) for i in order] + [float((1 - alpha) * x / top) for x in bm25[n_cand:]]
+    elapsed = time.perf_counter() - t0
+
+    summary = (
+        f"rerank[{embedder.name}] {n_cand}/{len(ranked)} candidates in {elapsed * 1000:.0f}ms "
+        f"(vector cache hits={n_cand - len(missing)}, embedded={len(missing)}, alpha={alpha})"
+    )
+    return reranked, scores, summary
 
 
 def rank_papers(state: GraphState) -> GraphState:
@@ -34,6 +196,16 @@ def rank_papers(state: GraphState) -> GraphState:
     Writes:
       state["ranked"] = sorted papers (best first)
       state["rank_scores"] = list[float] aligned with ranked (BM25 scores)
+
+    `rank_engine` selects "sparse" (default; vectorized SparseBM25) or
+    "bm25okapi" (rank_bm25 reference). With `rank_keep` > 0 only that many
+    papers are kept, selected with argpartition instead of a full sort.
+
+    `rank_mode="cascade"` adds a CPU embedding rerank of the top
+    `rerank_candidates` BM25 hits (see `_cascade_rerank`).
+
+    With `catalog_enabled`, scores come from the persistent catalog index, so
+    IDF reflects every paper ever fetched rather than just this batch.
     """
     topics: List[str] = state.get("topics", [])
     papers: List[Paper] = state.get("papers", [])
@@ -64,19 +236,42 @@ def rank_papers(state: GraphState) -> GraphState:
         )
         return state
 
-    # Build tokenized corpus
-    corpus_tokens: List[List[str]] = []
-    for p in papers:
-        title = p.get("title") or ""
-        abstract = p.get("abstract") or ""
-        corpus_tokens.append(_tokenize(f"{title}\n{abstract}"))
+    t0 = time.perf_counter()
+    if state.get("catalog_enabled"):
+        # Global IDF from the persistent catalog (FetchPapers ingests every fetched paper)
+        catalog = PaperCatalog(cache_dir(state) / "catalog.sqlite3")
+        keys = [catalog_key(p) for p in papers]
+        by_key = catalog.score(query_tokens, restrict_to=keys)
+        scores = [by_key.get(k, 0.0) for k in keys]
+        engine = "BM25/catalog"
+    else:
+        # Build tokenized corpus
+        corpus_tokens: List[List[str]] = []
+        for p in papers:
+            title = p.get("title") or ""
+            abstract = p.get("abstract") or ""
+            corpus_tokens.append(_tokenize(f"{title}\n{abstract}"))
 
-    bm25 = BM25Okapi(corpus_tokens)
-    scores = bm25.get_scores(query_tokens)  # numpy array-like, len == len(papers)
+        if state.get("rank_engine", "sparse") == "bm25okapi":
+            bm25 = BM25Okapi(corpus_tokens)
+            scores = bm25.get_scores(query_tokens)  # numpy array-like, len == len(papers)
+            engine = "BM25"
+        else:
+            scores = SparseBM25(corpus_tokens).score_batch([query_tokens])[0]
+            engine = "BM25/sparse"
 
-    order = sorted(range(len(papers)), key=lambda i: float(scores[i]), reverse=True)
+    keep = int(state.get("rank_keep", 0) or 0)
+    order = _top_k_indices(np.asarray(scores, dtype=np.float64), keep if keep > 0 else len(papers))
     ranked = [papers[i] for i in order]
     ranked_scores = [float(scores[i]) for i in order]
+    stage_log = f"bm25 {len(papers)} docs in {(time.perf_counter() - t0) * 1000:.0f}ms"
+
+    if state.get("rank_mode", "bm25") == "cascade":
+        ranked, ranked_scores, rerank_log = _cascade_rerank(
+            state, query_text, ranked, ranked_scores
+        )
+        engine += "+rerank"
+        stage_log += f"; {rerank_log}"
 
     state["ranked"] = ranked
     state["rank_scores"] = ranked_scores
@@ -86,6 +281,7 @@ def rank_papers(state: GraphState) -> GraphState:
         for i in range(min(5, len(ranked)))
     ]
     state.setdefault("logs", []).append(
-        f"RankPapers(BM25): ranked {len(ranked)} papers using query='{query_text}'. Top: {preview}"
+        f"RankPapers({engine}): ranked {len(ranked)} papers using query='{query_text}'. Top: {preview}"
     )
+    state["logs"].append(f"RankPapers({engine}): stages: {stage_log}.")
     return state
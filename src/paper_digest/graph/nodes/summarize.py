@@ -2,16 +2,24 @@ from __future__ import annotations
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from google import genai
+from pydantic import ValidationError
 
 from ..state import GraphState, Paper, PaperSummary
 from ..schemas import SummarySchema
-import random
 import re
-from paper_digest.config import get_gemini_api_key
+from paper_digest.llm.base import Generation, LLMError, LLMProvider
+from paper_digest.llm.context import fit_to_budget
+from paper_digest.llm.prefix_cache import prefix_caches
+from paper_digest.llm.registry import get_llm_provider
+from paper_digest.ratelimit import QuotaLimiter, quota_limiter
+from paper_digest.storage import cache_dir
+from paper_digest.storage.summary_cache import SummaryCache, prompt_hash, summary_key
+from paper_digest.text import estimate_tokens
+from paper_digest.transport import backoff_delay, sleep_backoff
 
 
 _TRANSIENT_HTTP = {429, 500, 503}
@@ -46,23 +54,23 @@ def _is_transient(ex: Exception) -> bool:
     return False
 
 
-def _sleep_backoff(attempt: int, base_s: float = 1.0, cap_s: float = 8.0) -> None:
+def _paper_context(p: Paper, budget_tokens: int = 0, topics: Sequence[str] = ()) -> str:
     """
-    attempt is 1-based. Exponential backoff: base * 2^(attempt-1), with jitter.
-    attempt=1 -> ~1s, attempt=2 -> ~2s, attempt=3 -> ~4s ...
+    Title + extracted intro / conclusion (or the abstract when there is no full
+    text). With a budget, the sections are cut down to their most salient
+    sentences so the whole context fits in about `budget_tokens`.
     """
-    exp = min(cap_s, base_s * (2 ** (attempt - 1)))
-    jitter = exp * (0.75 + 0.5 * random.random())  # 0.75x .. 1.25x
-    time.sleep(jitter)
-
-
-def _paper_context(p: Paper) -> str:
     title = (p.get("title") or "").strip()
     abstract = (p.get("abstract") or "").strip()
     intro = (p.get("intro_text") or "").strip()
     concl = (p.get("summary_text") or "").strip()
 
     if intro or concl:
+        if budget_tokens > 0:
+            overhead = estimate_tokens(_paper_context({"title": title, "intro_text": " "}))
+            intro, concl = fit_to_budget(
+                [intro, concl], budget_tokens - overhead, topics, reference=f"{title}\n{abstract}"
+            )
         return (
             f"TITLE:\n{title}\n\n"
             f"INTRODUCTION (EXTRACTED):\n{intro}\n\n"
@@ -82,10 +90,407 @@ def _write_json(path: Path, obj) -> None:
                     indent=2), encoding="utf-8")
 
 
+class _SummarizeContext(NamedTuple):
+    provider: LLMProvider
+    model: str
+    system_instruction: str
+    interest_line: str
+    run_dir: Path
+    limiter: QuotaLimiter
+    max_output_tokens: int
+    cache: Optional[SummaryCache]
+    context_tokens: int         # per-paper context budget; 0 = full extracted sections
+    topics: List[str]
+    prefix_cache_ttl_s: float   # provider-side prefix cache TTL; 0 = off
+
+
+class _Job(NamedTuple):
+    idx: int
+    paper: Paper
+    context: str
+    full_context_tokens: int    # before fitting to the budget
+    prefix: str
+    suffix: str
+    prompt: str                 # prefix + suffix
+    cache_key: str
+    raw_path: Path
+    parsed_path: Path
+
+
+class _Outcome(NamedTuple):
+    summary: PaperSummary
+    ok: bool
+    latency_s: float
+    throttled_s: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+    retried: bool = False       # packed / batch element that had to be re-asked on its own
+    cached_input_tokens: int = 0    # input served from the provider's prefix cache
+
+
+_SCHEMA = """{
+        "paper_id": string,
+        "title": string,
+        "one_liner": string,
+        "key_contributions": string[],
+        "methods": string[],
+        "limitations": string[],
+        "why_it_matters": string,
+        "tags": string[],
+        "url": string,
+        "status": "ok" | "failed",
+        "error": string
+        }"""
+
+
+# Prompts are <shared prefix> + <per-request suffix>. The prefix is identical for
+# every paper of a run (and across runs with the same topics), so providers can
+# cache it once it reaches their minimum size; see paper_digest.llm.prefix_cache.
+
+def _single_prefix(ctx: _SummarizeContext) -> str:
+    return (f"""
+        {ctx.interest_line}Return ONLY valid JSON with the following schema:
+        {_SCHEMA}
+
+""")
+
+
+def _single_suffix(p: Paper, context: str) -> str:
+    paper_id = p.get("paper_id", "")
+    url = p.get("url", "")
+
+    return (f"""        paper_id: {paper_id}
+        url: {url}
+
+        Content:
+        {context}
+    """)
+
+
+def _packed_prefix(ctx: _SummarizeContext) -> str:
+    return (
+        f"{ctx.interest_line}Return ONLY a valid JSON array with one object per paper below, "
+        f"in the same order, each with the following schema:\n"
+        f"{_SCHEMA}\n\n"
+    )
+
+
+def _packed_suffix(jobs: Sequence[_Job]) -> str:
+    """Several papers in one request; the answer is a JSON array in paper order."""
+    blocks = "\n".join(
+        f"=== PAPER {n} ===\n"
+        f"paper_id: {job.paper.get('paper_id', '')}\n"
+        f"url: {job.paper.get('url', '')}\n\n"
+        f"Content:\n{job.context}"
+        for n, job in enumerate(jobs, start=1)
+    )
+    return f"There are exactly {len(jobs)} papers.\n\n{blocks}\n"
+
+
+def _prepare(idx: int, p: Paper, ctx: _SummarizeContext) -> _Job:
+    paper_id = p.get("paper_id", "")
+
+    # Per-paper artifact paths
+    safe_id = paper_id.replace(
+        "/", "_").replace(":", "_") or f"paper_{idx}"
+    prompt_path = ctx.run_dir / "summaries" / f"{idx:02d}_{safe_id}_prompt.txt"
+    raw_path = ctx.run_dir / "summaries" / f"{idx:02d}_{safe_id}_raw.txt"
+    parsed_path = ctx.run_dir / "summaries" / \
+        f"{idx:02d}_{safe_id}_parsed.json"
+
+    context = _paper_context(p, ctx.context_tokens, ctx.topics)
+    full_tokens = estimate_tokens(_paper_context(p)) if ctx.context_tokens > 0 else estimate_tokens(context)
+    prefix = _single_prefix(ctx)
+    suffix = _single_suffix(p, context)
+    prompt = prefix + suffix
+
+    # Save prompt always
+    _write_text(prompt_path, prompt)
+
+    # Same paper version + model + prompt -> same summary, whichever mode produced it
+    cache_key = summary_key(
+        paper_id, f"{ctx.provider.name}:{ctx.model}", prompt_hash(ctx.system_instruction, prompt)
+    )
+    return _Job(idx, p, context, full_tokens, prefix, suffix, prompt, cache_key, raw_path, parsed_path)
+
+
+def _from_cache(job: _Job, ctx: _SummarizeContext) -> Optional[_Outcome]:
+    if ctx.cache is None:
+        return None
+    hit = ctx.cache.get(job.cache_key)
+    if hit is None:
+        return None
+    _write_json(job.parsed_path, hit.summary)
+    return _Outcome(  # type: ignore[arg-type]
+        hit.summary, True, 0.0, 0.0, hit.input_tokens, hit.output_tokens, cached=True
+    )
+
+
+def _accept(
+    job: _Job, data: Dict[str, Any], ctx: _SummarizeContext, input_tokens: int, output_tokens: int
+) -> PaperSummary:
+    """Validate one model answer, then persist it (artifact + cache). Raises on invalid data."""
+    p = job.paper
+
+    # Fill defaults from metadata
+    data.setdefault("paper_id", p.get("paper_id", ""))
+    data.setdefault("title", p.get("title", ""))
+    data.setdefault("url", p.get("url", ""))
+    data.setdefault("tags", p.get("categories", []) or [])
+    data.setdefault("status", "ok")
+
+    validated = SummarySchema(**data).model_dump()
+    _write_json(job.parsed_path, validated)
+    if ctx.cache is not None:
+        ctx.cache.put(job.cache_key, validated, input_tokens, output_tokens)
+    return validated  # type: ignore[return-value]
+
+
+def _failed(job: _Job, err: Exception | None) -> PaperSummary:
+    p = job.paper
+    failed = {
+        "paper_id": p.get("paper_id", ""),
+        "title": p.get("title", ""),
+        "url": p.get("url", ""),
+        "status": "failed",
+        "error": str(err),
+        "tags": p.get("categories", []) or [],
+        "one_liner": "",
+        "key_contributions": [],
+        "methods": [],
+        "limitations": [],
+        "why_it_matters": "",
+    }
+    _write_json(job.parsed_path, failed)
+    return failed  # type: ignore[return-value]
+
+
+def _generate(prefix: str, suffix: str, ctx: _SummarizeContext) -> Generation:
+    """Send the suffix against the provider's cached prefix when there is one."""
+    cache_id = prefix_caches.get(
+        ctx.provider, ctx.model, ctx.system_instruction, prefix, ctx.prefix_cache_ttl_s
+    )
+    if cache_id is not None:
+        try:
+            return ctx.provider.generate(
+                ctx.model, suffix, system_instruction=ctx.system_instruction, json_output=True,
+                prefix_cache=cache_id,
+            )
+        except Exception as ex:
+            if _extract_http_status(ex) not in (403, 404):
+                raise
+            # Cache expired or was deleted server-side: forget it, send the full prompt once
+            prefix_caches.invalidate(cache_id)
+    return ctx.provider.generate(
+        ctx.model, prefix + suffix, system_instruction=ctx.system_instruction, json_output=True
+    )
+
+
+def _call(prefix: str, suffix: str, ctx: _SummarizeContext) -> Tuple[Generation, float, float]:
+    """One paced LLM call. Returns (generation, latency_s, throttled_s)."""
+    # Shared RPM/TPM quota across every run in this process
+    throttled = ctx.limiter.acquire(
+        estimate_tokens(ctx.system_instruction) + estimate_tokens(prefix) + estimate_tokens(suffix)
+        + ctx.max_output_tokens
+    )
+    t0 = time.perf_counter()
+    try:
+        gen = _generate(prefix, suffix, ctx)
+    except Exception as ex:
+        if _extract_http_status(ex) == 429:
+            # quota exceeded anyway: hold back every caller, not just this one
+            ctx.limiter.block_for(getattr(ex, "retry_after_s", None) or backoff_delay(1))
+        raise
+    return gen, time.perf_counter() - t0, throttled
+
+
+def _summarize_one(job: _Job, ctx: _SummarizeContext, retried: bool = False) -> _Outcome:
+    """Summarize one paper with its own request; runs on a worker thread."""
+    max_tries = 1
+    last_err: Exception | None = None
+    throttled = 0.0
+    latency = 0.0
+
+    for attempt in range(1, max_tries + 1):
+        try:
+            gen, secs, waited = _call(job.prefix, job.suffix, ctx)
+            latency += secs
+            throttled += waited
+
+            raw_text = gen.text.strip()
+            _write_text(job.raw_path, raw_text)
+
+            # <-- if this fails, max_tries will be count in
+            data = json.loads(raw_text)
+
+            validated = _accept(
+                job,
+                data,
+                ctx,
+                gen.input_tokens or estimate_tokens(ctx.system_instruction) + estimate_tokens(job.prompt),
+                gen.output_tokens or estimate_tokens(raw_text),
+            )
+            return _Outcome(  # type: ignore[arg-type]
+                validated, True, latency, throttled, gen.input_tokens, gen.output_tokens,
+                retried=retried, cached_input_tokens=gen.cached_tokens,
+            )
+
+        # Json parsing fail
+        except json.JSONDecodeError as ex:
+            last_err = ex
+            if attempt < max_tries:
+                sleep_backoff(attempt)
+                continue
+            break
+
+        # Other error like like API/Network error
+        except Exception as ex:
+            last_err = ex
+            if attempt < max_tries and _is_transient(ex):
+                sleep_backoff(attempt)
+                continue
+            break
+
+    return _Outcome(_failed(job, last_err), False, latency, throttled, retried=retried)
+
+
+def _json_items(raw_text: str) -> List[Any]:
+    """The answer array of a packed / batched response ({"summaries": [...]} is tolerated too)."""
+    data = json.loads(raw_text)
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), [data])
+    return data if isinstance(data, list) else []
+
+
+def _match_items(jobs: Sequence[_Job], items: List[Any]) -> List[Optional[Dict[str, Any]]]:
+    """Pair answer elements with papers by paper_id, falling back to position."""
+    by_id = {str(it.get("paper_id")): it for it in items if isinstance(it, dict) and it.get("paper_id")}
+    out: List[Optional[Dict[str, Any]]] = []
+    for n, job in enumerate(jobs):
+        item = by_id.get(job.paper.get("paper_id", ""))
+        if item is None and n < len(items) and isinstance(items[n], dict) \
+                and items[n].get("paper_id") in (None, "", job.paper.get("paper_id", "")):
+            item = items[n]
+        out.append(dict(item) if item is not None else None)
+    return out
+
+
+def _summarize_pack(pack_no: int, jobs: Sequence[_Job], ctx: _SummarizeContext) -> List[_Outcome]:
+    """
+    One request for several papers. Elements are validated one by one; any
+    that are missing or invalid are re-asked individually.
+    """
+    prefix = _packed_prefix(ctx)
+    suffix = _packed_suffix(jobs)
+    prompt = prefix + suffix
+    packs_dir = ctx.run_dir / "summaries" / "packs"
+    _write_text(packs_dir / f"pack_{pack_no:02d}_prompt.txt", prompt)
+
+    items: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    gen: Optional[Generation] = None
+    latency = throttled = 0.0
+    try:
+        gen, latency, throttled = _call(prefix, suffix, ctx)
+        _write_text(packs_dir / f"pack_{pack_no:02d}_raw.txt", gen.text)
+        items = _match_items(jobs, _json_items(gen.text.strip()))
+    except Exception:
+        pass  # the whole pack falls back to per-paper requests below
+
+    # Token usage is shared evenly by the papers of the pack
+    share_in = (gen.input_tokens if gen else 0) // len(jobs)
+    share_out = (gen.output_tokens if gen else 0) // len(jobs)
+    share_cached = (gen.cached_tokens if gen else 0) // len(jobs)
+
+    outcomes: List[_Outcome] = []
+    for job, item in zip(jobs, items):
+        if item is not None:
+            try:
+                summary = _accept(job, item, ctx, share_in, share_out)
+                outcomes.append(_Outcome(  # type: ignore[arg-type]
+                    summary, True, latency, throttled, share_in, share_out,
+                    cached_input_tokens=share_cached,
+                ))
+                continue
+            except (ValidationError, TypeError):
+                pass
+        outcomes.append(_summarize_one(job, ctx, retried=True))
+    return outcomes
+
+
+def _summarize_batch(
+    jobs: Sequence[_Job], ctx: _SummarizeContext, poll_s: float, timeout_s: float
+) -> Tuple[List[_Outcome], str]:
+    """
+    Submit every paper as one asynchronous batch job and poll until it is done.
+    Failed elements are re-asked individually. Returns (outcomes, job note).
+    """
+    provider: Any = ctx.provider
+    t0 = time.perf_counter()
+    job_id = provider.submit_batch(
+        ctx.model, [job.prompt for job in jobs], system_instruction=ctx.system_instruction, json_output=True
+    )
+    while (results := provider.batch_results(job_id)) is None:
+        if time.perf_counter() - t0 > timeout_s:
+            raise LLMError(f"batch {job_id} not done after {timeout_s:.0f}s")
+        time.sleep(poll_s)
+    waited = time.perf_counter() - t0
+
+    outcomes: List[_Outcome] = []
+    for n, job in enumerate(jobs):
+        res = results[n] if n < len(results) else LLMError("missing from batch output")
+        if isinstance(res, Generation):
+            try:
+                raw_text = res.text.strip()
+                _write_text(job.raw_path, raw_text)
+                summary = _accept(job, json.loads(raw_text), ctx, res.input_tokens, res.output_tokens)
+                outcomes.append(_Outcome(summary, True, waited, 0.0, res.input_tokens, res.output_tokens))
+                continue
+            except (ValueError, TypeError):  # JSONDecodeError and ValidationError are ValueErrors
+                pass
+        outcomes.append(_summarize_one(job, ctx, retried=True))
+    return outcomes, f"batch job {job_id} done in {waited:.1f}s"
+
+
+def _prefix_cache_note(ctx: _SummarizeContext, mode: str) -> str:
+    """Why the shared prefix won't be cached this run, if the provider could cache one."""
+    if ctx.prefix_cache_ttl_s <= 0 or not hasattr(ctx.provider, "create_prefix_cache"):
+        return ""
+    # Batch mode falls back to packed requests, the only ones it sends with a prefix
+    prefix = _single_prefix(ctx) if mode == "interactive" else _packed_prefix(ctx)
+    tokens, min_tokens = prefix_caches.size(ctx.provider, ctx.system_instruction, prefix)
+    if tokens >= min_tokens:
+        return ""
+    return (
+        f"prefix cache skipped: shared prompt prefix ~{tokens} tokens is below the "
+        f"provider minimum of {min_tokens}; full prompts sent."
+    )
+
+
 def summarize_topk(state: GraphState) -> GraphState:
+    """
+    Summarize the top-k ranked papers with the run's LLM provider
+    (`llm_provider`, default: the process-wide one; see paper_digest.llm).
+
+    `llm_mode` picks how requests are made:
+      - interactive: one request per paper, run concurrently (`llm_max_in_flight`)
+      - packed: `llm_pack_size` papers per request, answered as a JSON array
+      - batch: one asynchronous provider batch job, polled until done (for
+        scheduled digests; falls back to packed if the provider has no batches)
+    Requests are paced by a process-wide limiter per model that enforces
+    requests-per-minute (`llm_rpm`) and estimated tokens-per-minute
+    (`llm_tpm`) quotas across all concurrent runs. Summaries keep the order of
+    `ranked`.
+    """
+    provider = get_llm_provider(state.get("llm_provider") or None)
     model = str(state.get("llm_model", "gemini-2.5-flash"))
     top_k = int(state.get("top_k", 5))
     topics = state.get("topics", []) or []
+    max_in_flight = max(1, int(state.get("llm_max_in_flight", 4)))
+    rpm = state.get("llm_rpm", 10)
+    tpm = state.get("llm_tpm", 250_000)
+    mode = str(state.get("llm_mode", "interactive"))
+    pack_size = max(1, int(state.get("llm_pack_size", 4)))
 
     ranked: List[Paper] = state.get("ranked", []) or state.get("papers", [])
     chosen = ranked[: min(len(ranked), top_k)]
@@ -97,7 +502,7 @@ def summarize_topk(state: GraphState) -> GraphState:
     if not chosen:
         state["summaries"] = []
         state.setdefault("logs", []).append(
-            "SummarizeTopK(Gemini): no papers to summarize.")
+            f"SummarizeTopK({provider.name}): no papers to summarize.")
         return state
 
     system_instruction = (
@@ -108,123 +513,93 @@ def summarize_topk(state: GraphState) -> GraphState:
 
     interest_line = f"User interests: {', '.join(topics)}\n\n" if topics else ""
 
-    summaries: List[PaperSummary] = []
-    ok = 0
-
-    for idx, p in enumerate(chosen, start=1):
-        paper_id = p.get("paper_id", "")
-        url = p.get("url", "")
-        title = p.get("title", "")
-
-        # Per-paper artifact paths
-        safe_id = paper_id.replace(
-            "/", "_").replace(":", "_") or f"paper_{idx}"
-        prompt_path = run_dir / "summaries" / f"{idx:02d}_{safe_id}_prompt.txt"
-        raw_path = run_dir / "summaries" / f"{idx:02d}_{safe_id}_raw.txt"
-        parsed_path = run_dir / "summaries" / \
-            f"{idx:02d}_{safe_id}_parsed.json"
-
-        context = _paper_context(p)
-
-        prompt = (f"""
-            {interest_line}Return ONLY valid JSON with the following schema:
-            {{
-            "paper_id": string,
-            "title": string,
-            "one_liner": string,
-            "key_contributions": string[],
-            "methods": string[],
-            "limitations": string[],
-            "why_it_matters": string,
-            "tags": string[],
-            "url": string,
-            "status": "ok" | "failed",
-            "error": string
-            }}
-
-            paper_id: {paper_id}
-            url: {url}
-
-            Content:
-            {context}
-        """)
-
-        def _get_client() -> genai.Client:
-            return genai.Client(api_key=get_gemini_api_key())
-
-        client = _get_client()
-        # Save prompt always
-        _write_text(prompt_path, prompt)
-        max_tries = 1
-        last_err: Exception | None = None
-
-        for attempt in range(1, max_tries + 1):
+    ctx = _SummarizeContext(
+        provider=provider,
+        model=model,
+        system_instruction=system_instruction,
+        interest_line=interest_line,
+        run_dir=run_dir,
+        limiter=quota_limiter(
+            f"{provider.name}:{model}", float(rpm) if rpm else None, float(tpm) if tpm else None
+        ),
+        max_output_tokens=int(state.get("llm_max_output_tokens", 1024)),
+        cache=SummaryCache(cache_dir(state) / "summaries.sqlite3")
+        if bool(state.get("summary_cache_enabled", True)) else None,
+        context_tokens=int(state.get("llm_context_tokens", 3000)),
+        topics=list(topics),
+        prefix_cache_ttl_s=float(state.get("llm_prefix_cache_ttl_s", 3600)),
+    )
+
+    prefix_note = _prefix_cache_note(ctx, mode)
+
+    t0 = time.perf_counter()
+    jobs = [_prepare(idx, p, ctx) for idx, p in enumerate(chosen, start=1)]
+    results: List[Optional[_Outcome]] = [_from_cache(job, ctx) for job in jobs]
+    todo = [job for job, r in zip(jobs, results) if r is None]
+
+    note = ""
+    if mode == "batch" and todo:
+        if hasattr(provider, "submit_batch"):
             try:
-                resp = client.models.generate_content(
-                    model=model,
-                    contents=prompt,
-                    config={
-                        "system_instruction": system_instruction,
-                        "response_mime_type": "application/json",
-                    },
+                batch_out, note = _summarize_batch(
+                    todo,
+                    ctx,
+                    poll_s=float(state.get("llm_batch_poll_s", 30)),
+                    timeout_s=float(state.get("llm_batch_timeout_s", 24 * 3600)),
                 )
-
-                raw_text = (resp.text or "").strip()
-                _write_text(raw_path, raw_text)
-
-                # <-- if this fails, max_tries will be count in
-                data = json.loads(raw_text)
-
-                # Fill defaults from metadata
-                data.setdefault("paper_id", paper_id)
-                data.setdefault("title", title)
-                data.setdefault("url", url)
-                data.setdefault("tags", p.get("categories", []) or [])
-                data.setdefault("status", "ok")
-
-                validated = SummarySchema(**data).model_dump()
-                _write_json(parsed_path, validated)
-                summaries.append(validated)  # type: ignore[arg-type]
-                ok += 1
-                last_err = None
-                break
-
-            # Json parsing fail
-            except json.JSONDecodeError as ex:
-                last_err = ex
-                if attempt < max_tries:
-                    _sleep_backoff(attempt)
-                    continue
-                break
-
-            # Other error like like API/Network error
+                for job, outcome in zip(todo, batch_out):
+                    results[job.idx - 1] = outcome
+                todo = []
             except Exception as ex:
-                last_err = ex
-                if attempt < max_tries and _is_transient(ex):
-                    _sleep_backoff(attempt)
-                    continue
-                break
-
-        if last_err is not None:
-            failed = {
-                "paper_id": paper_id,
-                "title": title,
-                "url": url,
-                "status": "failed",
-                "error": str(last_err),
-                "tags": p.get("categories", []) or [],
-                "one_liner": "",
-                "key_contributions": [],
-                "methods": [],
-                "limitations": [],
-                "why_it_matters": "",
-            }
-            _write_json(parsed_path, failed)
-            summaries.append(failed)
+                note = f"batch failed ({ex}); packed fallback"
+                mode = "packed"
+        else:
+            note = f"'{provider.name}' has no batch jobs; packed fallback"
+            mode = "packed"
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(todo) or 1)) as pool:
+        if mode == "packed" and todo:
+            packs = [todo[i:i + pack_size] for i in range(0, len(todo), pack_size)]
+            note = "; ".join(filter(None, [note, f"{len(packs)} packed requests of <= {pack_size}"]))
+            pack_out = pool.map(lambda np: _summarize_pack(*np, ctx), enumerate(packs, start=1))
+            for pack, outcomes in zip(packs, pack_out):
+                for job, outcome in zip(pack, outcomes):
+                    results[job.idx - 1] = outcome
+        else:
+            for job, outcome in zip(todo, pool.map(lambda job: _summarize_one(job, ctx), todo)):
+                results[job.idx - 1] = outcome
+
+    done: List[_Outcome] = [r for r in results if r is not None]
+    summaries: List[PaperSummary] = [r.summary for r in done]
+    ok = sum(1 for r in done if r.ok)
+    latencies = ", ".join(
+        f"{job.idx:02d}={r.latency_s:.1f}s ({job.full_context_tokens}->{estimate_tokens(job.context)} tok)"
+        for job, r in zip(jobs, done)
+    )
+    context_full = sum(job.full_context_tokens for job in jobs)
+    context_sent = sum(estimate_tokens(job.context) for job in jobs)
+    throttled = sum(r.throttled_s for r in done)
+    called = [r for r in done if not r.cached]
+    tokens_in = sum(r.input_tokens for r in called)
+    tokens_out = sum(r.output_tokens for r in called)
+    tokens_cached = sum(r.cached_input_tokens for r in called)
+    hits = len(done) - len(called)
+    tokens_saved = sum(r.input_tokens + r.output_tokens for r in done if r.cached)
+    retried = sum(1 for r in done if r.retried)
 
     state["summaries"] = summaries
     state.setdefault("logs", []).append(
-        f"SummarizeTopK(Gemini): produced {ok}/{len(chosen)} summaries using model='{model}'. "
+        f"SummarizeTopK({provider.name}): produced {ok}/{len(chosen)} summaries using model='{model}' "
+        f"in {time.perf_counter() - t0:.1f}s (mode={mode}{f': {note}' if note else ''}, "
+        f"{retried} retried individually; in_flight<={max_in_flight}, rpm={rpm or 'unlimited'}, "
+        f"tpm={tpm or 'unlimited'}, throttled={throttled:.1f}s; "
+        f"context ~{context_full}->{context_sent} tokens (budget {ctx.context_tokens or 'off'}/paper); "
+        f"latency {latencies}; "
+        f"tokens in={tokens_in} (prefix-cached {tokens_cached}) out={tokens_out}; "
+        f"cache hits={hits} misses={len(called)}, "
+        f"~{tokens_saved} tokens saved). "
         f"Artifacts in: {run_dir / 'summaries'}"
     )
+    if prefix_note and called:
+        state["logs"].append(f"SummarizeTopK({provider.name}): {prefix_note}")
     return state
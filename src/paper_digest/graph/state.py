@@ -24,6 +24,9 @@ class Paper(TypedDict, total=False):
     pdf_url: str                
     content_status: str         # Error message if full-text extraction fails
     content_error: str          # Error message if full-text extraction fails
+    content_source: str         # "latex" | "pdf": where intro/summary text came from
+    change_status: str          # "new" | "updated" | "unchanged" (incremental fetch only)
+    duplicates: List[str]       # paper_ids collapsed into this canonical paper by DedupePapers
 
 
 class PaperSummary(TypedDict, total=False):
@@ -67,15 +70,77 @@ class GraphState(TypedDict, total=False):
     logs: List[str]                 # human-readable exectution trace 
     rank_scores: List[float]        # optoinal rank score algined with `ranked` ppaer
 
+    # Fetch config
+    fetch_timeout_s: float          # Per-request timeout for arXiv API calls
+    fetch_max_tries: int            # Attempts per page before giving up on it
+    fetch_backoff_base_s: float     # Initial retry delay; doubles per attempt (with jitter)
+    fetch_page_size: int            # start/max_results window size; 0 = single request
+    fetch_shard_categories: bool    # Split the query into one shard per default category
+    fetch_parallelism: int          # Number of pages fetched concurrently
+    fetch_cache_enabled: bool       # Serve repeated arXiv queries from the on-disk response cache
+    fetch_cache_ttl_s: float        # Age after which a cached response is revalidated
+    fetch_cache_max_mb: float       # Size cap for the response cache (LRU eviction)
+    cache_dir: str                  # Root for persistent caches; default <out_dir>/cache
+    fetch_incremental: bool         # Page only until the profile watermark; label new/updated/unchanged
+    fetch_skip_unchanged: bool      # Drop papers already processed at the same version
+    fetch_profile: str              # Topic-profile key used for the watermark (set by FetchPapers)
+    fetch_incremental_max_results: int  # Incremental: paging cap while catching up to the watermark
+    fetch_watermark_next: str       # Watermark PersistRun may commit; "" if the fetch didn't reach the old one
+    fetch_parser: str               # "stream" (incremental Atom parser) | "feedparser"
+    fetch_source: str               # "search" (arXiv API) | "oai" (OAI-PMH) | "catalog" (local)
+    oai_base_url: str               # OAI-PMH endpoint (override for a local stand-in server)
+    oai_from: str                   # Harvest range start, YYYY-MM-DD
+    oai_until: str                  # Harvest range end, YYYY-MM-DD
+    oai_set: str                    # OAI set, e.g. "cs"
+    oai_categories: List[str]       # Optional client-side category filter, e.g. ["cs.AI"]
+    oai_max_records: int            # Harvest cap; 0 = no cap
+    catalog_enabled: bool           # Ingest fetched papers into the persistent catalog; rank with its index
+    catalog_max_age_s: float        # fetch_source="catalog" serves locally if ingested within this window
+
+    # De-duplication config
+    dedupe_enabled: bool            # Collapse versions / near-duplicates before ranking
+    dedupe_threshold: float         # Estimated Jaccard at which two papers are duplicates
+    dedupe_persist: bool            # Also drop near-duplicates of papers kept by earlier runs
+
+    # Ranking config
+    rank_engine: str                # "sparse" (vectorized BM25) | "bm25okapi" (rank_bm25 reference)
+    rank_keep: int                  # Keep only the top-N ranked papers; 0 = keep all
+    rank_mode: str                  # "bm25" | "cascade" (BM25 then CPU embedding rerank)
+    rerank_candidates: int          # BM25 candidates passed to the reranker
+    rerank_model: str               # "hashing" (built-in) or a sentence-transformers model name
+    rerank_alpha: float             # Weight of embedding similarity vs normalized BM25
+
     # Full-text extraction config
     fulltext_ready: List[Paper]     # Papers that successfully passed full-text extraction
     pdf_head_pages: int             # Number of pages extracted from the beginning of PDFs
     pdf_tail_pages: int             # Number of pages extracted from the end of PDFs
+    fulltext_strategy: str          # "pdf" (default) | "source_first" (LaTeX e-print, PDF fallback)
+    pdf_fetch_mode: str             # "full" | "range" (HTTP Range: only head/tail page objects)
+    pdf_window_mode: str            # "fixed" (default) | "adaptive" (parse pages lazily until sections are found)
+    pdf_max_head_pages: int         # Adaptive mode: hard cap on head pages parsed
+    pdf_max_tail_pages: int         # Adaptive mode: hard cap on tail pages parsed
     pdf_fetch_limit: int            # Maximum number of PDFs to fetch in a run
     section_max_chars: int          # Character cap per extracted section
-    pdf_polite_delay_s: float       # Delay between PDF fetches to avoid rate limiting
+    pdf_max_concurrency: int        # PDFs downloaded / extracted concurrently
+    pdf_cache_enabled: bool         # Reuse PDFs of the same arXiv id+version across runs
+    pdf_cache_max_mb: float         # Size cap for the PDF cache (LRU eviction)
+    extract_cache_enabled: bool     # Reuse extracted sections keyed by PDF hash + parameters
+    pdf_max_mb: float               # Reject / abort PDF downloads larger than this
+    pdf_extract_timeout_s: float    # Per-document extraction timeout (worker is killed on expiry)
     # LLM model to use 
     llm_model: str
+    llm_provider: str               # "gemini" | "openai" | "fake"; default: the process-wide provider
+    llm_max_in_flight: int          # Papers summarized concurrently
+    llm_rpm: float                  # Requests-per-minute quota per model (shared process-wide)
+    llm_tpm: float                  # Estimated tokens-per-minute quota per model
+    llm_max_output_tokens: int      # Output tokens reserved per call in the TPM estimate
+    llm_context_tokens: int         # Per-paper context budget (salient sentences kept); 0 = full sections
+    llm_prefix_cache_ttl_s: float   # TTL of the provider-side cache of the shared prompt prefix; 0 = off
+    summary_cache_enabled: bool     # Reuse summaries keyed by arXiv id+version, model and prompt hash
+    llm_mode: str                   # "interactive" | "packed" (several papers per request) | "batch" (async job)
+    llm_pack_size: int              # Packed mode: papers per request
+    llm_batch_poll_s: float         # Batch mode: seconds between job status checks
+    llm_batch_timeout_s: float      # Batch mode: give up (and fall back to packed) after this long
 
     # output check
     run_id: str
@@ -0,0 +1,13 @@
+"""
+LLM providers for the SummarizeTopK node.
+
+  - base.py: `LLMProvider` / `BatchProvider` / `CachingProvider` interfaces, `Generation`, `LLMError`
+  - gemini.py: Google Gemini through one long-lived google-genai client (incl. batch jobs and
+    cached content)
+  - openai_compat.py: any OpenAI-compatible /chat/completions endpoint, over the shared transport
+  - fake.py: deterministic offline provider (incl. packed prompts and batch jobs), plus a
+    local stand-in HTTP server
+  - context.py: fits extracted sections into a per-paper token budget
+  - prefix_cache.py: process-wide provider-side caches of the shared prompt prefix
+  - registry.py: process-wide providers (configure_llm_provider / get_llm_provider)
+"""
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Protocol, Union
+
+
+class Generation(NamedTuple):
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0      # part of input_tokens served from a provider-side cache
+
+
+class LLMError(RuntimeError):
+    """A provider call failed; `status_code` is the HTTP status when there was one."""
+
+    def __init__(
+        self, message: str, status_code: Optional[int] = None, retry_after_s: Optional[float] = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after_s = retry_after_s
+
+
+class LLMProvider(Protocol):
+    name: str
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        system_instruction: str = "",
+        json_output: bool = True,
+        prefix_cache: Optional[str] = None,
+    ) -> Generation:
+        """
+        One completion. Thread-safe: nodes call this from worker threads.
+        With `prefix_cache` (from `CachingProvider.create_prefix_cache`), `prompt`
+        is only the part after the cached prefix, and the cached system
+        instruction applies.
+        """
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+BatchResult = Union[Generation, LLMError]
+
+
+class BatchProvider(LLMProvider, Protocol):
+    """Providers that also run asynchronous batch jobs (cheaper, high-latency)."""
+
+    def submit_batch(
+        self, model: str, prompts: List[str], *, system_instruction: str = "", json_output: bool = True
+    ) -> str:
+        """Queue one request per prompt; returns the job id."""
+        ...
+
+    def batch_results(self, job_id: str) -> Optional[List[BatchResult]]:
+        """
+        None while the job is pending; otherwise one result per prompt, in
+        submission order. Raises LLMError if the job as a whole failed.
+        """
+        ...
+
+
+class CachingProvider(LLMProvider, Protocol):
+    """Providers that can cache a shared prompt prefix server-side (cheaper, faster input)."""
+
+    # Smallest prefix (system instruction included, estimated tokens) worth registering
+    min_prefix_cache_tokens: int
+
+    def create_prefix_cache(
+        self, model: str, prefix: str, *, system_instruction: str = "", ttl_s: float = 3600.0
+    ) -> str:
+        """Register `system_instruction` + `prefix` for `ttl_s`; returns the cache id."""
+        ...
@@ -0,0 +1,133 @@
+"""
+Token-budgeted prompt context.
+
+Extracted intro / conclusion sections can run to tens of thousands of
+tokens. `fit_to_budget` keeps the most salient sentences of each section so
+that together they fit a token budget:
+  - boilerplate (arXiv stamps, licenses, URLs, affiliations, captions) is dropped
+  - near-duplicate sentences (the conclusion restating the intro) are kept once
+  - sentences are scored by idf-weighted overlap with the user's topics and
+    the paper's title / abstract, plus a small bonus for leading sentences
+  - the best sentences are picked greedily under the budget and emitted in
+    their original order, so the text still reads as a (shortened) section
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Sequence
+
+from paper_digest.text import estimate_tokens, tokenize
+
+
+_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+_ABBREVIATIONS = ("et al.", "e.g.", "i.e.", "fig.", "eq.", "sec.", "vs.", "cf.", "resp.", "approx.")
+_BOILERPLATE_RE = re.compile(
+    r"arxiv:\s*\d|preprint|under review|copyright|©|licen[cs]e|https?://|www\.|\S+@\S+\.\w+"
+    r"|equal contribution|corresponding author|^(figure|fig\.|table)\s*\d+"
+    r"|^(accepted|published) (at|in|to|by)|proceedings of",
+    re.IGNORECASE,
+)
+_MIN_SENTENCE_CHARS = 25
+_DUPLICATE_JACCARD = 0.7
+_TOPIC_WEIGHT = 2.0
+_LEAD_BONUS = 0.3
+
+
+class _Sentence(NamedTuple):
+    section: int
+    paragraph: int
+    position: int       # index within its section
+    text: str
+    tokens: int
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentence split that keeps common abbreviations ("et al.", "e.g.") attached."""
+    out: List[str] = []
+    for piece in _SPLIT_RE.split(" ".join(text.split())):
+        if out and out[-1].lower().endswith(_ABBREVIATIONS):
+            out[-1] = f"{out[-1]} {piece}"
+        else:
+            out.append(piece)
+    return [s for s in out if s]
+
+
+def _sentences(sections: Sequence[str]) -> List[_Sentence]:
+    out: List[_Sentence] = []
+    for si, section in enumerate(sections):
+        position = 0
+        for pi, paragraph in enumerate(re.split(r"\n\s*\n", section or "")):
+            for sent in split_sentences(paragraph):
+                if len(sent) < _MIN_SENTENCE_CHARS or _BOILERPLATE_RE.search(sent):
+                    continue
+                out.append(_Sentence(si, pi, position, sent, estimate_tokens(sent) + 1))
+                position += 1
+    return out
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _scores(sents: List[_Sentence], topics: Sequence[str], reference: str) -> List[float]:
+    words = [tokenize(s.text) for s in sents]
+    df = Counter(w for ws in words for w in set(ws))
+    n = len(sents)
+    idf = {w: math.log((n + 1) / (c + 1)) + 1.0 for w, c in df.items()}
+
+    query: Dict[str, float] = {}
+    for w in tokenize(reference):
+        query[w] = 1.0
+    for w in tokenize(" ".join(topics)):
+        query[w] = _TOPIC_WEIGHT
+
+    raw = [
+        sum(query.get(w, 0.0) * idf[w] for w in set(ws)) / math.sqrt(len(ws) or 1)
+        for ws in words
+    ]
+    top = max(raw, default=0.0) or 1.0
+    return [r / top + _LEAD_BONUS / math.sqrt(1 + s.position) for r, s in zip(raw, sents)]
+
+
+def fit_to_budget(
+    sections: Sequence[str], budget_tokens: int, topics: Sequence[str] = (), reference: str = ""
+) -> List[str]:
+    """
+    Shrink `sections` (e.g. [intro, conclusion]) to about `budget_tokens`
+    estimated tokens in total. Sections that already fit are returned as-is.
+    """
+    if sum(estimate_tokens(s) for s in sections) <= budget_tokens:
+        return list(sections)
+
+    sents = _sentences(sections)
+    scores = _scores(sents, topics, reference)
+    shingles = [frozenset(tokenize(s.text)) for s in sents]
+
+    order = sorted(range(len(sents)), key=lambda i: (-scores[i], i))
+    # Every non-empty section gets its best sentence before the rest compete
+    firsts = {}
+    for i in order:
+        firsts.setdefault(sents[i].section, i)
+    order = list(firsts.values()) + [i for i in order if i not in firsts.values()]
+
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if used + sents[i].tokens > budget_tokens:
+            continue
+        if any(_jaccard(shingles[i], shingles[k]) >= _DUPLICATE_JACCARD for k in kept):
+            continue
+        kept.append(i)
+        used += sents[i].tokens
+
+    out: List[List[str]] = [[] for _ in sections]
+    prev_paragraph: Dict[int, int] = {}
+    for i in sorted(kept):
+        s = sents[i]
+        sep = " " if prev_paragraph.get(s.section) == s.paragraph else "\n"
+        out[s.section].append((sep if out[s.section] else "") + s.text)
+        prev_paragraph[s.section] = s.paragraph
+    return ["".join(parts) for parts in out]
@@ -0,0 +1,271 @@
+"""
+Deterministic offline LLM for load tests and benchmarks.
+
+`FakeProvider` answers summarization prompts with a schema-valid JSON summary
+built from the prompt itself (same prompt -> same answer), after a simulated
+latency. Packed prompts ("=== PAPER n ===" blocks) get a JSON array with one
+summary per block, batch jobs complete after a simulated delay, and prefix
+caches emulate Gemini cached content (with cached-token accounting).
+`start_fake_server()` exposes it as an OpenAI-compatible
+/chat/completions endpoint, so the `openai` provider can be exercised end to
+end without network access:
+
+    python -m paper_digest.llm.fake --port 8765
+    LLM_PROVIDER=openai LLM_BASE_URL=http://127.0.0.1:8765/v1 ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from paper_digest.text import estimate_tokens, tokenize
+
+from .base import BatchResult, Generation, LLMError
+
+
+_FIELD_RE = re.compile(r"^\s*(paper_id|url):[ \t]*(.*)$", re.MULTILINE)
+_PAPER_BLOCK_RE = re.compile(r"^=== PAPER \d+ ===$", re.MULTILINE)
+_TITLE_RE = re.compile(r"TITLE:\s*\n\s*(.+)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_STOPWORDS = frozenset(
+    "the a an and or of to in for on with by we our is are this that from as be at it its "
+    "which these using can paper show results".split()
+)
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(" ".join(text.split())) if len(s.strip()) > 20]
+
+
+def _section(content: str, label: str) -> str:
+    m = re.search(rf"{label}[^\n]*:\s*\n(.*?)(?:\n[A-Z][A-Z /()]+:\s*\n|\Z)", content, re.S)
+    return m.group(1) if m else ""
+
+
+def fake_summary(prompt: str) -> Dict[str, object]:
+    """A SummarySchema-shaped dict derived only from the prompt text."""
+    fields = dict(_FIELD_RE.findall(prompt))
+    content = prompt.split("Content:", 1)[-1]
+    title_m = _TITLE_RE.search(content)
+    intro = _sentences(_section(content, "INTRODUCTION") or _section(content, "ABSTRACT"))
+    concl = _sentences(_section(content, "CONCLUSION"))
+    words = [w for w in tokenize(" ".join(intro + concl)) if w not in _STOPWORDS and len(w) > 3 and not w.isdigit()]
+
+    return {
+        "paper_id": fields.get("paper_id", "").strip(),
+        "title": title_m.group(1).strip() if title_m else "",
+        "one_liner": (intro[0] if intro else "Insufficient content.")[:200],
+        "key_contributions": [s[:200] for s in intro[1:4]],
+        "methods": [s[:200] for s in intro if re.search(r"\b(we propose|method|approach)", s, re.I)][:2],
+        "limitations": ["Summary produced by the offline fake provider."],
+        "why_it_matters": (concl[0] if concl else "")[:200],
+        "tags": [w for w, _ in Counter(words).most_common(3)],
+        "url": fields.get("url", "").strip(),
+        "status": "ok",
+        "error": "",
+    }
+
+
+def fake_response(prompt: str, bad_element_every: int = 0) -> object:
+    """One summary, or a list of them for a packed prompt (every Nth element invalid)."""
+    blocks = _PAPER_BLOCK_RE.split(prompt)
+    if len(blocks) == 1:
+        return fake_summary(prompt)
+    items = [fake_summary(block) for block in blocks[1:]]
+    if bad_element_every:
+        for item in items[bad_element_every - 1::bad_element_every]:
+            item.pop("one_liner")
+    return items
+
+
+class FakeProvider:
+    """
+    latency_s + per_1k_tokens_s * (input tokens / 1000) of simulated time per
+    call. fail_every=N makes every Nth call raise an HTTP 429 `LLMError`;
+    bad_element_every=N drops a required field from every Nth element of a
+    packed answer. Batch jobs finish `batch_delay_s` after submission.
+    Prefix caches behave like Gemini cached content: calls report the cached
+    part as cached_tokens (and skip its simulated cost), caches expire after
+    their TTL, and prefixes under `min_cache_tokens` are rejected.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        per_1k_tokens_s: float = 0.0,
+        fail_every: int = 0,
+        bad_element_every: int = 0,
+        batch_delay_s: float = 0.0,
+        min_cache_tokens: int = 0,
+    ) -> None:
+        self.latency_s = latency_s
+        self.per_1k_tokens_s = per_1k_tokens_s
+        self.fail_every = fail_every
+        self.bad_element_every = bad_element_every
+        self.batch_delay_s = batch_delay_s
+        self.min_cache_tokens = min_cache_tokens
+        self.min_prefix_cache_tokens = min_cache_tokens
+        self.calls = 0
+        self.prefix_caches_created = 0
+        self._prefixes: Dict[str, Tuple[str, str, float]] = {}   # id -> (system, prefix, expires_at)
+        self._batches: Dict[str, Tuple[float, List[Generation]]] = {}
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt: str, system_instruction: str, json_output: bool) -> Generation:
+        input_tokens = estimate_tokens(system_instruction) + estimate_tokens(prompt)
+        answer = fake_response(prompt, self.bad_element_every)
+        if json_output:
+            text = json.dumps(answer, ensure_ascii=False)
+        else:
+            text = str(answer["one_liner"] if isinstance(answer, dict) else len(answer))
+        return Generation(text, input_tokens, estimate_tokens(text))
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        system_instruction: str = "",
+        json_output: bool = True,
+        prefix_cache: Optional[str] = None,
+    ) -> Generation:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            cached = self._prefixes.get(prefix_cache or "")
+        if prefix_cache:
+            if cached is None or cached[2] < time.monotonic():
+                raise LLMError(f"cached content {prefix_cache} not found", status_code=404)
+            system_instruction, prefix = cached[0], cached[1]
+            prompt = prefix + prompt
+        cached_tokens = estimate_tokens(system_instruction) + estimate_tokens(prefix) if prefix_cache else 0
+        input_tokens = estimate_tokens(system_instruction) + estimate_tokens(prompt)
+        # Cached input is not re-processed, so it adds no simulated time
+        time.sleep(self.latency_s + self.per_1k_tokens_s * (input_tokens - cached_tokens) / 1000.0)
+        if self.fail_every and call % self.fail_every == 0:
+            raise LLMError("HTTP 429: fake quota exhausted", status_code=429, retry_after_s=1.0)
+
+        return self._answer(prompt, system_instruction, json_output)._replace(cached_tokens=cached_tokens)
+
+    def create_prefix_cache(
+        self, model: str, prefix: str, *, system_instruction: str = "", ttl_s: float = 3600.0
+    ) -> str:
+        size = estimate_tokens(system_instruction) + estimate_tokens(prefix)
+        if size < self.min_cache_tokens:
+            raise LLMError(
+                f"cached content too small: {size} < {self.min_cache_tokens} tokens", status_code=400
+            )
+        with self._lock:
+            self.prefix_caches_created += 1
+            cache_id = f"cachedContents/fake-{self.prefix_caches_created}"
+            self._prefixes[cache_id] = (system_instruction, prefix, time.monotonic() + ttl_s)
+        return cache_id
+
+    def submit_batch(
+        self, model: str, prompts: List[str], *, system_instruction: str = "", json_output: bool = True
+    ) -> str:
+        results = [self._answer(p, system_instruction, json_output) for p in prompts]
+        with self._lock:
+            job_id = f"batches/fake-{len(self._batches) + 1}"
+            self._batches[job_id] = (time.monotonic() + self.batch_delay_s, results)
+        return job_id
+
+    def batch_results(self, job_id: str) -> Optional[List[BatchResult]]:
+        with self._lock:
+            if job_id not in self._batches:
+                raise LLMError(f"unknown batch {job_id}", status_code=404)
+            ready_at, results = self._batches[job_id]
+        return list(results) if time.monotonic() >= ready_at else None
+
+    def close(self) -> None:
+        pass
+
+
+def _handler(provider: FakeProvider) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args) -> None:  # keep load tests quiet
+            pass
+
+        def _send(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+                return
+            req = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            messages = req.get("messages") or []
+            system = "".join(m.get("content", "") for m in messages if m.get("role") == "system")
+            prompt = "".join(m.get("content", "") for m in messages if m.get("role") != "system")
+            json_output = (req.get("response_format") or {}).get("type") == "json_object"
+            try:
+                gen = provider.generate(
+                    req.get("model", ""), prompt, system_instruction=system, json_output=json_output
+                )
+            except LLMError as ex:
+                headers = {"Retry-After": str(int(ex.retry_after_s or 1))}
+                self._send(ex.status_code or 500, {"error": {"message": str(ex)}}, headers)
+                return
+            self._send(200, {
+                "object": "chat.completion",
+                "model": req.get("model", ""),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": gen.text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": gen.input_tokens,
+                    "completion_tokens": gen.output_tokens,
+                    "total_tokens": gen.input_tokens + gen.output_tokens,
+                    "prompt_tokens_details": {"cached_tokens": gen.cached_tokens},
+                },
+            })
+
+    return Handler
+
+
+def start_fake_server(
+    host: str = "127.0.0.1", port: int = 0, provider: Optional[FakeProvider] = None
+) -> ThreadingHTTPServer:
+    """Serve `provider` on a daemon thread; base URL is http://host:server_port/v1."""
+    server = ThreadingHTTPServer((host, port), _handler(provider or FakeProvider()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible fake LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-s", type=float, default=0.5)
+    parser.add_argument("--per-1k-tokens-s", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--bad-element-every", type=int, default=0)
+    args = parser.parse_args()
+
+    provider = FakeProvider(args.latency_s, args.per_1k_tokens_s, args.fail_every, args.bad_element_every)
+    server = ThreadingHTTPServer((args.host, args.port), _handler(provider))
+    print(f"fake LLM listening on http://{args.host}:{server.server_port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
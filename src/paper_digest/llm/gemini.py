@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, List, Optional
+
+from google import genai
+
+from paper_digest.config import get_gemini_api_key
+
+from .base import BatchResult, Generation, LLMError
+
+
+_BATCH_DONE = {"JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"}
+_BATCH_FAILED = {"JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+class GeminiProvider:
+    """
+    One google-genai client for the whole process (it keeps its own connection
+    pool). Built on first use, so the API key is read once and a missing key
+    only fails the runs that actually need Gemini.
+    """
+
+    name = "gemini"
+    # Gemini refuses cached content below a model-specific minimum; 1024 is the
+    # smallest current one (larger minimums are refused server-side and backed off)
+    min_prefix_cache_tokens = 1024
+
+    def __init__(self, api_key: Optional[str] = None, key_loader: Callable[[], str] = get_gemini_api_key) -> None:
+        self._api_key = api_key
+        self._key_loader = key_loader
+        self._client: Optional[genai.Client] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> genai.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = genai.Client(api_key=self._api_key or self._key_loader())
+            return self._client
+
+    @staticmethod
+    def _config(system_instruction: str, json_output: bool) -> dict:
+        config = {}
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+        if json_output:
+            config["response_mime_type"] = "application/json"
+        return config
+
+    @staticmethod
+    def _generation(resp) -> Generation:
+        usage = resp.usage_metadata
+        return Generation(
+            text=resp.text or "",
+            input_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            output_tokens=(usage.candidates_token_count or 0) if usage else 0,
+            cached_tokens=(usage.cached_content_token_count or 0) if usage else 0,
+        )
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        system_instruction: str = "",
+        json_output: bool = True,
+        prefix_cache: Optional[str] = None,
+    ) -> Generation:
+        if prefix_cache:
+            # The cache carries the system instruction; it may not be repeated here
+            config = self._config("", json_output)
+            config["cached_content"] = prefix_cache
+        else:
+            config = self._config(system_instruction, json_output)
+        resp = self.client.models.generate_content(model=model, contents=prompt, config=config)
+        return self._generation(resp)
+
+    def create_prefix_cache(
+        self, model: str, prefix: str, *, system_instruction: str = "", ttl_s: float = 3600.0
+    ) -> str:
+        config = {
+            "contents": [{"role": "user", "parts": [{"text": prefix}]}],
+            "ttl": f"{int(ttl_s)}s",
+            "display_name": "paper-digest-prefix",
+        }
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+        return self.client.caches.create(model=model, config=config).name
+
+    def submit_batch(
+        self, model: str, prompts: List[str], *, system_instruction: str = "", json_output: bool = True
+    ) -> str:
+        config = self._config(system_instruction, json_output)
+        src = [{"contents": [{"role": "user", "parts": [{"text": p}]}], "config": config} for p in prompts]
+        job = self.client.batches.create(model=model, src=src, config={"display_name": "paper-digest"})
+        return job.name
+
+    def batch_results(self, job_id: str) -> Optional[List[BatchResult]]:
+        job = self.client.batches.get(name=job_id)
+        state = job.state.name if job.state else ""
+        if state not in _BATCH_DONE:
+            if state in _BATCH_FAILED:
+                raise LLMError(f"Gemini batch {job_id} ended in {state}: {job.error}")
+            return None
+
+        out: List[BatchResult] = []
+        for item in (job.dest.inlined_responses if job.dest else None) or []:
+            if item.error is not None or item.response is None:
+                err = item.error
+                out.append(LLMError(str(err.message if err else "empty response"), getattr(err, "code", None)))
+            else:
+                out.append(self._generation(item.response))
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
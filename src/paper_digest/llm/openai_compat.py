@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import requests
+
+from paper_digest.transport import HttpTransport, RetryPolicy, get_transport, retry_after_s
+
+from .base import Generation, LLMError
+
+
+# The summarize node owns retries and quota pacing; the transport sends each call once.
+_SINGLE_TRY = RetryPolicy(max_tries=1)
+
+
+class OpenAICompatProvider:
+    """
+    Chat-completions client for OpenAI-compatible servers (OpenAI, vLLM,
+    llama.cpp, the local fake in fake.py, ...). Requests go through the
+    process-wide `HttpTransport`, so connections stay pooled across runs.
+    There is no explicit prefix cache: these servers cache repeated prompt
+    prefixes on their own and report them as cached_tokens.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        timeout_s: float = 120.0,
+        transport: Optional[HttpTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+        self._transport = transport
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        *,
+        system_instruction: str = "",
+        json_output: bool = True,
+        prefix_cache: Optional[str] = None,
+    ) -> Generation:
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+        body = {"model": model, "messages": messages}
+        if json_output:
+            body["response_format"] = {"type": "json_object"}
+
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        transport = self._transport or get_transport()
+        try:
+            resp = transport.request(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=body,
+                headers=headers,
+                timeout=self.timeout_s,
+                retry=_SINGLE_TRY,
+            )
+        except requests.RequestException as ex:
+            raise LLMError(f"{self.base_url}: {ex}") from ex
+
+        if resp.status_code != 200:
+            raise LLMError(
+                f"HTTP {resp.status_code} from {self.base_url}: {resp.text[:300]}",
+                status_code=resp.status_code,
+                retry_after_s=retry_after_s(resp),
+            )
+
+        data = resp.json()
+        usage = data.get("usage") or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return Generation(
+            text=data["choices"][0]["message"].get("content") or "",
+            input_tokens=int(usage.get("prompt_tokens") or 0),
+            output_tokens=int(usage.get("completion_tokens") or 0),
+            cached_tokens=int(details.get("cached_tokens") or 0),
+        )
+
+    def close(self) -> None:
+        # The shared transport is owned (and closed) by the app / CLI
+        pass
@@ -0,0 +1,97 @@
+"""
+Process-wide registry of provider-side prefix caches.
+
+Every summarization prompt starts with the same system instruction, schema
+and user-interests line. `PrefixCaches` registers that prefix once per
+(provider, model, prefix) with the provider, remembers the cache id until
+shortly before its TTL runs out, and hands the same id to every concurrent
+run. Providers without prefix caching, prefixes below the provider's
+`min_prefix_cache_tokens` (never registered; Gemini needs 1024 tokens, more
+than the default summarization prefix) and prefixes the provider refuses get
+None and send the full prompt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from paper_digest.text import estimate_tokens
+
+from .base import LLMProvider
+
+
+# Re-register this long before expiry so in-flight calls never hit a dead cache
+_RENEW_MARGIN_S = 60.0
+# After a refused registration, don't ask again for this long
+_RETRY_AFTER_FAILURE_S = 600.0
+
+
+class _Entry(NamedTuple):
+    cache_id: str
+    expires_at: float
+
+
+class PrefixCaches:
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._refused_until: Dict[str, float] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: LLMProvider, model: str, system_instruction: str, prefix: str) -> str:
+        digest = hashlib.sha256(f"{system_instruction}\0{prefix}".encode("utf-8")).hexdigest()
+        return f"{provider.name}:{model}:{digest}"
+
+    @staticmethod
+    def size(provider: LLMProvider, system_instruction: str, prefix: str) -> Tuple[int, int]:
+        """(estimated prefix tokens incl. system instruction, provider minimum for caching)."""
+        min_tokens = int(getattr(provider, "min_prefix_cache_tokens", 0) or 0)
+        return estimate_tokens(system_instruction) + estimate_tokens(prefix), min_tokens
+
+    def get(
+        self, provider: LLMProvider, model: str, system_instruction: str, prefix: str, ttl_s: float
+    ) -> Optional[str]:
+        """Cache id for this prefix, registering it on first use; None if unavailable."""
+        create = getattr(provider, "create_prefix_cache", None)
+        if create is None or ttl_s <= 0:
+            return None
+        # Too small to cache: don't pay a refused registration every few minutes
+        tokens, min_tokens = self.size(provider, system_instruction, prefix)
+        if tokens < min_tokens:
+            return None
+        key = self.key(provider, model, system_instruction, prefix)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One registration per prefix even when many runs start at once
+        with key_lock:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at - _RENEW_MARGIN_S > now:
+                    return entry.cache_id
+                if self._refused_until.get(key, 0.0) > now:
+                    return None
+            try:
+                cache_id = create(model, prefix, system_instruction=system_instruction, ttl_s=ttl_s)
+            except Exception:
+                with self._lock:
+                    self._refused_until[key] = now + _RETRY_AFTER_FAILURE_S
+                return None
+            with self._lock:
+                self._entries[key] = _Entry(cache_id, now + ttl_s)
+            return cache_id
+
+    def invalidate(self, cache_id: str) -> None:
+        """Forget a cache the provider no longer knows (expired or deleted server-side)."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.cache_id == cache_id:
+                    del self._entries[key]
+
+
+prefix_caches = PrefixCaches()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+from paper_digest.config import get_llm_settings
+
+from .base import LLMProvider
+
+
+def build_provider(
+    provider: str = "gemini",
+    base_url: str = "",
+    api_key: str = "",
+    timeout_s: float = 120.0,
+    fake_latency_s: float = 0.0,
+) -> LLMProvider:
+    if provider == "gemini":
+        from .gemini import GeminiProvider
+        return GeminiProvider(api_key=api_key or None)
+    if provider == "openai":
+        from .openai_compat import OpenAICompatProvider
+        if not base_url:
+            raise RuntimeError("LLM provider 'openai' needs LLM_BASE_URL.")
+        return OpenAICompatProvider(base_url, api_key, timeout_s)
+    if provider == "fake":
+        from .fake import FakeProvider
+        return FakeProvider(latency_s=fake_latency_s)
+    raise ValueError(f"unknown LLM provider '{provider}' (expected gemini | openai | fake)")
+
+
+_providers: Dict[str, LLMProvider] = {}
+_default: Optional[str] = None
+_providers_lock = threading.Lock()
+
+
+def configure_llm_provider(provider: str = "gemini", **settings) -> LLMProvider:
+    """Create (or replace) the process-wide default provider. Called by the app / CLI at startup."""
+    global _default
+    with _providers_lock:
+        old = _providers.pop(provider, None)
+        if old is not None:
+            old.close()
+        _providers[provider] = build_provider(provider, **settings)
+        _default = provider
+        return _providers[provider]
+
+
+def get_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    """
+    The default provider, or a specific one by name (e.g. a run's `llm_provider`).
+    Unconfigured providers are built from env settings on first use and kept.
+    """
+    with _providers_lock:
+        settings = get_llm_settings()
+        name = name or _default or settings.pop("provider")
+        settings.pop("provider", None)
+        if name not in _providers:
+            _providers[name] = build_provider(name, **settings)
+        return _providers[name]
+
+
+def close_llm_providers() -> None:
+    with _providers_lock:
+        for provider in _providers.values():
+            provider.close()
+        _providers.clear()
@@ -5,7 +5,11 @@ from typing import List
 import typer
 from dotenv import load_dotenv
 from rich import print
+from paper_digest.config import get_extraction_settings, get_http_settings, get_llm_settings
+from paper_digest.fulltext.executor import configure_extraction_executor
+from paper_digest.llm.registry import configure_llm_provider
 from paper_digest.graph.build_graph import build
+from paper_digest.transport import configure_transport
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,12 +19,19 @@ def run(
     top_k: int = typer.Option(5, help="How many papers to include in the digest."),
     max_results: int = typer.Option(20, help="How many papers to fetch from arXiv."),
     topic: List[str] = typer.Option([], help="Repeatable. Keywords to match in title/abstract."),
+    page_size: int = typer.Option(0, help="arXiv page size; 0 fetches everything in one request."),
+    parallelism: int = typer.Option(4, help="How many arXiv pages to fetch concurrently."),
+    shard_categories: bool = typer.Option(False, help="Fetch one shard per default category."),
+    incremental: bool = typer.Option(False, help="Only process papers not seen by earlier runs."),
 ):
 
     """
     Run the paper digest pipeline once (MVP stub).
     """
     load_dotenv()
+    configure_transport(**get_http_settings())
+    configure_extraction_executor(**get_extraction_settings())
+    configure_llm_provider(**get_llm_settings())
 
     graph = build()
 
@@ -35,7 +46,11 @@ def run(
         "logs": [],
         "llm_model": "gemini-2.5-flash",
         "run_id": run_id,
-        "out_dir": out_dir
+        "out_dir": out_dir,
+        "fetch_page_size": page_size,
+        "fetch_parallelism": parallelism,
+        "fetch_shard_categories": shard_categories,
+        "fetch_incremental": incremental,
     }
 
     result = graph.invoke(initial_state)
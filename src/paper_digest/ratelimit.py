@@ -0,0 +1,138 @@
+"""
+Token-bucket rate limiting shared across threads (and therefore across runs
+in the same process).
+
+`TokenBucket` refills continuously at `rate_per_s` up to `capacity`, and can be
+blocked for a while (e.g. after an HTTP 429 with Retry-After).
+`HostRateLimiter` keeps one bucket per host.
+`QuotaLimiter` enforces an LLM's requests-per-minute and tokens-per-minute
+quotas together; `quota_limiter()` hands out one per model, process-wide.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(self, rate_per_s: Optional[float], capacity: float = 1.0) -> None:
+        """rate_per_s=None means unlimited (the bucket can still be blocked)."""
+        self.rate_per_s = rate_per_s
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate_per_s:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    def acquire(self, n: float = 1.0) -> float:
+        """
+        Block until `n` tokens are available, then take them. Returns seconds waited.
+
+        Requests larger than the capacity are admitted once the bucket is full and
+        leave it in debt, so they are throttled rather than rejected.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif not self.rate_per_s:
+                    return waited
+                elif self._tokens >= min(n, self.capacity):
+                    self._tokens -= n
+                    return waited
+                else:
+                    delay = (min(n, self.capacity) - self._tokens) / self.rate_per_s
+            time.sleep(delay)
+            waited += delay
+
+    def block_for(self, seconds: float) -> None:
+        """Refuse all acquisitions for `seconds` (e.g. server asked us to back off)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, seconds))
+
+
+class HostRateLimiter:
+    """One TokenBucket per host; unconfigured hosts are unlimited but can still be blocked."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlsplit(url).hostname or "").lower()
+
+    def configure(self, host: str, rate_per_s: Optional[float], burst: float = 1.0) -> None:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                self._buckets[host] = TokenBucket(rate_per_s, burst)
+            else:
+                bucket.rate_per_s = rate_per_s
+                bucket.capacity = max(1.0, float(burst))
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = self.host_of(url)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(None)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        return self._bucket(url).acquire()
+
+    def block_for(self, url: str, seconds: float) -> None:
+        self._bucket(url).block_for(seconds)
+
+
+class QuotaLimiter:
+    """
+    Requests-per-minute + tokens-per-minute quotas (None = unlimited).
+    Buckets hold `burst_s` seconds' worth of quota, so a fresh process can't
+    fire a whole minute's budget at once.
+    """
+
+    def __init__(self, rpm: Optional[float], tpm: Optional[float], burst_s: float = 10.0) -> None:
+        self.burst_s = burst_s
+        self.requests = TokenBucket(*self._bucket_args(rpm))
+        self.tokens = TokenBucket(*self._bucket_args(tpm))
+
+    def _bucket_args(self, per_min: Optional[float]) -> Tuple[Optional[float], float]:
+        return (per_min / 60.0 if per_min else None), max(1.0, (per_min or 0) / 60.0 * self.burst_s)
+
+    def configure(self, rpm: Optional[float], tpm: Optional[float]) -> None:
+        for bucket, per_min in ((self.requests, rpm), (self.tokens, tpm)):
+            bucket.rate_per_s, bucket.capacity = self._bucket_args(per_min)
+
+    def acquire(self, tokens: float) -> float:
+        """Wait for one request slot and `tokens` tokens. Returns seconds waited."""
+        return self.requests.acquire() + self.tokens.acquire(tokens)
+
+    def block_for(self, seconds: float) -> None:
+        self.requests.block_for(seconds)
+
+
+_quota_limiters: Dict[str, QuotaLimiter] = {}
+_quota_lock = threading.Lock()
+
+
+def quota_limiter(key: str, rpm: Optional[float], tpm: Optional[float]) -> QuotaLimiter:
+    """The process-wide limiter for `key` (e.g. a model name), (re)configured with these quotas."""
+    with _quota_lock:
+        limiter = _quota_limiters.get(key)
+        if limiter is None:
+            limiter = _quota_limiters[key] = QuotaLimiter(rpm, tpm)
+        else:
+            limiter.configure(rpm, tpm)
+        return limiter
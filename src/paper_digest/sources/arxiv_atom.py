@@ -0,0 +1,76 @@
+"""
+Streaming parser for arXiv API Atom feeds.
+
+Consumes the response body as a byte stream and yields one normalized `Paper`
+per <entry>, clearing parsed elements as it goes, so memory stays flat no matter
+how many entries the feed holds. Output matches
+`graph.nodes.fetch._parse_arxiv_entry` applied to feedparser entries.
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator, List
+
+from paper_digest.graph.state import Paper
+
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ENTRY = f"{_ATOM}entry"
+
+
+def _text(elem: ET.Element, tag: str) -> str:
+    child = elem.find(f"{_ATOM}{tag}")
+    return (child.text or "").strip() if child is not None else ""
+
+
+def _entry_to_paper(entry: ET.Element) -> Paper:
+    paper_id = _text(entry, "id")
+    title = _text(entry, "title").replace("\n", " ").strip()
+    abstract = _text(entry, "summary").replace("\n", " ").strip()
+
+    # feedparser's `link` is the rel="alternate" link (rel defaults to alternate)
+    url = ""
+    for link in entry.findall(f"{_ATOM}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            url = link.get("href", "")
+            break
+    url = url or paper_id
+
+    authors: List[str] = []
+    for a in entry.findall(f"{_ATOM}author"):
+        name = _text(a, "name")
+        if name:
+            authors.append(name)
+
+    tags = [
+        (c.get("term") or "").strip()
+        for c in entry.findall(f"{_ATOM}category")
+        if c.get("term")
+    ]
+
+    return {
+        "paper_id": paper_id,
+        "source": "arxiv",
+        "title": title,
+        "authors": authors,
+        "abstract": abstract,
+        "url": url,
+        "published_at": _text(entry, "published"),
+        "updated_at": _text(entry, "updated"),
+        "categories": tags,
+    }
+
+
+def iter_arxiv_entries(source: BinaryIO) -> Iterator[Paper]:
+    """
+    Yield papers from an Atom feed read incrementally from `source`
+    (any object with .read(), e.g. a file or `requests` raw stream).
+    """
+    ctx = ET.iterparse(source, events=("start", "end"))
+    _, root = next(ctx)
+    for event, elem in ctx:
+        if event == "end" and elem.tag == _ENTRY:
+            yield _entry_to_paper(elem)
+            # Drop the finished entry (and anything before it) from the tree
+            root.clear()
@@ -0,0 +1,218 @@
+"""
+OAI-PMH bulk harvester for arXiv metadata.
+
+Harvests `ListRecords` (metadataPrefix=arXivRaw, the only arXiv format that
+carries the version history) over a date range and optional set, follows
+resumption tokens, and normalizes each record into a `Paper` whose id holds
+the latest version, as in the search API.
+
+Progress is checkpointed after every page under `<checkpoint_dir>`:
+  - checkpoint.json : the next resumption token, the number of records spooled
+                      and the number already handed to callers
+  - records.jsonl   : papers harvested so far
+so an interrupted or capped harvest with the same parameters resumes with the
+first record not yet delivered instead of starting over. Both files are
+removed once the harvest completes.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from paper_digest.graph.state import Paper
+from paper_digest.transport import RetryPolicy, TransportStats, get_transport
+
+
+OAI_ENDPOINT = "https://oaipmh.arxiv.org/oai"
+METADATA_PREFIX = "arXivRaw"
+
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXivRaw/}"
+
+# arXivRaw authors are one free-text string: "A. One, B. Two and C. Three"
+_AUTHOR_SPLIT = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+")
+
+
+def _text(elem: Optional[ET.Element], tag: str) -> str:
+    if elem is None:
+        return ""
+    child = elem.find(tag)
+    return " ".join((child.text or "").split()) if child is not None else ""
+
+
+def _iso_date(rfc2822: str) -> str:
+    """'Mon, 2 Apr 2007 19:18:42 GMT' -> '2007-04-02T19:18:42Z' (the Atom feed's format)."""
+    try:
+        return parsedate_to_datetime(rfc2822).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return ""
+
+
+def _record_to_paper(meta: ET.Element) -> Paper:
+    arxiv_id = _text(meta, f"{_ARXIV}id")
+
+    versions = meta.findall(f"{_ARXIV}version")
+    latest = versions[-1].get("version", "") if versions else ""
+    created = _iso_date(_text(versions[0], f"{_ARXIV}date")) if versions else ""
+    updated = _iso_date(_text(versions[-1], f"{_ARXIV}date")) if versions else ""
+
+    authors = [a for a in _AUTHOR_SPLIT.split(_text(meta, f"{_ARXIV}authors")) if a]
+    url = f"http://arxiv.org/abs/{arxiv_id}{latest}" if arxiv_id else ""
+
+    return {
+        "paper_id": url,
+        "source": "arxiv",
+        "title": _text(meta, f"{_ARXIV}title"),
+        "authors": authors,
+        "abstract": _text(meta, f"{_ARXIV}abstract"),
+        "url": url,
+        "published_at": created,
+        "updated_at": updated or created,
+        "categories": _text(meta, f"{_ARXIV}categories").split(),
+    }
+
+
+def parse_list_records(body: bytes) -> tuple[List[Paper], str]:
+    """
+    Parse one ListRecords response.
+    Returns (papers, resumption_token); the token is "" on the last page.
+    Raises RuntimeError for OAI errors other than noRecordsMatch.
+    """
+    root = ET.fromstring(body)
+
+    err = root.find(f"{_OAI}error")
+    if err is not None:
+        if err.get("code") == "noRecordsMatch":
+            return [], ""
+        raise RuntimeError(f"OAI-PMH error {err.get('code')}: {(err.text or '').strip()}")
+
+    papers: List[Paper] = []
+    list_records = root.find(f"{_OAI}ListRecords")
+    if list_records is None:
+        return papers, ""
+
+    for rec in list_records.findall(f"{_OAI}record"):
+        header = rec.find(f"{_OAI}header")
+        if header is not None and header.get("status") == "deleted":
+            continue
+        meta = rec.find(f"{_OAI}metadata/{_ARXIV}arXivRaw")
+        if meta is not None:
+            papers.append(_record_to_paper(meta))
+
+    token_el = list_records.find(f"{_OAI}resumptionToken")
+    token = (token_el.text or "").strip() if token_el is not None else ""
+    return papers, token
+
+
+def harvest(
+    checkpoint_dir: str | Path,
+    base_url: str = OAI_ENDPOINT,
+    from_date: str = "",
+    until_date: str = "",
+    set_spec: str = "",
+    categories: Optional[List[str]] = None,
+    max_records: int = 0,
+    timeout_s: float = 60.0,
+    max_tries: int = 5,
+    backoff_base_s: float = 2.0,
+    log: Callable[[str], None] = lambda _msg: None,
+    stats: Optional[TransportStats] = None,
+) -> Iterator[Paper]:
+    """
+    Yield papers for the requested range, resuming from a checkpoint if one exists.
+
+    `categories` filters records client-side (OAI sets are coarse, e.g. "cs").
+    `max_records` stops after that many papers (0 = no limit); the checkpoint
+    is kept so a later call continues with the next undelivered record.
+    Records count as delivered once yielded, so a caller that stops early or
+    crashes between checkpoints may see a few records again (at-least-once).
+    """
+    ckpt_dir = Path(checkpoint_dir)
+    ckpt_dir.mkdir(parents=True, exist_ok=True)
+    ckpt_path = ckpt_dir / "checkpoint.json"
+    spool_path = ckpt_dir / "records.jsonl"
+
+    wanted = set(categories or [])
+    # OAI-PMH flow control answers 503 + Retry-After, which the transport honors
+    retry = RetryPolicy(max_tries=max_tries, backoff_base_s=backoff_base_s, backoff_cap_s=120.0)
+    count = 0           # yielded by this call
+    spooled = 0         # records in records.jsonl
+    delivered = 0       # records in records.jsonl handed to callers (this call or earlier ones)
+    token = ""
+
+    def save() -> None:
+        ckpt_path.write_text(
+            json.dumps({"resumption_token": token, "records": spooled, "delivered": delivered}),
+            encoding="utf-8",
+        )
+
+    if ckpt_path.exists():
+        ckpt = json.loads(ckpt_path.read_text(encoding="utf-8"))
+        token = ckpt.get("resumption_token", "")
+        skip = int(ckpt.get("delivered", 0))
+        log(f"resuming from checkpoint ({skip} records delivered, token={token[:16] or '-'}).")
+    else:
+        skip = 0
+        spool_path.write_text("", encoding="utf-8")
+
+    try:
+        if spool_path.exists():
+            with spool_path.open(encoding="utf-8") as f:
+                for line in f:
+                    spooled += 1
+                    if spooled <= skip:
+                        continue
+                    delivered = spooled
+                    count += 1
+                    yield json.loads(line)
+                    if max_records and count >= max_records:
+                        return
+        delivered = spooled
+
+        first = not ckpt_path.exists()
+        while first or token:
+            if first:
+                params: Dict[str, Any] = {"verb": "ListRecords", "metadataPrefix": METADATA_PREFIX}
+                if from_date:
+                    params["from"] = from_date
+                if until_date:
+                    params["until"] = until_date
+                if set_spec:
+                    params["set"] = set_spec
+                first = False
+            else:
+                params = {"verb": "ListRecords", "resumptionToken": token}
+
+            resp = get_transport().get(
+                base_url, params=params, timeout=timeout_s, retry=retry, stats=stats, log=log
+            )
+            resp.raise_for_status()
+            papers, token = parse_list_records(resp.content)
+            if wanted:
+                papers = [p for p in papers if wanted.intersection(p.get("categories", []))]
+
+            # Spool the page before advancing the checkpoint past it
+            with spool_path.open("a", encoding="utf-8") as f:
+                for p in papers:
+                    f.write(json.dumps(p, ensure_ascii=False) + "\n")
+            spooled += len(papers)
+            save()
+
+            for p in papers:
+                delivered += 1
+                count += 1
+                yield p
+                if max_records and count >= max_records:
+                    return
+    finally:
+        # Also runs when the caller stops early (GeneratorExit) or a request fails
+        if ckpt_path.exists():
+            save()
+
+    ckpt_path.unlink(missing_ok=True)
+    spool_path.unlink(missing_ok=True)
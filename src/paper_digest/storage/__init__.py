@@ -0,0 +1,24 @@
+"""
+Persistent, process-local stores (caches, indexes, watermarks).
+
+Every store lives under a single cache directory so a deployment only has to
+mount one volume. The directory is resolved from, in order:
+  - state["cache_dir"]
+  - $PAPER_DIGEST_CACHE_DIR
+  - <out_dir>/cache
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Mapping
+
+
+def cache_dir(state: Mapping[str, Any]) -> Path:
+    """Resolve (and create) the cache directory for a run."""
+    raw = state.get("cache_dir") or os.getenv("PAPER_DIGEST_CACHE_DIR")
+    path = Path(raw) if raw else Path(state.get("out_dir") or "outputs") / "cache"
+    path = path.resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class SqliteStore:
+    """
+    Minimal base for sqlite-backed stores.
+
+    Subclasses set SCHEMA (executed once on open). Connections are short-lived
+    and serialized per instance; sqlite's own file locking covers other
+    processes sharing the same file.
+    """
+
+    SCHEMA: str = ""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
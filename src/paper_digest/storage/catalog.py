@@ -0,0 +1,216 @@
+"""
+Persistent catalog of every fetched paper, with an incremental BM25 index.
+
+Papers are keyed by their base arXiv id, so a new version replaces the old
+one. The inverted index (postings, document lengths, document frequencies)
+is updated in place on every ingest, which gives ranking stable, global IDF
+statistics instead of statistics over the 20-N papers of a single fetch.
+
+Scoring follows rank_bm25.BM25Okapi (k1=1.5, b=0.75, epsilon=0.25), so results
+agree with the in-memory ranker on the same corpus.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import Counter
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from paper_digest.arxiv_ids import split_arxiv_id
+from paper_digest.graph.state import Paper
+from paper_digest.text import tokenize
+
+from .base import SqliteStore
+
+
+def catalog_key(p: Paper) -> str:
+    """Base arXiv id when available, else the raw paper_id."""
+    pid = p.get("paper_id") or ""
+    base, _ = split_arxiv_id(pid)
+    return base or pid
+
+
+def _doc_tokens(p: Paper) -> List[str]:
+    return tokenize(f"{p.get('title') or ''}\n{p.get('abstract') or ''}")
+
+
+class PaperCatalog(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS papers (
+        key TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        doc_len INTEGER NOT NULL,
+        ingested_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS papers_updated ON papers(updated_at);
+    CREATE TABLE IF NOT EXISTS postings (
+        term TEXT NOT NULL,
+        key TEXT NOT NULL,
+        tf INTEGER NOT NULL,
+        PRIMARY KEY (term, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS postings_key ON postings(key);
+    CREATE TABLE IF NOT EXISTS terms (
+        term TEXT PRIMARY KEY,
+        df INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS meta (
+        name TEXT PRIMARY KEY,
+        value REAL NOT NULL
+    );
+    """
+
+    k1 = 1.5
+    b = 0.75
+    epsilon = 0.25
+
+    # ---- ingest -------------------------------------------------------------
+
+    def upsert(self, papers: Iterable[Paper]) -> int:
+        """Add or replace papers and update the index incrementally. Returns papers written."""
+        now = time.time()
+        n = 0
+        with self._connect() as conn:
+            n_docs, total_len = self._corpus_stats(conn)
+
+            for p in papers:
+                key = catalog_key(p)
+                if not key:
+                    continue
+
+                # Remove the previous version's postings first
+                old = conn.execute("SELECT doc_len FROM papers WHERE key = ?", (key,)).fetchone()
+                if old is not None:
+                    old_terms = [r[0] for r in conn.execute(
+                        "SELECT term FROM postings WHERE key = ?", (key,)
+                    )]
+                    conn.executemany(
+                        "UPDATE terms SET df = df - 1 WHERE term = ?", [(t,) for t in old_terms]
+                    )
+                    conn.execute("DELETE FROM postings WHERE key = ?", (key,))
+                    n_docs -= 1
+                    total_len -= old[0]
+
+                tokens = _doc_tokens(p)
+                tf = Counter(tokens)
+                conn.execute(
+                    "INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(p, ensure_ascii=False), p.get("updated_at") or "",
+                     len(tokens), now),
+                )
+                conn.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?)", [(t, key, c) for t, c in tf.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO terms VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    [(t,) for t in tf],
+                )
+                n_docs += 1
+                total_len += len(tokens)
+                n += 1
+
+            conn.execute("DELETE FROM terms WHERE df <= 0")
+            self._set_meta(conn, "n_docs", n_docs)
+            self._set_meta(conn, "total_len", total_len)
+            self._set_meta(conn, "avg_idf", self._average_idf(conn, n_docs))
+            if n:
+                self._set_meta(conn, "last_ingest_at", now)
+        return n
+
+    # ---- queries ------------------------------------------------------------
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return int(self._corpus_stats(conn)[0])
+
+    def last_ingest_at(self) -> float:
+        with self._connect() as conn:
+            return self._get_meta(conn, "last_ingest_at")
+
+    def get(self, keys: Iterable[str]) -> List[Paper]:
+        out: List[Paper] = []
+        with self._connect() as conn:
+            for key in keys:
+                row = conn.execute("SELECT data FROM papers WHERE key = ?", (key,)).fetchone()
+                if row:
+                    out.append(json.loads(row[0]))
+        return out
+
+    def recent(self, limit: int) -> List[Paper]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM papers ORDER BY updated_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def score(
+        self, query_tokens: List[str], restrict_to: Optional[Collection[str]] = None
+    ) -> Dict[str, float]:
+        """
+        BM25 scores keyed by catalog key, using global corpus statistics.
+
+        With `restrict_to`, only those keys are scored (and all of them are
+        returned, with 0.0 for documents matching no query term).
+        """
+        qf = Counter(query_tokens)
+        scores: Dict[str, float] = {k: 0.0 for k in restrict_to} if restrict_to is not None else {}
+
+        with self._connect() as conn:
+            n_docs, total_len = self._corpus_stats(conn)
+            if n_docs <= 0:
+                return scores
+            avgdl = total_len / n_docs
+            eps = self.epsilon * self._get_meta(conn, "avg_idf")
+
+            for term, count in qf.items():
+                row = conn.execute("SELECT df FROM terms WHERE term = ?", (term,)).fetchone()
+                if not row:
+                    continue
+                idf = math.log(n_docs - row[0] + 0.5) - math.log(row[0] + 0.5)
+                if idf < 0:
+                    idf = eps
+
+                for key, tf, dl in conn.execute(
+                    "SELECT p.key, p.tf, d.doc_len FROM postings p "
+                    "JOIN papers d ON d.key = p.key WHERE p.term = ?",
+                    (term,),
+                ):
+                    if restrict_to is not None and key not in scores:
+                        continue
+                    denom = tf + self.k1 * (1 - self.b + self.b * dl / avgdl)
+                    scores[key] = scores.get(key, 0.0) + count * idf * tf * (self.k1 + 1) / denom
+        return scores
+
+    def search(self, query_tokens: List[str], limit: int) -> List[Tuple[Paper, float]]:
+        """Top `limit` papers in the whole catalog for a query."""
+        scores = self.score(query_tokens)
+        top = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        papers = {catalog_key(p): p for p in self.get(k for k, _ in top)}
+        return [(papers[k], s) for k, s in top if k in papers]
+
+    # ---- internals ----------------------------------------------------------
+
+    def _corpus_stats(self, conn) -> Tuple[float, float]:
+        return self._get_meta(conn, "n_docs"), self._get_meta(conn, "total_len")
+
+    @staticmethod
+    def _get_meta(conn, name: str) -> float:
+        row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return float(row[0]) if row else 0.0
+
+    @staticmethod
+    def _set_meta(conn, name: str, value: float) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, float(value)))
+
+    @staticmethod
+    def _average_idf(conn, n_docs: float) -> float:
+        """Mean IDF over the vocabulary (BM25Okapi's epsilon floor is relative to it)."""
+        total = 0.0
+        count = 0
+        for (df,) in conn.execute("SELECT df FROM terms"):
+            total += math.log(n_docs - df + 0.5) - math.log(df + 0.5)
+            count += 1
+        return total / count if count else 0.0
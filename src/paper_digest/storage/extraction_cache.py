@@ -0,0 +1,49 @@
+"""
+Persistent cache of extracted intro/summary sections.
+
+Keyed by the PDF's SHA-256 plus the extraction parameters (page window,
+max chars) and the extractor version, so any change to the heuristics or
+knobs yields a fresh key instead of stale text. Text is zlib-compressed.
+"""
+
+from __future__ import annotations
+
+import time
+import zlib
+from typing import Optional, Tuple
+
+from .base import SqliteStore
+
+
+def extraction_key(pdf_sha256: str, window: str, max_chars: int, version: int) -> str:
+    return f"{pdf_sha256}:{window}:c{max_chars}:v{version}"
+
+
+class ExtractionCache(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sections (
+        key TEXT PRIMARY KEY,
+        intro BLOB NOT NULL,
+        summary BLOB NOT NULL,
+        stored_at REAL NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT intro, summary FROM sections WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8"), zlib.decompress(row[1]).decode("utf-8")
+
+    def put(self, key: str, intro_text: str, summary_text: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    zlib.compress(intro_text.encode("utf-8"), 6),
+                    zlib.compress(summary_text.encode("utf-8"), 6),
+                    time.time(),
+                ),
+            )
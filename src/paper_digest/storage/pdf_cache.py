@@ -0,0 +1,114 @@
+"""
+Content-addressed on-disk PDF cache.
+
+Blobs are stored once per SHA-256 under `<root>/blobs/ab/abcd....pdf`; a
+sqlite index maps normalized arXiv id+version keys to blobs. Only versioned
+ids are cached, since an arXiv version's PDF never changes. When the total
+blob size exceeds `max_bytes`, least-recently-used keys are dropped and blobs
+nobody references any more are deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .base import SqliteStore
+
+
+@dataclass
+class CachedPdf:
+    path: Path
+    sha256: str
+    size: int
+
+
+class PdfCache(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pdfs (
+        key TEXT PRIMARY KEY,
+        sha256 TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS pdfs_accessed ON pdfs(accessed_at);
+    CREATE INDEX IF NOT EXISTS pdfs_sha ON pdfs(sha256);
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 2 * 1024 ** 3) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        super().__init__(self.root / "index.sqlite3")
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / f"{sha256}.pdf"
+
+    def get(self, key: str) -> Optional[CachedPdf]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT sha256, size FROM pdfs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            path = self.blob_path(row[0])
+            if not path.exists():
+                conn.execute("DELETE FROM pdfs WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE pdfs SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CachedPdf(path=path, sha256=row[0], size=row[1])
+
+    @property
+    def spool_dir(self) -> Path:
+        """Scratch space on the same filesystem as the blobs, so put_file() is a rename."""
+        return self.root / "spool"
+
+    def put(self, key: str, data: bytes) -> CachedPdf:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        self._index(key, sha, len(data))
+        return CachedPdf(path=path, sha256=sha, size=len(data))
+
+    def put_file(self, key: str, src: Path, sha256: str, size: int) -> CachedPdf:
+        """Adopt an already-hashed file (moved into the blob store, or dropped if present)."""
+        path = self.blob_path(sha256)
+        if path.exists():
+            src.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(src, path)
+        self._index(key, sha256, size)
+        return CachedPdf(path=path, sha256=sha256, size=size)
+
+    def _index(self, key: str, sha: str, size: int) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pdfs VALUES (?, ?, ?, ?, ?)", (key, sha, size, now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn) -> None:
+        blobs = dict(conn.execute("SELECT sha256, MAX(size) FROM pdfs GROUP BY sha256").fetchall())
+        total = sum(blobs.values())
+        if total <= self.max_bytes:
+            return
+        for key, sha in conn.execute(
+            "SELECT key, sha256 FROM pdfs ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM pdfs WHERE key = ?", (key,))
+            still_used = conn.execute(
+                "SELECT 1 FROM pdfs WHERE sha256 = ? LIMIT 1", (sha,)
+            ).fetchone()
+            if not still_used:
+                self.blob_path(sha).unlink(missing_ok=True)
+                total -= blobs.get(sha, 0)
@@ -0,0 +1,144 @@
+"""
+On-disk cache for arXiv API responses.
+
+Entries are keyed by the normalized query parameters. A fresh entry (younger
+than the TTL) is served without touching the network; a stale entry keeps its
+ETag / Last-Modified validators so the caller can revalidate it with a
+conditional request. Total body size is capped with least-recently-used eviction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from .base import SqliteStore
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: str
+    stored_at: float
+    fresh: bool
+
+    def validators(self) -> Dict[str, str]:
+        """Headers for a conditional request revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        params TEXT NOT NULL,
+        body BLOB NOT NULL,
+        etag TEXT NOT NULL DEFAULT '',
+        last_modified TEXT NOT NULL DEFAULT '',
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at);
+    """
+
+    def __init__(self, path, ttl_s: float = 900.0, max_bytes: int = 256 * 1024 * 1024) -> None:
+        super().__init__(path)
+        self.ttl_s = float(ttl_s)
+        self.max_bytes = int(max_bytes)
+
+    @staticmethod
+    def make_key(params: Mapping[str, Any]) -> str:
+        """
+        Hash of the normalized request parameters.
+
+        Whitespace inside string values is collapsed and keys are sorted, so
+        cosmetic differences in how a query was built map to the same entry.
+        """
+        norm = {
+            k: _WS_RE.sub(" ", v).strip() if isinstance(v, str) else v
+            for k, v in params.items()
+        }
+        blob = json.dumps(norm, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        body, etag, last_modified, stored_at = row
+        return CachedResponse(
+            body=bytes(body),
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=stored_at,
+            fresh=(now - stored_at) < self.ttl_s,
+        )
+
+    def put(
+        self,
+        key: str,
+        params: Mapping[str, Any],
+        body: bytes,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, params, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(dict(params), sort_keys=True),
+                    body,
+                    etag or "",
+                    last_modified or "",
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._evict(conn)
+
+    def touch(self, key: str) -> None:
+        """Mark an entry fresh again after a successful revalidation (HTTP 304)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def _evict(self, conn) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
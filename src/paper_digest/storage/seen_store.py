@@ -0,0 +1,97 @@
+"""
+Per-profile watermark and seen-set for incremental fetching.
+
+A profile is one topic set. For each profile we remember:
+  - the newest `updated_at` already processed (the watermark), so paging can
+    stop once it reaches older papers;
+  - every (arXiv id, version) already processed, so papers can be labelled
+    new / updated / unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Dict, Iterable, List
+
+from paper_digest.arxiv_ids import split_arxiv_id
+
+from .base import SqliteStore
+
+
+def profile_key(topics: Iterable[str]) -> str:
+    """Stable key for a topic set (order / case / whitespace insensitive)."""
+    norm = sorted({" ".join(t.lower().split()) for t in topics if t and t.strip()})
+    return hashlib.sha256(json.dumps(norm).encode("utf-8")).hexdigest()[:16]
+
+
+class SeenStore(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS watermarks (
+        profile TEXT PRIMARY KEY,
+        updated_at TEXT NOT NULL,
+        committed_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS seen (
+        profile TEXT NOT NULL,
+        arxiv_id TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (profile, arxiv_id, version)
+    );
+    """
+
+    def get_watermark(self, profile: str) -> str:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT updated_at FROM watermarks WHERE profile = ?", (profile,)
+            ).fetchone()
+        return row[0] if row else ""
+
+    def classify(self, profile: str, paper_ids: List[str]) -> Dict[str, str]:
+        """Map paper_id -> "new" | "updated" | "unchanged"."""
+        out: Dict[str, str] = {}
+        with self._connect() as conn:
+            for pid in paper_ids:
+                base, version = split_arxiv_id(pid)
+                if not base:
+                    out[pid] = "new"
+                    continue
+                versions = {
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT version FROM seen WHERE profile = ? AND arxiv_id = ?",
+                        (profile, base),
+                    )
+                }
+                if not versions:
+                    out[pid] = "new"
+                elif version in versions:
+                    out[pid] = "unchanged"
+                else:
+                    out[pid] = "updated"
+        return out
+
+    def commit(self, profile: str, papers: Iterable[dict], watermark: str) -> int:
+        """
+        Record papers as processed and advance the watermark to `watermark`
+        (never backwards; "" leaves it unchanged). Returns rows written.
+        """
+        rows = []
+        for p in papers:
+            base, version = split_arxiv_id(p.get("paper_id") or "")
+            if base:
+                rows.append((profile, base, version, p.get("updated_at") or ""))
+
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?, ?, ?)", rows)
+            if watermark:
+                conn.execute(
+                    "INSERT INTO watermarks (profile, updated_at, committed_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(profile) DO UPDATE SET "
+                    "updated_at = MAX(updated_at, excluded.updated_at), "
+                    "committed_at = excluded.committed_at",
+                    (profile, watermark, time.time()),
+                )
+        return len(rows)
@@ -0,0 +1,64 @@
+"""
+Persistent MinHash signatures for cross-run near-duplicate detection.
+
+Stores each kept paper's signature plus its LSH band hashes, so a paper in a
+later run can be checked against everything seen before with a few indexed
+lookups instead of a scan.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .base import SqliteStore
+
+
+class SignatureStore(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS signatures (
+        key TEXT PRIMARY KEY,
+        sig BLOB NOT NULL,
+        stored_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS bands (
+        band INTEGER NOT NULL,
+        hash TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (band, hash, key)
+    ) WITHOUT ROWID;
+    """
+
+    def candidates(self, band_hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Signatures of stored papers sharing at least one LSH band."""
+        with self._connect() as conn:
+            keys = set()
+            for band, h in enumerate(band_hashes):
+                keys.update(
+                    r[0] for r in conn.execute(
+                        "SELECT key FROM bands WHERE band = ? AND hash = ?", (band, h)
+                    )
+                )
+            out: Dict[str, np.ndarray] = {}
+            for key in keys:
+                row = conn.execute("SELECT sig FROM signatures WHERE key = ?", (key,)).fetchone()
+                if row:
+                    out[key] = np.frombuffer(row[0], dtype=np.uint32)
+        return out
+
+    def add(self, items: Iterable[Tuple[str, np.ndarray, List[str]]]) -> None:
+        """items: (key, signature, band_hashes)."""
+        now = time.time()
+        with self._connect() as conn:
+            for key, sig, band_hashes in items:
+                conn.execute(
+                    "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?)",
+                    (key, np.asarray(sig, dtype=np.uint32).tobytes(), now),
+                )
+                conn.execute("DELETE FROM bands WHERE key = ?", (key,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands VALUES (?, ?, ?)",
+                    [(band, h, key) for band, h in enumerate(band_hashes)],
+                )
@@ -0,0 +1,64 @@
+"""
+Persistent cache of validated LLM summaries.
+
+Keyed by the paper's arXiv id+version, the provider/model, and a hash of the
+exact prompt (system instruction, template and extracted context), so a new
+paper version, model, prompt wording or extraction result misses instead of
+serving a stale summary. Token counts of the original call are kept so hits
+can report what they saved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional
+
+from paper_digest.arxiv_ids import normalize_arxiv_id
+
+from .base import SqliteStore
+
+
+def prompt_hash(system_instruction: str, prompt: str) -> str:
+    return hashlib.sha256(f"{system_instruction}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def summary_key(paper_id: str, model: str, prompt_sha256: str) -> str:
+    return f"{normalize_arxiv_id(paper_id) or paper_id}:{model}:{prompt_sha256}"
+
+
+class CachedSummary(NamedTuple):
+    summary: Dict[str, Any]
+    input_tokens: int
+    output_tokens: int
+
+
+class SummaryCache(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS summaries (
+        key TEXT PRIMARY KEY,
+        summary BLOB NOT NULL,
+        input_tokens INTEGER NOT NULL,
+        output_tokens INTEGER NOT NULL,
+        stored_at REAL NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def get(self, key: str) -> Optional[CachedSummary]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary, input_tokens, output_tokens FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedSummary(json.loads(zlib.decompress(row[0]).decode("utf-8")), row[1], row[2])
+
+    def put(self, key: str, summary: Dict[str, Any], input_tokens: int, output_tokens: int) -> None:
+        blob = zlib.compress(json.dumps(summary, ensure_ascii=False).encode("utf-8"), 6)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                (key, blob, int(input_tokens), int(output_tokens), time.time()),
+            )
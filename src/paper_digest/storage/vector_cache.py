@@ -0,0 +1,50 @@
+"""
+Persistent per-paper embedding cache.
+
+Keyed by (arXiv id + version, embedder name): a new paper version or a
+different model gets its own vector, everything else is embedded once.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+
+from .base import SqliteStore
+
+
+class VectorCache(SqliteStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vectors (
+        key TEXT NOT NULL,
+        model TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vec BLOB NOT NULL,
+        stored_at REAL NOT NULL,
+        PRIMARY KEY (key, model)
+    ) WITHOUT ROWID;
+    """
+
+    def get_many(self, keys: Iterable[str], model: str) -> Dict[str, np.ndarray]:
+        out: Dict[str, np.ndarray] = {}
+        with self._connect() as conn:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT dim, vec FROM vectors WHERE key = ? AND model = ?", (key, model)
+                ).fetchone()
+                if row:
+                    out[key] = np.frombuffer(row[1], dtype=np.float32).reshape(row[0])
+        return out
+
+    def put_many(self, vectors: Mapping[str, np.ndarray], model: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, model, int(v.shape[0]), np.asarray(v, dtype=np.float32).tobytes(), now)
+                    for key, v in vectors.items()
+                ],
+            )
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import List
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lightweight tokenizer shared by ranking and the paper catalog:
+    - lowercase
+    - keep alphanumerics
+    - split into tokens
+
+    Example:
+      "Prompt-Guided Diffusion-Based Medical Image Segmentation"
+      -> ["prompt", "guided", "diffusion", "based", "medical", "image", "segmentation"]
+    """
+    return _WORD_RE.findall((text or "").lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token) for quota accounting."""
+    return math.ceil(len(text or "") / 4)
@@ -0,0 +1,221 @@
+"""
+Shared HTTP transport for every pipeline node.
+
+One `HttpTransport` is owned by the process (the FastAPI app or the CLI) and
+reused across nodes and runs, so connections to arxiv.org stay warm:
+  - per-host connection pools with keep-alive (requests.Session + HTTPAdapter)
+  - unified retry / exponential backoff with jitter, honoring Retry-After
+  - per-host token-bucket rate limiting, configured once when the transport
+    is built; a 429/503 Retry-After blocks the host for every caller, not
+    just the one that got it
+  - optional per-call `TransportStats` to report request timings and bytes
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from paper_digest.ratelimit import HostRateLimiter
+
+
+RETRYABLE_HTTP: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+USER_AGENT = "paper-digest-agent/0.1"
+
+# host -> (requests per second or None for unlimited, burst); arxiv.org asks automated clients to pace
+DEFAULT_HOST_RATES: Dict[str, Tuple[Optional[float], float]] = {"arxiv.org": (2.0, 1.0)}
+
+
+def backoff_delay(attempt: int, base_s: float = 1.0, cap_s: float = 8.0) -> float:
+    """
+    attempt is 1-based. Exponential backoff: base * 2^(attempt-1), capped, with jitter.
+    attempt=1 -> ~1s, attempt=2 -> ~2s, attempt=3 -> ~4s ...
+    """
+    exp = min(cap_s, base_s * (2 ** (attempt - 1)))
+    return exp * (0.75 + 0.5 * random.random())  # 0.75x .. 1.25x
+
+
+def sleep_backoff(attempt: int, base_s: float = 1.0, cap_s: float = 8.0) -> None:
+    time.sleep(backoff_delay(attempt, base_s, cap_s))
+
+
+def retry_after_s(resp: requests.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds form only)."""
+    raw = (resp.headers.get("Retry-After") or "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    max_tries: int = 3
+    backoff_base_s: float = 1.0
+    backoff_cap_s: float = 30.0
+    retry_statuses: FrozenSet[int] = RETRYABLE_HTTP
+
+
+@dataclass
+class TransportStats:
+    """Thread-safe accumulator of per-request timings and bytes for one node."""
+
+    requests: int = 0
+    retries: int = 0
+    bytes: int = 0
+    throttled_s: float = 0.0
+    elapsed: List[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, elapsed_s: float, nbytes: int, retried: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += int(retried)
+            self.bytes += max(0, nbytes)
+            self.elapsed.append(elapsed_s)
+
+    def add_throttle(self, seconds: float) -> None:
+        with self._lock:
+            self.throttled_s += seconds
+
+    def add_bytes(self, nbytes: int) -> None:
+        """For streamed bodies whose size is only known after reading."""
+        with self._lock:
+            self.bytes += max(0, nbytes)
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.requests:
+                return "requests=0"
+            ts = sorted(self.elapsed)
+            p50 = ts[len(ts) // 2]
+            return (
+                f"requests={self.requests} retries={self.retries} "
+                f"bytes={self.bytes / 1024:.1f}KB time={sum(ts):.2f}s "
+                f"(p50={p50:.2f}s, max={ts[-1]:.2f}s) throttled={self.throttled_s:.2f}s"
+            )
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        timeout_s: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        user_agent: str = USER_AGENT,
+        host_rates: Optional[Dict[str, Tuple[Optional[float], float]]] = None,
+    ) -> None:
+        self.timeout_s = float(timeout_s)
+        self.retry = retry or RetryPolicy()
+
+        # pool_connections = number of per-host pools kept; pool_maxsize = connections per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": user_agent})
+        self.limiter = HostRateLimiter()
+        for host, (rate_per_s, burst) in (DEFAULT_HOST_RATES if host_rates is None else host_rates).items():
+            self.limiter.configure(host, rate_per_s or None, burst)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retry: Optional[RetryPolicy] = None,
+        stats: Optional[TransportStats] = None,
+        log: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request, retrying timeouts, connection errors and retryable statuses.
+
+        Returns the last response (callers still call raise_for_status); raises
+        the last network error if no response was ever received.
+        """
+        policy = retry or self.retry
+        kwargs.setdefault("timeout", self.timeout_s)
+        stream = bool(kwargs.get("stream"))
+        last_err: Exception | None = None
+
+        for attempt in range(1, policy.max_tries + 1):
+            waited = self.limiter.acquire(url)
+            if stats is not None and waited:
+                stats.add_throttle(waited)
+
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as ex:
+                last_err = ex
+                if stats is not None:
+                    stats.record(time.perf_counter() - t0, 0, retried=attempt > 1)
+                if attempt < policy.max_tries:
+                    delay = backoff_delay(attempt, policy.backoff_base_s, policy.backoff_cap_s)
+                    if log:
+                        log(f"transient network error on attempt {attempt}/{policy.max_tries}: "
+                            f"{ex}. Retrying in {delay:.1f}s.")
+                    time.sleep(delay)
+                    continue
+                raise
+
+            if stats is not None:
+                # Streamed bodies are counted by the caller via stats.add_bytes()
+                nbytes = 0 if stream else len(resp.content)
+                stats.record(time.perf_counter() - t0, nbytes, retried=attempt > 1)
+
+            if resp.status_code in policy.retry_statuses and attempt < policy.max_tries:
+                delay = retry_after_s(resp)
+                if delay is None:
+                    delay = backoff_delay(attempt, policy.backoff_base_s, policy.backoff_cap_s)
+                else:
+                    # The server asked everyone to back off, not just this caller
+                    self.limiter.block_for(url, delay)
+                if log:
+                    log(f"HTTP {resp.status_code} on attempt {attempt}/{policy.max_tries}. "
+                        f"Retrying in {delay:.1f}s.")
+                resp.close()
+                time.sleep(delay)
+                continue
+
+            return resp
+
+        raise last_err or RuntimeError(f"{method} {url} failed")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def configure_transport(**kwargs) -> HttpTransport:
+    """Create (or replace) the process-wide transport. Called by the app / CLI at startup."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = HttpTransport(**kwargs)
+        return _transport
+
+
+def get_transport() -> HttpTransport:
+    """Process-wide transport; created with defaults on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport